@@ -14,12 +14,40 @@ import sys
 
 
 _MODULES = (
+    "ace_codec",
+    "ace_tools",
+    "atlas_packer",
+    "atlas_tools",
     "bbox_tools",
+    "bbox_writers",
+    "channel_pack",
+    "collect_tools",
     "collection_tools",
     "constants",
+    "dds_codec",
+    "dds_tools",
+    "dedup_tools",
+    "geometry",
+    "hash_cache",
+    "image_buffers",
+    "image_files",
+    "image_probe",
+    "image_resample",
+    "job_spec",
+    "pack_tools",
+    "package_tools",
     "panels",
+    "process_pool",
+    "size_tools",
+    "texture_index",
     "texture_tools",
+    "texture_watcher",
+    "thumbnail_cache",
+    "thumbnails",
+    "user_config",
     "uv_tools",
+    "vram_tools",
+    "zip_writer",
 )
 
 for _module_name in _MODULES:
@@ -27,30 +55,59 @@ for _module_name in _MODULES:
     if _full_name in sys.modules:
         importlib.reload(sys.modules[_full_name])
 
-from .bbox_tools import TST_OT_ExportBoundingBoxCSV
+from . import bbox_tools, process_pool, texture_watcher, thumbnails, vram_tools
+from .ace_tools import TXCH_OT_ConvertACE, TXCH_OT_PreviewACE
+from .atlas_tools import TXCH_OT_BuildAtlas
+from .bbox_tools import (
+    BoundingBoxProperties,
+    TST_OT_BuildConvexHulls,
+    TST_OT_ExportBoundingBoxCSV,
+)
+from .collect_tools import TXCH_OT_CollectTextures
 from .collection_tools import (
     OBJECT_OT_CreateInitialCollections,
     OBJECT_OT_SwapCollections,
     SwapCollectionsProperties,
 )
+from .dds_tools import TXCH_OT_ConvertToDDS
+from .dedup_tools import TXCH_OT_DedupImages
+from .pack_tools import TXCH_OT_PackChannels
+from .job_spec import JobSpecProperties, TST_OT_ApplyJobSpec, TST_OT_SaveJobSpec
+from .package_tools import PackageProperties, TST_OT_PackageRelease
 from .panels import (
+    TXCH_PT_ACETextures,
+    TXCH_PT_CollectTextures,
+    TXCH_PT_ConvertDDS,
+    TXCH_PT_DedupImages,
+    TXCH_PT_PackChannels,
     TXCH_PT_Panel,
     TXCH_PT_PathOptions,
     TXCH_PT_RenameImages,
+    TXCH_PT_TextureAtlas,
+    TXCH_PT_TextureSizes,
+    TXCH_PT_TextureWatcher,
     VIEW3D_PT_BoundingBoxTools,
+    VIEW3D_PT_JobSpec,
+    VIEW3D_PT_PackageRelease,
     VIEW3D_PT_SwapCollections,
+    VIEW3D_PT_TextureMemory,
     VIEW3D_PT_TrainSimToolsInfo,
     VIEW3D_PT_TrainSimToolsMain,
     VIEW3D_PT_UVTools,
 )
+from .size_tools import TXCH_OT_ValidateTextureSizes
 from .texture_tools import (
+    TXCH_OT_IndexTextureLibrary,
     TXCH_OT_InsertMappingLine,
     TXCH_OT_LoadMappingFromFile,
+    TXCH_OT_ProposeFuzzyRelinks,
     TXCH_OT_RenameImages,
     TXCH_OT_Run,
     TXCH_Props,
 )
+from .texture_watcher import TXCH_OT_WatchTextures
 from .uv_tools import TST_OT_FixUVSimple
+from .vram_tools import TST_OT_TextureMemoryReport
 
 import bpy
 from bpy.props import PointerProperty
@@ -62,10 +119,29 @@ classes = (
     TXCH_OT_RenameImages,
     TXCH_OT_LoadMappingFromFile,
     TXCH_OT_InsertMappingLine,
+    TXCH_OT_IndexTextureLibrary,
+    TXCH_OT_ProposeFuzzyRelinks,
     VIEW3D_PT_TrainSimToolsMain,
     TXCH_PT_Panel,
     TXCH_PT_PathOptions,
     TXCH_PT_RenameImages,
+    TXCH_OT_WatchTextures,
+    TXCH_PT_TextureWatcher,
+    TXCH_OT_DedupImages,
+    TXCH_PT_DedupImages,
+    TXCH_OT_CollectTextures,
+    TXCH_PT_CollectTextures,
+    TXCH_OT_ValidateTextureSizes,
+    TXCH_PT_TextureSizes,
+    TXCH_OT_ConvertToDDS,
+    TXCH_PT_ConvertDDS,
+    TXCH_OT_ConvertACE,
+    TXCH_OT_PreviewACE,
+    TXCH_PT_ACETextures,
+    TXCH_OT_BuildAtlas,
+    TXCH_PT_TextureAtlas,
+    TXCH_OT_PackChannels,
+    TXCH_PT_PackChannels,
     SwapCollectionsProperties,
     OBJECT_OT_SwapCollections,
     OBJECT_OT_CreateInitialCollections,
@@ -74,7 +150,18 @@ classes = (
     VIEW3D_PT_UVTools,
     VIEW3D_PT_BoundingBoxTools,
     VIEW3D_PT_TrainSimToolsInfo,
+    BoundingBoxProperties,
     TST_OT_ExportBoundingBoxCSV,
+    TST_OT_BuildConvexHulls,
+    TST_OT_TextureMemoryReport,
+    VIEW3D_PT_TextureMemory,
+    JobSpecProperties,
+    TST_OT_SaveJobSpec,
+    TST_OT_ApplyJobSpec,
+    VIEW3D_PT_JobSpec,
+    PackageProperties,
+    TST_OT_PackageRelease,
+    VIEW3D_PT_PackageRelease,
 )
 
 
@@ -83,13 +170,31 @@ def register():
         bpy.utils.register_class(cls)
     bpy.types.Scene.txch = PointerProperty(type=TXCH_Props)
     bpy.types.Scene.swap_collections_props = PointerProperty(type=SwapCollectionsProperties)
+    bpy.types.Scene.bbox_export_props = PointerProperty(type=BoundingBoxProperties)
+    bpy.types.Scene.tst_job_props = PointerProperty(type=JobSpecProperties)
+    bpy.types.Scene.tst_package_props = PointerProperty(type=PackageProperties)
+    bbox_tools.register_handlers()
+    vram_tools.register_handlers()
+    thumbnails.register_previews()
+    texture_watcher.register_handlers()
 
 
 def unregister():
+    bbox_tools.unregister_handlers()
+    vram_tools.unregister_handlers()
+    thumbnails.unregister_previews()
+    texture_watcher.unregister_handlers()
+    process_pool.release_standalone()
     if hasattr(bpy.types.Scene, "txch"):
         del bpy.types.Scene.txch
     if hasattr(bpy.types.Scene, "swap_collections_props"):
         del bpy.types.Scene.swap_collections_props
+    if hasattr(bpy.types.Scene, "bbox_export_props"):
+        del bpy.types.Scene.bbox_export_props
+    if hasattr(bpy.types.Scene, "tst_job_props"):
+        del bpy.types.Scene.tst_job_props
+    if hasattr(bpy.types.Scene, "tst_package_props"):
+        del bpy.types.Scene.tst_package_props
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
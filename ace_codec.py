@@ -0,0 +1,193 @@
+"""Read and write MSTS .ace textures (plain or zlib compressed, DXT1 or RGBA).
+
+    python ace_codec.py D:/Rolling_Stock/Textures --workers 8
+
+Converts every .ace found to a .png next to it.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+if __package__:
+    from .dds_codec import decode_bc1, encode_level, mip_chain
+    from .image_files import write_png
+    from .image_probe import ACE_ALPHA_CHANNEL, ACE_COMPRESSED, ACE_FORMATS, ACE_MASK_CHANNEL, ACE_MIPMAPS, ACE_PLAIN
+else:
+    from dds_codec import decode_bc1, encode_level, mip_chain
+    from image_files import write_png
+    from image_probe import ACE_ALPHA_CHANNEL, ACE_COMPRESSED, ACE_FORMATS, ACE_MASK_CHANNEL, ACE_MIPMAPS, ACE_PLAIN
+
+
+ACE_RAW_DATA = 0x10
+ACE_SURFACES = {name: code for code, name in ACE_FORMATS.items()}
+# Channel type -> RGBA component; the 1-bit mask channel also lands in alpha.
+ACE_CHANNEL_COMPONENTS = {3: 0, 4: 1, 5: 2, ACE_ALPHA_CHANNEL: 3, ACE_MASK_CHANNEL: 3}
+ACE_HEADER = struct.Struct("<6i")
+ACE_CHANNEL = struct.Struct("<qq")
+ACE_CREATOR_BYTES = 128
+
+
+def read_ace_body(path):
+    # The bytes after the 16-byte signature, inflated if needed.
+    with open(path, "rb") as handle:
+        signature = handle.read(16)
+        data = handle.read()
+    if signature == ACE_PLAIN:
+        return data
+    if signature[:8] != ACE_COMPRESSED or signature[12:16] != b"@@@@":
+        raise ValueError("not an ACE file")
+    data = zlib.decompress(data)
+    return data[8:] if data.startswith(b"@@@@@@@@") else data
+
+
+def level_count(width, height, options):
+    # MSTS counts mip levels from the width alone, 1 + log2(width), even for
+    # non-square textures.
+    return width.bit_length() if options & ACE_MIPMAPS else 1
+
+
+def decode_ace(path):
+    # Top mip level as uint8 (rows, columns, 4), top row first.
+    body = read_ace_body(path)
+    _marker, options, width, height, surface, channel_count = ACE_HEADER.unpack_from(body, 0)
+    offset = ACE_HEADER.size + ACE_CREATOR_BYTES
+    channels = [ACE_CHANNEL.unpack_from(body, offset + index * ACE_CHANNEL.size) for index in range(channel_count)]
+    offset += channel_count * ACE_CHANNEL.size
+
+    if options & ACE_RAW_DATA:
+        if ACE_FORMATS.get(surface) != "DXT1":
+            raise ValueError(f"raw ACE surface {hex(surface)} is not supported")
+        # One int32 offset per mip level precedes the size-prefixed levels.
+        offset += 4 * level_count(width, height, options)
+        (size,) = struct.unpack_from("<i", body, offset)
+        return decode_bc1(body[offset + 4 : offset + 4 + size], width, height)
+
+    # Structured data: a row offset table for every mip level, then each
+    # row of the top level stores its channels one after another (8-bit
+    # planes, 1-bit for the mask).
+    offset += 4 * sum(max(1, height >> level) for level in range(level_count(width, height, options)))
+    plane_bytes = [(width + 7) // 8 if size == 1 else width for size, _type in channels]
+    rows = np.frombuffer(body, dtype=np.uint8, count=height * sum(plane_bytes), offset=offset).reshape(height, -1)
+
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[..., 3] = 255
+    start = 0
+    for (size, channel_type), length in zip(channels, plane_bytes):
+        plane = rows[:, start : start + length]
+        start += length
+        component = ACE_CHANNEL_COMPONENTS.get(channel_type)
+        if component is None:
+            continue
+        if size == 1:
+            pixels[..., component] = np.unpackbits(plane, axis=1)[:, :width] * 255
+        else:
+            pixels[..., component] = plane
+    return pixels
+
+
+def encode_ace(pixels, path, surface="DXT1", srgb=False, mipmaps=True, compress=True):
+    # Process-pool entry point. pixels: (rows, columns, 3 or 4), top row
+    # first, uint8 or float 0..1. DXT1 is stored opaque as raw blocks; RGBA8 is
+    # stored as channel planes with alpha. Returns the written byte size.
+    values = pixels.astype(np.float32) / 255.0 if pixels.dtype == np.uint8 else pixels.astype(np.float32)
+    if values.shape[2] < 4:
+        rgba = np.ones(values.shape[:2] + (4,), dtype=np.float32)
+        rgba[..., :3] = values[..., :3] if values.shape[2] >= 3 else values[..., :1]
+        values = rgba
+    height, width = values.shape[:2]
+    # The sim derives the mip count from the width alone, so only square
+    # power-of-two textures get a chain.
+    options = ACE_MIPMAPS if mipmaps and width == height and width & (width - 1) == 0 else 0
+    alpha = surface == "RGBA8"
+    levels = mip_chain(values, "BOX", srgb, alpha) if options else [values]
+    levels = [np.round(level * 255.0).astype(np.uint8) for level in levels]
+
+    channels = [(8, 3), (8, 4), (8, 5)] + ([(8, ACE_ALPHA_CHANNEL)] if alpha else [])
+    # Offset tables count from the start of the body (after the signature).
+    data_start = ACE_HEADER.size + ACE_CREATOR_BYTES + len(channels) * ACE_CHANNEL.size
+    parts = []
+    if surface == "DXT1":
+        options |= ACE_RAW_DATA
+        blocks = [encode_level(level, "BC1") for level in levels]
+        data_start += 4 * len(blocks)
+        offsets = []
+        for level_blocks in blocks:
+            offsets.append(data_start)
+            data_start += 4 + len(level_blocks)
+        parts.append(struct.pack(f"<{len(offsets)}i", *offsets))
+        for level_blocks in blocks:
+            parts += [struct.pack("<i", len(level_blocks)), level_blocks]
+    else:
+        data_start += 4 * sum(level.shape[0] for level in levels)
+        offsets = []
+        for level in levels:
+            row_bytes = level.shape[1] * len(channels)
+            offsets.append(data_start + row_bytes * np.arange(level.shape[0], dtype=np.int64))
+            data_start += row_bytes * level.shape[0]
+        parts.append(np.concatenate(offsets).astype("<i4").tobytes())
+        parts += [np.ascontiguousarray(level[..., : len(channels)].transpose(0, 2, 1)).tobytes() for level in levels]
+
+    header = ACE_HEADER.pack(1, options, width, height, ACE_SURFACES[surface], len(channels))
+    header += b"\0" * ACE_CREATOR_BYTES + b"".join(ACE_CHANNEL.pack(*channel) for channel in channels)
+    body = header + b"".join(parts)
+    if compress:
+        inner = b"@@@@@@@@" + body
+        data = ACE_COMPRESSED + struct.pack("<I", len(inner)) + b"@@@@" + zlib.compress(inner)
+    else:
+        data = ACE_PLAIN + body
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as out:
+            out.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(data)
+
+
+def ace_to_png(source, target):
+    # Process-pool entry point; returns the (width, height) written.
+    pixels = decode_ace(source)
+    write_png(target, pixels)
+    return pixels.shape[1], pixels.shape[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert MSTS .ace textures to .png.")
+    parser.add_argument("paths", nargs="+", help="ACE files or folders")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel worker processes")
+    args = parser.parse_args(argv)
+
+    sources = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for folder, _dirs, files in os.walk(path):
+                sources.extend(os.path.join(folder, name) for name in files if name.lower().endswith(".ace"))
+        else:
+            sources.append(path)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {source: pool.submit(ace_to_png, source, os.path.splitext(source)[0] + ".png") for source in sources}
+        for source, future in futures.items():
+            try:
+                width, height = future.result()
+            except (OSError, ValueError, zlib.error) as exc:
+                print(f"! {source}: {exc}")
+                failed += 1
+                continue
+            print(f"{width:>5} x {height:<5} {source}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
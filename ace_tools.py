@@ -0,0 +1,220 @@
+import os
+from collections import deque
+
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .image_buffers import read_compact, write_pixels
+from .process_pool import process_pool, standalone
+from .texture_tools import append_mapping_lines, can_edit_image, collect_object_images
+
+
+PREVIEW_SUFFIX = " [ACE]"
+
+
+class TXCH_OT_ConvertACE(Operator):
+    bl_idname = "txch.convert_ace"
+    bl_label = "Convert ACE Textures"
+    bl_description = (
+        "ACE to PNG: decode the .ace textures in scope to .png files and propose them as a Mapping. "
+        "To ACE: write a .ace next to every other texture in scope"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = collect_object_images(props.scope)
+        if not images:
+            self.report({"INFO"}, "No image textures found in scope.")
+            return {"CANCELLED"}
+
+        print(f"\n=== TrainSimTools: CONVERT ACE ({props.ace_direction}) ===")
+        if props.ace_direction == "TO_PNG":
+            planned = [(img, old, os.path.splitext(path)[0] + ".png") for img, old, path in ace_sources(images)]
+        else:
+            planned = ace_targets(images)
+        if not planned:
+            self.report({"INFO"}, "No textures to convert in scope.")
+            return {"CANCELLED"}
+        if props.ace_dry_run:
+            for img, old, new in planned:
+                print(f"+ WOULD CONVERT: '{img.name}' {old} -> {new}")
+            self.report({"INFO"}, f"Textures to convert: {len(planned)} (dry run)")
+            return {"FINISHED"}
+
+        if props.ace_direction == "TO_ACE":
+            written, failed = write_ace_files(planned, props.ace_surface, props.ace_compress)
+            self.report({"WARNING" if failed else "INFO"}, f"Wrote {written} ACE files ({failed} failed).")
+            return {"FINISHED"} if written else {"CANCELLED"}
+
+        written, failed = write_png_files(planned)
+        if not written:
+            self.report({"ERROR"}, f"No ACE textures converted; {failed} failed (see console).")
+            return {"CANCELLED"}
+        append_mapping_lines(props, [f"{old} => {new}" for old, new in written])
+        self.report(
+            {"WARNING" if failed else "INFO"},
+            f"Converted {len(written)} ACE textures ({failed} failed); appended to the Mapping for review, then Apply.",
+        )
+        return {"FINISHED"}
+
+
+class TXCH_OT_PreviewACE(Operator):
+    bl_idname = "txch.preview_ace"
+    bl_label = "Load ACE Previews"
+    bl_description = (
+        "Decode the .ace textures in scope into in-memory images named '<file>" + PREVIEW_SUFFIX + "' "
+        "for the Image Editor; nothing is written to disk"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        sources = ace_sources(collect_object_images(props.scope))
+        if not sources:
+            self.report({"INFO"}, "No .ace textures found in scope.")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: ACE PREVIEWS ===")
+        loaded, failed = load_ace_previews([path for _img, _old, path in sources])
+        self.report({"WARNING" if failed else "INFO"}, f"Loaded {loaded} ACE previews ({failed} failed).")
+        return {"FINISHED"} if loaded else {"CANCELLED"}
+
+
+def ace_sources(images):
+    # [(image, old path, absolute .ace path)] for .ace files that exist.
+    sources = []
+    for img in sorted(images, key=lambda image: image.name):
+        old = img.filepath_raw or img.filepath
+        if not old or os.path.splitext(old)[1].lower() != ".ace":
+            continue
+        path = os.path.normpath(bpy.path.abspath(old, library=img.library))
+        if not os.path.isfile(path):
+            print(f"- SKIP (missing): '{img.name}' ({old})")
+            continue
+        sources.append((img, old, path))
+    return sources
+
+
+def ace_targets(images):
+    # [(image, old path, absolute .ace path)] for textures Blender can read.
+    targets = []
+    for img in sorted(images, key=lambda image: image.name):
+        old = img.filepath_raw or img.filepath
+        if not can_edit_image(img) or img.source != "FILE" or not old:
+            print(f"- SKIP (linked/no path): '{img.name}'")
+            continue
+        if os.path.splitext(old)[1].lower() == ".ace":
+            continue
+        targets.append((img, old, os.path.splitext(os.path.normpath(bpy.path.abspath(old)))[0] + ".ace"))
+    return targets
+
+
+def write_png_files(planned, workers=None):
+    # Decoding and PNG writing both happen in the workers; only paths travel.
+    codec = standalone("ace_codec")
+    written = []
+    failed = 0
+    with process_pool(min(workers or os.cpu_count() or 1, len(planned))) as pool:
+        futures = [
+            (img, old, new, pool.submit(codec.ace_to_png, bpy.path.abspath(old, library=img.library), new))
+            for img, old, new in planned
+        ]
+        for img, old, new, future in futures:
+            try:
+                width, height = future.result()
+            except Exception as exc:
+                print(f"    ! Could not convert '{img.name}': {exc}")
+                failed += 1
+                continue
+            print(f"+ WROTE: {new} ({width}x{height})")
+            written.append((old, new))
+    return written, failed
+
+
+def ace_surface_for(pixels, requested):
+    # AUTO keeps DXT1 unless the image really uses its alpha.
+    if requested != "AUTO":
+        return requested
+    if pixels.shape[2] < 4:
+        return "DXT1"
+    opaque = 255 if pixels.dtype == np.uint8 else 1.0
+    return "RGBA8" if (pixels[..., 3] < opaque).any() else "DXT1"
+
+
+def write_ace_files(planned, surface, compress, workers=None):
+    # Pixels are read through Blender on the main thread (rows flipped to
+    # top-first); encoding runs in worker processes, `workers` images at a time.
+    codec = standalone("ace_codec")
+    workers = min(workers or os.cpu_count() or 1, len(planned))
+    written = 0
+    failed = 0
+    with process_pool(workers) as pool:
+        window = deque()
+        pending = deque(planned)
+        while pending or window:
+            while pending and len(window) < workers:
+                img, old, new = pending.popleft()
+                try:
+                    pixels = read_compact(img, top_first=True)
+                except Exception as exc:
+                    print(f"    ! Could not read '{img.name}': {exc}")
+                    failed += 1
+                    continue
+                chosen = ace_surface_for(pixels, surface)
+                srgb = img.colorspace_settings.name == "sRGB"
+                window.append((img, new, chosen, pool.submit(codec.encode_ace, pixels, new, chosen, srgb, True, compress)))
+            if not window:
+                continue
+
+            img, new, chosen, future = window.popleft()
+            try:
+                size = future.result()
+            except Exception as exc:
+                print(f"    ! Conversion failed for '{img.name}': {exc}")
+                failed += 1
+                continue
+            print(f"+ {chosen}: '{img.name}' -> {new} ({size / 1024:.0f} KB)")
+            written += 1
+    return written, failed
+
+
+def load_ace_preview(path, pixels):
+    # pixels: uint8 (rows, columns, 4), top row first. Reuses the preview
+    # image of an earlier run, resizing it when the file changed size.
+    height, width = pixels.shape[:2]
+    name = os.path.basename(path) + PREVIEW_SUFFIX
+    img = bpy.data.images.get(name)
+    if img is None:
+        img = bpy.data.images.new(name, width, height, alpha=True)
+    elif tuple(img.size) != (width, height):
+        img.scale(width, height)
+    img["ace_source"] = path
+    write_pixels(img, pixels, top_first=True)
+    return img
+
+
+def load_ace_previews(paths, workers=None):
+    codec = standalone("ace_codec")
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    loaded = 0
+    failed = 0
+    with process_pool(workers) as pool:
+        window = deque()
+        pending = deque(dict.fromkeys(paths))
+        while pending or window:
+            while pending and len(window) < workers:
+                path = pending.popleft()
+                window.append((path, pool.submit(codec.decode_ace, path)))
+
+            path, future = window.popleft()
+            try:
+                img = load_ace_preview(path, future.result())
+            except Exception as exc:
+                print(f"    ! Could not load '{path}': {exc}")
+                failed += 1
+                continue
+            print(f"+ PREVIEW: '{img.name}' {img.size[0]}x{img.size[1]}")
+            loaded += 1
+    return loaded, failed
@@ -0,0 +1,104 @@
+import numpy as np
+
+
+def maxrects_pack(sizes, width, height):
+    # MaxRects with best-short-side-fit: every placement splits the free
+    # rectangles it overlaps, and free rectangles contained in others are
+    # pruned. Returns [(x, y)] in the order of `sizes`, or None if any fails.
+    free = [(0, 0, width, height)]
+    placements = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda index: (-max(sizes[index]), -min(sizes[index])))
+    for index in order:
+        rect_width, rect_height = sizes[index]
+        best = None
+        for free_x, free_y, free_width, free_height in free:
+            if rect_width <= free_width and rect_height <= free_height:
+                short = min(free_width - rect_width, free_height - rect_height)
+                long = max(free_width - rect_width, free_height - rect_height)
+                if best is None or (short, long) < best[0]:
+                    best = ((short, long), free_x, free_y)
+        if best is None:
+            return None
+        _fit, x, y = best
+        placements[index] = (x, y)
+        free = split_free_rects(free, (x, y, rect_width, rect_height))
+    return placements
+
+
+def split_free_rects(free, used):
+    used_x, used_y, used_width, used_height = used
+    result = []
+    for rect in free:
+        x, y, width, height = rect
+        if used_x >= x + width or used_x + used_width <= x or used_y >= y + height or used_y + used_height <= y:
+            result.append(rect)
+            continue
+        if used_x > x:
+            result.append((x, y, used_x - x, height))
+        if used_x + used_width < x + width:
+            result.append((used_x + used_width, y, x + width - used_x - used_width, height))
+        if used_y > y:
+            result.append((x, y, width, used_y - y))
+        if used_y + used_height < y + height:
+            result.append((x, used_y + used_height, width, y + height - used_y - used_height))
+    result = list(dict.fromkeys(result))
+    return [rect for rect in result if not any(other != rect and contains(other, rect) for other in result)]
+
+
+def contains(outer, inner):
+    return (
+        inner[0] >= outer[0]
+        and inner[1] >= outer[1]
+        and inner[0] + inner[2] <= outer[0] + outer[2]
+        and inner[1] + inner[3] <= outer[1] + outer[3]
+    )
+
+
+def atlas_layout(sizes, padding=4, max_size=4096):
+    # Smallest power-of-two atlas (by area, then squareness) that fits every
+    # image with `padding` texels of edge bleed on each side. Returns
+    # (width, height, [(x, y)] of each image's first texel), or None.
+    padded = [(width + 2 * padding, height + 2 * padding) for width, height in sizes]
+    area = sum(width * height for width, height in padded)
+    sides = [1 << bit for bit in range(max_size.bit_length()) if 1 << bit <= max_size]
+    candidates = sorted(
+        (
+            (width, height)
+            for width in sides
+            for height in sides
+            if width * height >= area
+            and width >= max(size[0] for size in padded)
+            and height >= max(size[1] for size in padded)
+        ),
+        key=lambda size: (size[0] * size[1], abs(size[0] - size[1]), -size[0]),
+    )
+    for width, height in candidates:
+        placements = maxrects_pack(padded, width, height)
+        if placements is not None:
+            return width, height, [(x + padding, y + padding) for x, y in placements]
+    return None
+
+
+def composite(width, height, images, placements, padding=4):
+    # images: float32 (rows, columns, 4) arrays, all in the same row order as
+    # the atlas. Each is pasted with its border texels repeated into the
+    # padding so mip levels do not bleed neighbours in.
+    atlas = np.zeros((height, width, 4), dtype=np.float32)
+    for pixels, (x, y) in zip(images, placements):
+        rows, columns = pixels.shape[:2]
+        atlas[y - padding : y + rows + padding, x - padding : x + columns + padding] = np.pad(
+            pixels, ((padding, padding), (padding, padding), (0, 0)), mode="edge"
+        )
+    return atlas
+
+
+def remap_uvs(uvs, rect_index, rects, width, height):
+    # uvs: (loops, 2); rect_index: (loops,) index into rects or -1 to keep.
+    # rects: (count, 4) of x, y, columns, rows in atlas texels.
+    rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+    moved = rect_index >= 0
+    chosen = rects[rect_index[moved]]
+    result = uvs.copy()
+    result[moved, 0] = (chosen[:, 0] + uvs[moved, 0] * chosen[:, 2]) / width
+    result[moved, 1] = (chosen[:, 1] + uvs[moved, 1] * chosen[:, 3]) / height
+    return result
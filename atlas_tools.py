@@ -0,0 +1,177 @@
+import os
+
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .atlas_packer import atlas_layout, composite, remap_uvs
+from .image_buffers import expand_channels, new_image, read_pixels, to_bytes
+from .texture_tools import collect_object_images, enumerate_image_nodes, rel_or_abs
+
+# UVs this far outside 0..1 mean the texture tiles and cannot share an atlas.
+UV_TOLERANCE = 1e-3
+
+
+class TXCH_OT_BuildAtlas(Operator):
+    bl_idname = "txch.build_atlas"
+    bl_label = "Build Texture Atlas"
+    bl_description = (
+        "Pack the textures of the selected objects into one power-of-two atlas, "
+        "remap their UVs and replace their materials with one atlas material"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        meshes = selected_meshes(context)
+        if not meshes:
+            self.report({"ERROR"}, "Select the mesh objects to atlas.")
+            return {"CANCELLED"}
+        if not props.atlas_dry_run and not bpy.data.filepath and props.atlas_path.startswith("//"):
+            self.report({"ERROR"}, "Save the .blend first (the atlas path is relative).")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: TEXTURE ATLAS ===")
+        materials = atlas_materials(meshes, set(collect_object_images("SELECTED")))
+        images = sorted(set(materials.values()), key=lambda image: image.name)
+        if len(images) < 2:
+            self.report({"INFO"}, f"Found {len(images)} atlas-able textures; nothing to combine.")
+            return {"CANCELLED"}
+
+        layout = atlas_layout([tuple(img.size) for img in images], props.atlas_padding, props.atlas_max_size)
+        if layout is None:
+            self.report({"ERROR"}, f"{len(images)} textures do not fit a {props.atlas_max_size} atlas.")
+            return {"CANCELLED"}
+        width, height, placements = layout
+        for img, (x, y) in zip(images, placements):
+            print(f"+ {x:>5},{y:<5} {img.size[0]}x{img.size[1]}  '{img.name}'")
+        print(f"Atlas            : {width}x{height}, {len(images)} textures, {len(materials)} materials")
+        if props.atlas_dry_run:
+            self.report({"INFO"}, f"Atlas would be {width}x{height} for {len(images)} textures (dry run)")
+            return {"FINISHED"}
+
+        path = bpy.path.abspath(props.atlas_path)
+        atlas_image = write_atlas(path, width, height, images, placements, props.atlas_padding)
+        atlas_image.filepath = rel_or_abs(path, props.make_relative)
+        rects = {img: (x, y, img.size[0], img.size[1]) for img, (x, y) in zip(images, placements)}
+        atlas_material = make_atlas_material(materials, atlas_image, os.path.splitext(os.path.basename(path))[0])
+        loops = sum(consolidate_mesh(mesh, materials, rects, atlas_material, width, height) for mesh in meshes)
+
+        self.report({"INFO"}, f"Atlas {width}x{height} written; {loops} UVs remapped onto '{atlas_material.name}'.")
+        return {"FINISHED"}
+
+
+def selected_meshes(context):
+    meshes = []
+    for obj in context.selected_objects:
+        if obj.type == "MESH" and obj.data is not None and obj.data.library is None and obj.data not in meshes:
+            meshes.append(obj.data)
+    return meshes
+
+
+def loop_material_indices(mesh):
+    # Material slot index of every face corner, expanded from the faces.
+    face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", face_materials)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return np.repeat(face_materials, loop_totals)
+
+
+def mesh_uvs(mesh):
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers[0].data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
+
+
+def atlas_materials(meshes, images):
+    # {material: image} for node materials with exactly one texture, from
+    # `images`, whose UVs stay within 0..1 on every selected mesh.
+    candidates = {}
+    for mesh in meshes:
+        for mat in mesh.materials:
+            if mat is None or mat in candidates:
+                continue
+            textures = {img for _node, img in enumerate_image_nodes(mat.node_tree)} if mat.use_nodes else set()
+            img = next(iter(textures)) if len(textures) == 1 else None
+            # has_data stays False until something reads the pixels, as in
+            # background runs; reading size loads the image, and a file that
+            # cannot load reports 0x0.
+            if img is None or img not in images or img.source == "TILED" or not img.size[0]:
+                print(f"- SKIP (not one loaded texture): material '{mat.name}'")
+                candidates[mat] = None
+            else:
+                candidates[mat] = img
+
+    for mesh in meshes:
+        if not mesh.uv_layers:
+            continue
+        uvs = mesh_uvs(mesh)
+        corner_materials = loop_material_indices(mesh)
+        for slot, mat in enumerate(mesh.materials):
+            if candidates.get(mat) is None:
+                continue
+            used = uvs[corner_materials == slot]
+            if len(used) and (used.min() < -UV_TOLERANCE or used.max() > 1 + UV_TOLERANCE):
+                print(f"- SKIP (tiling UVs on '{mesh.name}'): material '{mat.name}'")
+                candidates[mat] = None
+    return {mat: img for mat, img in candidates.items() if img is not None}
+
+
+def write_atlas(path, width, height, images, placements, padding):
+    # Blender's rows run bottom-up like UV v, so pixels paste without flipping.
+    atlas = composite(width, height, [expand_channels(read_pixels(img)) for img in images], placements, padding)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    out = new_image(os.path.basename(path), to_bytes(atlas))
+    try:
+        out.filepath_raw = path
+        out.file_format = "PNG"
+        out.save()
+    finally:
+        bpy.data.images.remove(out)
+    atlas_image = bpy.data.images.load(path, check_existing=True)
+    atlas_image.reload()
+    return atlas_image
+
+
+def make_atlas_material(materials, atlas_image, name):
+    # A copy of the first atlased material (keeps its shader setup) with the
+    # atlas in place of its texture.
+    source = min(materials, key=lambda mat: mat.name)
+    atlas_material = source.copy()
+    atlas_material.name = name
+    for node, _img in enumerate_image_nodes(atlas_material.node_tree):
+        node.image = atlas_image
+    return atlas_material
+
+
+def consolidate_mesh(mesh, materials, rects, atlas_material, width, height):
+    # Moves the UVs of every atlased face corner into its texture's rectangle,
+    # points those faces at one slot holding the atlas material and drops the
+    # slots they no longer use. Returns the number of remapped corners.
+    slots = [index for index, mat in enumerate(mesh.materials) if mat in materials]
+    if not slots or not mesh.uv_layers:
+        return 0
+
+    corner_materials = loop_material_indices(mesh)
+    # One extra entry catches face indices past the last slot.
+    slot_rect = np.full(len(mesh.materials) + 1, -1, dtype=np.int64)
+    rect_list = []
+    for index in slots:
+        slot_rect[index] = len(rect_list)
+        rect_list.append(rects[materials[mesh.materials[index]]])
+    rect_index = slot_rect[np.minimum(corner_materials, len(mesh.materials))]
+    uvs = remap_uvs(mesh_uvs(mesh).astype(np.float64), rect_index, rect_list, width, height)
+    mesh.uv_layers[0].data.foreach_set("uv", uvs.astype(np.float32).ravel())
+
+    target = slots[0]
+    face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", face_materials)
+    face_materials[np.isin(face_materials, slots)] = target
+    mesh.polygons.foreach_set("material_index", face_materials)
+    mesh.materials[target] = atlas_material
+    # Popping a slot shifts the face indices above it down.
+    for index in reversed(slots[1:]):
+        mesh.materials.pop(index=index)
+    mesh.update()
+    return int((rect_index >= 0).sum())
@@ -0,0 +1,193 @@
+"""Headless TrainSimTools batch runner.
+
+Controller (walks a folder and fans out to worker Blender processes):
+
+    blender -b --factory-startup -P batch_runner.py -- --job job.json --root D:/Rolling_Stock
+
+Each worker opens one .blend, registers the add-on, runs the job_spec steps
+and writes a small JSON result; the controller merges them into one report.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_NAME = "trainsimtools_batch_report.json"
+OUTPUT_TAIL = 2000
+
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1 :] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="batch_runner.py", description="Run TrainSimTools jobs over .blend files.")
+    parser.add_argument("--job", required=True, help="Job spec (.json or .toml, see job_spec.py)")
+    parser.add_argument("--root", help="Folder searched recursively for .blend files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel Blender processes")
+    parser.add_argument("--report", help=f"Report path (default: <root>/{REPORT_NAME})")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per file")
+    parser.add_argument("--blender", help="Blender executable for workers (default: this Blender)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def find_blend_files(root):
+    found = []
+    for folder, _dirs, files in os.walk(root):
+        found.extend(os.path.join(folder, name) for name in files if name.lower().endswith(".blend"))
+    return sorted(found)
+
+
+def blender_binary(args):
+    if args.blender:
+        return args.blender
+    try:
+        import bpy
+
+        return bpy.app.binary_path
+    except ImportError:
+        return "blender"
+
+
+def timeout_text(captured):
+    # TimeoutExpired keeps the partial output as bytes even with text=True
+    # (Windows re-reads it as str), or None when nothing was captured.
+    if isinstance(captured, bytes):
+        return captured.decode(errors="replace")
+    return captured or ""
+
+
+def run_file(blend_path, args, blender):
+    handle, result_path = tempfile.mkstemp(prefix="tst_batch_", suffix=".json")
+    os.close(handle)
+    command = [
+        blender,
+        "-b",
+        "--factory-startup",
+        blend_path,
+        "-P",
+        os.path.abspath(__file__),
+        "--",
+        "--worker",
+        "--job",
+        os.path.abspath(args.job),
+        "--result",
+        result_path,
+    ]
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        output = (completed.stdout or "") + (completed.stderr or "")
+        returncode = completed.returncode
+    except subprocess.TimeoutExpired as exc:
+        output = f"Timed out after {args.timeout:.0f}s\n" + timeout_text(exc.stdout) + timeout_text(exc.stderr)
+        returncode = None
+
+    try:
+        with open(result_path, "r", encoding="utf-8") as result_file:
+            result = json.load(result_file)
+    except (OSError, ValueError):
+        result = {"file": blend_path, "ok": False, "steps": [], "error": "Worker produced no result"}
+    finally:
+        if os.path.exists(result_path):
+            os.remove(result_path)
+
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    result["returncode"] = returncode
+    if not result.get("ok"):
+        result["output_tail"] = output[-OUTPUT_TAIL:]
+    return result
+
+
+def run_controller(args):
+    if not args.root:
+        raise SystemExit("--root is required")
+    job_spec = addon_package().job_spec
+    job_spec.compile_job(job_spec.load_job(args.job))
+    files = find_blend_files(args.root)
+    blender = blender_binary(args)
+    workers = max(1, min(args.workers, len(files) or 1))
+    report_path = args.report or os.path.join(args.root, REPORT_NAME)
+
+    print(f"TrainSimTools batch: {len(files)} files, {workers} workers, job {args.job}")
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_file, path, args, blender) for path in files]
+        for index, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            status = "OK  " if result.get("ok") else "FAIL"
+            print(f"[{index}/{len(files)}] {status} {result['file']} ({result['seconds']}s)")
+
+    results.sort(key=lambda item: item["file"])
+    failed = [result["file"] for result in results if not result.get("ok")]
+    report = {
+        "job": os.path.abspath(args.job),
+        "root": os.path.abspath(args.root),
+        "files": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": failed,
+        "results": results,
+    }
+    with open(report_path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    print(f"Done: {report['succeeded']} ok, {len(failed)} failed. Report: {report_path}")
+    return 1 if failed else 0
+
+
+def addon_package():
+    parent = os.path.dirname(PACKAGE_DIR)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(os.path.basename(PACKAGE_DIR))
+
+
+def run_worker(args):
+    import bpy
+
+    result = {"file": bpy.data.filepath, "ok": True, "steps": []}
+    try:
+        package = addon_package()
+        package.register()
+        job_spec = package.job_spec
+        job = job_spec.load_job(args.job)
+        for step in job_spec.compile_job(job):
+            entry = {"tool": step[0]}
+            try:
+                job_spec.apply_step(bpy.context.scene, step)
+                entry["result"] = job_spec.run_step(step)
+            except Exception as exc:
+                entry["error"] = f"{type(exc).__name__}: {exc}"
+                result["ok"] = False
+            result["steps"].append(entry)
+            if not result["ok"] and job.get("stop_on_error", True):
+                break
+
+        if result["ok"] and job.get("save", False):
+            bpy.ops.wm.save_mainfile()
+    except Exception:
+        result["ok"] = False
+        result["error"] = traceback.format_exc()
+
+    with open(args.result, "w", encoding="utf-8") as result_file:
+        json.dump(result, result_file)
+    return 0 if result["ok"] else 1
+
+
+def main(argv=None):
+    args = parse_args(sys.argv if argv is None else argv)
+    code = run_worker(args) if args.worker else run_controller(args)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
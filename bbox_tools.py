@@ -1,24 +1,160 @@
-import csv
+import math
 import os
+import time
 
 import bpy
-from bpy.types import Operator
+import numpy as np
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
+from bpy.app.handlers import persistent
+from bpy.types import Operator, PropertyGroup
+from mathutils import Matrix
+
+from .bbox_writers import WRITERS, open_column_writer
+from .collection_tools import lod_collection_items
+from .geometry import (
+    HULL_VERTEX_LIMIT,
+    axis_aligned_bounds,
+    convex_hull_3d,
+    minimal_bounding_sphere,
+    oriented_bounding_box,
+    ritter_sphere,
+    transform_points,
+)
+
+
+BBOX_COLUMNS = (
+    "left_x_from_cursor",
+    "bottom_z_from_cursor",
+    "rear_y_from_cursor",
+    "right_x_from_cursor",
+    "top_z_from_cursor",
+    "front_neg_y_from_cursor",
+)
+
+OBB_COLUMNS = (
+    "obb_center_x_from_cursor",
+    "obb_center_y_from_cursor",
+    "obb_center_z_from_cursor",
+    "obb_half_x",
+    "obb_half_y",
+    "obb_half_z",
+    "obb_rot_x_deg",
+    "obb_rot_y_deg",
+    "obb_rot_z_deg",
+)
+
+SPHERE_COLUMNS = (
+    "sphere_center_x_from_cursor",
+    "sphere_center_y_from_cursor",
+    "sphere_center_z_from_cursor",
+    "sphere_radius",
+    "radius_from_cursor",
+)
+
+SPHERE_SUMMARY_LIMIT = 10
+BLOCK_ROWS = 512
+
+# object name -> (fingerprint, row or None); see bbox_fingerprint.
+BBOX_CACHE = {}
+
+
+class BoundingBoxProperties(PropertyGroup):
+    output_format: EnumProperty(
+        name="Format",
+        items=[
+            ("CSV", "CSV", "Comma separated values"),
+            ("JSONL", "JSON Lines", "One JSON object per line"),
+            ("BINARY", "Binary Columns", "Compact TSTCOL1 columnar file (see bbox_writers.read_binary)"),
+        ],
+        default="CSV",
+    )
+    output_path: StringProperty(
+        name="Output",
+        description="Target file or folder; blank writes bbox_export.<ext> beside the blend file",
+        default="",
+        subtype="FILE_PATH",
+    )
+    append_output: BoolProperty(
+        name="Append",
+        description="Append rows to an existing file with the same columns instead of overwriting",
+        default=False,
+    )
+    include_source: BoolProperty(
+        name="Blend File Column",
+        description="Add the source .blend name to every row (useful when appending across files)",
+        default=False,
+    )
+    include_obb: BoolProperty(
+        name="Oriented Boxes (OBB)",
+        description="Also export a tight oriented box (center, half extents, XYZ rotation) per object",
+        default=False,
+    )
+    include_sphere: BoolProperty(
+        name="Bounding Spheres",
+        description="Also export a bounding sphere and the radius around the 3D cursor (OpenRails culling)",
+        default=False,
+    )
+    exact_sphere: BoolProperty(
+        name="Exact Spheres (Welzl)",
+        description="Refine the fast Ritter sphere to the minimal enclosing sphere",
+        default=False,
+    )
+    sphere_warn_radius: FloatProperty(
+        name="Warn Radius",
+        description="Flag objects whose radius around the 3D cursor exceeds this in the summary",
+        default=50.0,
+        min=0.0,
+        subtype="DISTANCE",
+    )
+
+    hull_source: EnumProperty(
+        name="Hull Objects",
+        items=[
+            ("SELECTED", "Selected Objects", "Build hulls for the selected meshes"),
+            ("COLLECTION", "LOD Collection", "Build hulls for every mesh in a LOD collection"),
+        ],
+        default="SELECTED",
+    )
+    hull_collection: EnumProperty(
+        name="LOD Collection",
+        description="MAIN_/Scratchpad_ LOD collection to build hulls for",
+        items=lod_collection_items,
+    )
+    hull_max_vertices: IntProperty(
+        name="Max Hull Vertices",
+        description=f"Stop refining each hull at this many vertices (0 = up to {HULL_VERTEX_LIMIT}, "
+        "exact for smaller hulls)",
+        default=64,
+        min=0,
+        max=HULL_VERTEX_LIMIT,
+    )
+    hull_output: EnumProperty(
+        name="Hull Output",
+        items=[
+            ("MESH", "Proxy Meshes", "Create <object>_hull wireframe proxy objects"),
+            ("OBJ", "OBJ File", "Write hull_export.obj beside the blend file"),
+        ],
+        default="MESH",
+    )
 
 
 class TST_OT_ExportBoundingBoxCSV(Operator):
     bl_idname = "tst.export_bbox_csv"
-    bl_label = "Export Bounding Box CSV"
+    bl_label = "Export Bounding Boxes"
     bl_description = (
         "Export bounding box offsets (relative to 3D cursor) for selected "
-        "mesh objects to bbox_export.csv. Uses -Y as forward."
+        "mesh objects to CSV, JSON Lines or binary columns. Uses -Y as forward."
     )
     bl_options = {"REGISTER"}
 
     def execute(self, context):
-        filepath = os.path.join(output_directory(), "bbox_export.csv")
+        props = context.scene.bbox_export_props
+        filepath = bbox_output_path(props)
 
         try:
-            write_bounding_box_csv(filepath, context)
+            spheres, hits, misses = write_bounding_boxes(
+                filepath, context, props.output_format, props.append_output
+            )
         except PermissionError:
             self.report(
                 {"ERROR"},
@@ -30,7 +166,69 @@ class TST_OT_ExportBoundingBoxCSV(Operator):
             self.report({"ERROR"}, f"Failed to export bounding boxes: {exc}")
             return {"CANCELLED"}
 
-        self.report({"INFO"}, f"Bounding boxes exported to {filepath}")
+        message = f"Bounding boxes exported to {filepath} (cache hits: {hits}, misses: {misses})"
+        if spheres:
+            message += " | " + sphere_summary(spheres, props.sphere_warn_radius)
+        self.report({"INFO"}, message)
+        return {"FINISHED"}
+
+
+class TST_OT_BuildConvexHulls(Operator):
+    bl_idname = "tst.build_convex_hulls"
+    bl_label = "Build Convex Hulls"
+    bl_description = "Build convex collision proxies for the selected meshes or a LOD collection"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.bbox_export_props
+        objects = hull_target_objects(context, props)
+        if not objects:
+            self.report({"INFO"}, "No mesh objects to build hulls for.")
+            return {"CANCELLED"}
+
+        depsgraph = context.evaluated_depsgraph_get()
+        hulls = []
+        skipped = 0
+        started = time.perf_counter()
+
+        for obj in objects:
+            obj_eval = obj.evaluated_get(depsgraph)
+            mesh = obj_eval.to_mesh()
+            try:
+                if not mesh or len(mesh.vertices) < 4:
+                    skipped += 1
+                    continue
+                vertices, faces = convex_hull_3d(mesh_vertices(mesh), props.hull_max_vertices)
+            except ValueError as exc:
+                print(f"- SKIP (flat)   : '{obj.name}' {exc}")
+                skipped += 1
+                continue
+            finally:
+                if mesh:
+                    obj_eval.to_mesh_clear()
+            if not props.hull_max_vertices and len(vertices) >= HULL_VERTEX_LIMIT:
+                print(f"- CAPPED        : '{obj.name}' hull stopped at {HULL_VERTEX_LIMIT} vertices")
+            hulls.append((obj, vertices, faces))
+
+        elapsed = time.perf_counter() - started
+        if props.hull_output == "OBJ":
+            filepath = os.path.join(output_directory(), "hull_export.obj")
+            try:
+                write_hulls_obj(filepath, hulls)
+            except OSError as exc:
+                self.report({"ERROR"}, f"Failed to write '{filepath}': {exc}")
+                return {"CANCELLED"}
+            target = filepath
+        else:
+            for obj, vertices, faces in hulls:
+                create_hull_proxy(obj, vertices, faces)
+            target = "proxy meshes"
+
+        total = sum(len(vertices) for _, vertices, _ in hulls)
+        self.report(
+            {"INFO"},
+            f"Hulls built: {len(hulls)} ({total} verts, {elapsed:.2f}s) -> {target}, Skipped: {skipped}",
+        )
         return {"FINISHED"}
 
 
@@ -40,56 +238,238 @@ def output_directory():
     return bpy.app.tempdir or os.path.expanduser("~")
 
 
-def write_bounding_box_csv(filepath, context):
+def bbox_output_path(props):
+    extension = WRITERS[props.output_format].extension
+    if not props.output_path:
+        return os.path.join(output_directory(), "bbox_export" + extension)
+
+    path = bpy.path.abspath(props.output_path)
+    if path.endswith(("/", "\\")) or os.path.isdir(path):
+        return os.path.join(path, "bbox_export" + extension)
+    return path
+
+
+def write_bounding_boxes(filepath, context, output_format="CSV", append=False):
     scene = context.scene
     cursor = scene.cursor.location
+    props = scene.bbox_export_props
     depsgraph = context.evaluated_depsgraph_get()
+    source = bpy.path.basename(bpy.data.filepath)
+    spheres = []
+    hits = 0
+    misses = 0
 
-    with open(filepath, "w", newline="", encoding="utf-8") as csv_file:
-        writer = csv.writer(csv_file)
-        writer.writerow(
-            [
-                "object_name",
-                "left_x_from_cursor",
-                "bottom_z_from_cursor",
-                "rear_y_from_cursor",
-                "right_x_from_cursor",
-                "top_z_from_cursor",
-                "front_neg_y_from_cursor",
-            ]
-        )
+    text_columns = ("object_name", "blend_file") if props.include_source else ("object_name",)
+    value_columns = BBOX_COLUMNS
+    if props.include_obb:
+        value_columns += OBB_COLUMNS
+    if props.include_sphere:
+        value_columns += SPHERE_COLUMNS
 
+    with open_column_writer(output_format, filepath, text_columns, value_columns, append) as writer:
+        texts = []
+        values = []
         for obj in context.selected_objects:
             if obj.type != "MESH":
                 continue
 
-            obj_eval = obj.evaluated_get(depsgraph)
-            mesh = obj_eval.to_mesh()
-            try:
-                if not mesh or not mesh.vertices:
-                    continue
-                writer.writerow(bounding_box_row(obj, mesh, cursor))
-            finally:
-                if mesh:
-                    obj_eval.to_mesh_clear()
+            fingerprint = bbox_fingerprint(obj, cursor, props)
+            cached = BBOX_CACHE.get(obj.name)
+            if cached and cached[0] == fingerprint:
+                row = cached[1]
+                hits += 1
+            else:
+                row = compute_bbox_row(obj, depsgraph, cursor, props)
+                BBOX_CACHE[obj.name] = (fingerprint, row)
+                misses += 1
+
+            if row is None:
+                continue
+            if props.include_sphere:
+                spheres.append((obj.name, row[-1]))
+            texts.append((obj.name, source) if props.include_source else (obj.name,))
+            values.append(row)
+            if len(values) == BLOCK_ROWS:
+                writer.write_block(texts, values)
+                texts, values = [], []
+
+        if values:
+            writer.write_block(texts, values)
+
+    return spheres, hits, misses
+
+
+def compute_bbox_row(obj, depsgraph, cursor, props):
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        if not mesh or not mesh.vertices:
+            return None
+        verts_world = world_vertices(obj, mesh)
+        row = bounding_box_row(verts_world, cursor)
+        if props.include_obb:
+            row.extend(oriented_box_row(verts_world, cursor))
+        if props.include_sphere:
+            row.extend(bounding_sphere_row(verts_world, cursor, props.exact_sphere))
+        return row
+    finally:
+        if mesh:
+            obj_eval.to_mesh_clear()
+
+
+def bbox_fingerprint(obj, cursor, props):
+    # Cheap change detection; edits that keep all of these intact (vertex
+    # moves, modifier settings) are caught by invalidate_bbox_cache.
+    mesh = obj.data
+    modifiers = hash(tuple((mod.name, mod.type, mod.show_viewport) for mod in obj.modifiers))
+    return (
+        mesh.as_pointer(),
+        len(mesh.vertices),
+        modifiers,
+        np.array(obj.matrix_world, dtype=np.float64).tobytes(),
+        tuple(cursor),
+        (props.include_obb, props.include_sphere, props.exact_sphere),
+    )
+
+
+@persistent
+def invalidate_bbox_cache(scene, depsgraph):
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        data = update.id.original
+        if isinstance(data, bpy.types.Object):
+            BBOX_CACHE.pop(data.name, None)
+        elif isinstance(data, bpy.types.Mesh):
+            pointer = data.as_pointer()
+            for name in [name for name, (key, _) in BBOX_CACHE.items() if key[0] == pointer]:
+                del BBOX_CACHE[name]
+
+
+@persistent
+def clear_bbox_cache(*_args):
+    BBOX_CACHE.clear()
+
+
+def register_handlers():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_bbox_cache)
+    bpy.app.handlers.load_post.append(clear_bbox_cache)
+
+
+def unregister_handlers():
+    if invalidate_bbox_cache in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(invalidate_bbox_cache)
+    if clear_bbox_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_bbox_cache)
+    BBOX_CACHE.clear()
+
 
+def mesh_vertices(mesh):
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3).astype(np.float64)
 
-def bounding_box_row(obj, mesh, cursor):
-    verts_world = [obj.matrix_world @ vertex.co for vertex in mesh.vertices]
 
-    min_x = min(vertex.x for vertex in verts_world)
-    max_x = max(vertex.x for vertex in verts_world)
-    min_y = min(vertex.y for vertex in verts_world)
-    max_y = max(vertex.y for vertex in verts_world)
-    min_z = min(vertex.z for vertex in verts_world)
-    max_z = max(vertex.z for vertex in verts_world)
+def world_vertices(obj, mesh):
+    return transform_points(mesh_vertices(mesh), obj.matrix_world)
+
+
+def bounding_box_row(verts_world, cursor):
+    low, high = axis_aligned_bounds(verts_world)
+    min_x, min_y, min_z = low.tolist()
+    max_x, max_y, max_z = high.tolist()
+
+    return [
+        min_x - cursor.x,
+        min_z - cursor.z,
+        max_y - cursor.y,
+        max_x - cursor.x,
+        max_z - cursor.z,
+        cursor.y - min_y,
+    ]
+
+
+def oriented_box_row(verts_world, cursor):
+    center, half_extents, rotation = oriented_bounding_box(verts_world)
+    euler = Matrix(rotation.tolist()).to_euler("XYZ")
+
+    return [
+        float(center[0]) - cursor.x,
+        float(center[1]) - cursor.y,
+        float(center[2]) - cursor.z,
+        *half_extents.tolist(),
+        *(math.degrees(angle) for angle in euler),
+    ]
+
+
+def bounding_sphere_row(verts_world, cursor, exact=False):
+    center, radius = minimal_bounding_sphere(verts_world) if exact else ritter_sphere(verts_world)
+    cursor_radius = np.sqrt(np.max(np.sum((verts_world - np.array(cursor)) ** 2, axis=1)))
 
     return [
-        obj.name,
-        round(min_x - cursor.x, 3),
-        round(min_z - cursor.z, 3),
-        round(max_y - cursor.y, 3),
-        round(max_x - cursor.x, 3),
-        round(max_z - cursor.z, 3),
-        round(cursor.y - min_y, 3),
+        float(center[0]) - cursor.x,
+        float(center[1]) - cursor.y,
+        float(center[2]) - cursor.z,
+        float(radius),
+        float(cursor_radius),
     ]
+
+
+def sphere_summary(spheres, warn_radius):
+    ranked = sorted(spheres, key=lambda item: item[1], reverse=True)
+    flagged = [name for name, radius in ranked if warn_radius > 0 and radius > warn_radius]
+
+    print("\n=== TrainSimTools: BOUNDING SPHERES ===")
+    print(f"Objects          : {len(ranked)}")
+    print(f"Warn Radius      : {warn_radius:.3f}")
+    for name, radius in ranked[:SPHERE_SUMMARY_LIMIT]:
+        marker = "!" if name in flagged else " "
+        print(f"{marker} {radius:10.3f}  {name}")
+
+    name, radius = ranked[0]
+    return f"Largest radius: {radius:.3f} ({name}), over {warn_radius:.1f}: {len(flagged)}"
+
+
+def hull_target_objects(context, props):
+    if props.hull_source == "COLLECTION":
+        collection = bpy.data.collections.get(props.hull_collection)
+        candidates = collection.all_objects if collection else []
+    else:
+        candidates = context.selected_objects
+    return [obj for obj in candidates if obj.type == "MESH" and not obj.name.endswith("_hull")]
+
+
+def create_hull_proxy(obj, vertices, faces):
+    # Hulls are built in local space, so the proxy simply copies the transform.
+    name = f"{obj.name}_hull"
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices.tolist(), [], faces.tolist())
+    mesh.update()
+
+    proxy = bpy.data.objects.get(name)
+    if proxy is None or proxy.type != "MESH":
+        proxy = bpy.data.objects.new(name, mesh)
+        for collection in obj.users_collection:
+            collection.objects.link(proxy)
+    else:
+        old_mesh = proxy.data
+        proxy.data = mesh
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+
+    proxy.matrix_world = obj.matrix_world
+    proxy.display_type = "WIRE"
+    return proxy
+
+
+def write_hulls_obj(filepath, hulls):
+    offset = 1
+    with open(filepath, "w", encoding="utf-8") as obj_file:
+        obj_file.write("# TrainSimTools convex hulls (world space)\n")
+        for obj, vertices, faces in hulls:
+            obj_file.write(f"o {obj.name}_hull\n")
+            for x, y, z in transform_points(vertices, obj.matrix_world).tolist():
+                obj_file.write(f"v {x:.6f} {y:.6f} {z:.6f}\n")
+            for a, b, c in (faces + offset).tolist():
+                obj_file.write(f"f {a} {b} {c}\n")
+            offset += len(vertices)
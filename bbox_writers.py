@@ -0,0 +1,205 @@
+import csv
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+BINARY_MAGIC = b"TSTCOL1\0"
+BINARY_BLOCK = b"BLK1"
+TEXT_KIND = 0
+FLOAT_KIND = 1
+
+
+class ColumnWriter(ABC):
+    extension = ""
+
+    def __init__(self, filepath, text_columns, value_columns, append=False, precision=3):
+        self.filepath = filepath
+        self.text_columns = tuple(text_columns)
+        self.value_columns = tuple(value_columns)
+        self.columns = self.text_columns + self.value_columns
+        self.precision = precision
+        appending = append and os.path.exists(filepath) and os.path.getsize(filepath) > 0
+        if appending:
+            self.check_existing_columns()
+        self.handle = self.open_file("ab" if appending else "wb")
+        if not appending:
+            self.write_header()
+
+    def open_file(self, mode):
+        return open(self.filepath, mode)
+
+    def check_existing_columns(self):
+        pass
+
+    def write_header(self):
+        pass
+
+    @abstractmethod
+    def write_block(self, texts, values):
+        # texts: one tuple per row matching text_columns; values: rows of
+        # value_columns.
+        pass
+
+    def close(self):
+        self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    def rounded(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(len(values), len(self.value_columns))
+        return np.round(values, self.precision)
+
+    def mismatch(self, found):
+        return ValueError(
+            f"Cannot append to '{self.filepath}': it has columns {list(found)}, expected {list(self.columns)}"
+        )
+
+
+class CsvColumnWriter(ColumnWriter):
+    extension = ".csv"
+
+    def open_file(self, mode):
+        return open(self.filepath, mode[0], newline="", encoding="utf-8")
+
+    def check_existing_columns(self):
+        with open(self.filepath, "r", newline="", encoding="utf-8") as existing:
+            found = tuple(next(csv.reader(existing), ()))
+        if found != self.columns:
+            raise self.mismatch(found)
+
+    def write_header(self):
+        csv.writer(self.handle).writerow(self.columns)
+
+    def write_block(self, texts, values):
+        rows = [list(text) + row for text, row in zip(texts, self.rounded(values).tolist())]
+        csv.writer(self.handle).writerows(rows)
+
+
+class JsonLinesColumnWriter(ColumnWriter):
+    extension = ".jsonl"
+
+    def open_file(self, mode):
+        return open(self.filepath, mode[0], encoding="utf-8")
+
+    def check_existing_columns(self):
+        # Every record carries the same keys, so the first one stands for the file.
+        with open(self.filepath, "r", encoding="utf-8") as existing:
+            line = next((line for line in existing if line.strip()), "")
+        try:
+            record = json.loads(line) if line else {}
+        except ValueError:
+            record = {}
+        found = tuple(record) if isinstance(record, dict) else ()
+        if found != self.columns:
+            raise self.mismatch(found)
+
+    def write_block(self, texts, values):
+        lines = [
+            json.dumps(dict(zip(self.columns, list(text) + row)))
+            for text, row in zip(texts, self.rounded(values).tolist())
+        ]
+        self.handle.write("\n".join(lines) + "\n")
+
+
+class BinaryColumnWriter(ColumnWriter):
+    # TSTCOL1 layout (little endian):
+    #   header: magic, u16 column count, per column u16 name length, name, u8 kind
+    #   blocks: b"BLK1", u32 rows, then each column in order:
+    #     text  -> u32[rows + 1] offsets into the utf-8 payload, u32 payload size, payload
+    #     float -> f64[rows]
+    extension = ".tstcol"
+
+    def header_bytes(self):
+        parts = [BINARY_MAGIC, struct.pack("<H", len(self.columns))]
+        for name in self.columns:
+            encoded = name.encode("utf-8")
+            kind = TEXT_KIND if name in self.text_columns else FLOAT_KIND
+            parts.append(struct.pack("<H", len(encoded)) + encoded + struct.pack("<B", kind))
+        return b"".join(parts)
+
+    def check_existing_columns(self):
+        expected = self.header_bytes()
+        with open(self.filepath, "rb") as existing:
+            found = existing.read(len(expected))
+        if found != expected:
+            raise self.mismatch(name for name, _ in read_binary_header(self.filepath)[0])
+
+    def write_header(self):
+        self.handle.write(self.header_bytes())
+
+    def write_block(self, texts, values):
+        count = len(texts)
+        parts = [BINARY_BLOCK, struct.pack("<I", count)]
+        for index in range(len(self.text_columns)):
+            encoded = [str(text[index]).encode("utf-8") for text in texts]
+            offsets = np.zeros(count + 1, dtype="<u4")
+            np.cumsum([len(item) for item in encoded], out=offsets[1:])
+            payload = b"".join(encoded)
+            parts.extend((offsets.tobytes(), struct.pack("<I", len(payload)), payload))
+        columns = np.ascontiguousarray(self.rounded(values).T, dtype="<f8")
+        parts.append(columns.tobytes())
+        self.handle.write(b"".join(parts))
+
+
+WRITERS = {
+    "CSV": CsvColumnWriter,
+    "JSONL": JsonLinesColumnWriter,
+    "BINARY": BinaryColumnWriter,
+}
+
+
+def open_column_writer(output_format, filepath, text_columns, value_columns, append=False):
+    return WRITERS[output_format](filepath, text_columns, value_columns, append=append)
+
+
+def read_binary_header(filepath):
+    with open(filepath, "rb") as handle:
+        if handle.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"'{filepath}' is not a TSTCOL1 file")
+        (count,) = struct.unpack("<H", handle.read(2))
+        columns = []
+        for _ in range(count):
+            (length,) = struct.unpack("<H", handle.read(2))
+            name = handle.read(length).decode("utf-8")
+            (kind,) = struct.unpack("<B", handle.read(1))
+            columns.append((name, kind))
+        return columns, handle.tell()
+
+
+def read_binary(filepath):
+    columns, offset = read_binary_header(filepath)
+    with open(filepath, "rb") as handle:
+        data = handle.read()
+
+    chunks = {name: [] for name, _ in columns}
+    while offset < len(data):
+        if data[offset : offset + 4] != BINARY_BLOCK:
+            raise ValueError(f"Corrupt block at byte {offset} in '{filepath}'")
+        (count,) = struct.unpack_from("<I", data, offset + 4)
+        offset += 8
+        for name, kind in columns:
+            if kind == TEXT_KIND:
+                offsets = np.frombuffer(data, dtype="<u4", count=count + 1, offset=offset)
+                offset += offsets.nbytes
+                (size,) = struct.unpack_from("<I", data, offset)
+                payload = data[offset + 4 : offset + 4 + size]
+                offset += 4 + size
+                chunks[name].extend(
+                    payload[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])
+                )
+            else:
+                chunks[name].append(np.frombuffer(data, dtype="<f8", count=count, offset=offset))
+                offset += count * 8
+
+    return {
+        name: chunks[name] if kind == TEXT_KIND else np.concatenate(chunks[name] or [np.empty(0)])
+        for name, kind in columns
+    }
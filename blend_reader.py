@@ -0,0 +1,302 @@
+"""Read image references straight from .blend files, without Blender.
+
+    python blend_reader.py D:/Rolling_Stock --workers 8 --missing --json audit.json
+
+Only the file-block headers, the SDNA and the IM/LI/ID blocks are decoded,
+so auditing thousands of files takes seconds instead of Blender start-ups.
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+IMAGE_SOURCES = {1: "FILE", 2: "SEQUENCE", 3: "MOVIE", 4: "GENERATED", 5: "VIEWER", 6: "TILED"}
+FIELD_NAME = re.compile(r"^[(*]*(\w+)")
+FIELD_DIMENSIONS = re.compile(r"\[(\d+)\]")
+
+
+def open_blend(path):
+    with open(path, "rb") as handle:
+        magic = handle.read(4)
+        if magic[:2] == GZIP_MAGIC:
+            handle.seek(0)
+            with gzip.GzipFile(fileobj=handle) as stream:
+                return stream.read()
+        if magic == ZSTD_MAGIC:
+            handle.seek(0)
+            return decompress_zstd(handle)
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def decompress_zstd(handle):
+    try:
+        from compression import zstd
+
+        return zstd.decompress(handle.read())
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ValueError("zstd-compressed blend needs Python 3.14+ or the 'zstandard' package") from exc
+    with zstandard.ZstdDecompressor().stream_reader(handle, read_across_frames=True) as stream:
+        return stream.read()
+
+
+def parse_header(data):
+    if data[:7] != b"BLENDER":
+        raise ValueError("not a .blend file")
+    if data[7:8] in (b"_", b"-"):
+        # Legacy 12 byte header: BLENDER + pointer size + endian + version.
+        pointer_size = 4 if data[7:8] == b"_" else 8
+        endian = "<" if data[8:9] == b"v" else ">"
+        return {"pointer_size": pointer_size, "endian": endian, "version": int(data[9:12]), "size": 12, "large": False}
+
+    # Blender 5.0+: BLENDER + header size + "-" + format version + endian + version.
+    size = int(data[7:9])
+    endian = "<" if data[12:13] == b"v" else ">"
+    return {"pointer_size": 8, "endian": endian, "version": int(data[13:size]), "size": size, "large": True}
+
+
+def iter_blocks(data, header):
+    endian = header["endian"]
+    if header["large"]:
+        layout = struct.Struct(endian + "4siQqq")
+    else:
+        pointer = "I" if header["pointer_size"] == 4 else "Q"
+        layout = struct.Struct(endian + "4si" + pointer + "ii")
+
+    offset = header["size"]
+    end = len(data)
+    while offset + layout.size <= end:
+        if header["large"]:
+            code, sdna, old, length, count = layout.unpack_from(data, offset)
+        else:
+            code, length, old, sdna, count = layout.unpack_from(data, offset)
+        offset += layout.size
+        if code == b"ENDB":
+            return
+        yield code, sdna, old, offset, length, count
+        offset += length
+
+
+class SDNA:
+    def __init__(self, data, offset, header):
+        self.endian = header["endian"]
+        self.pointer_size = header["pointer_size"]
+        position = offset + 8  # "SDNA" + "NAME"
+        self.names, position = self.read_strings(data, position)
+        self.types, position = self.read_strings(data, align(position - offset) + offset + 4)
+        position = align(position - offset) + offset + 4  # "TLEN"
+        self.lengths = struct.unpack_from(f"{self.endian}{len(self.types)}h", data, position)
+        position = align(position + 2 * len(self.types) - offset) + offset + 4  # "STRC"
+        (count,) = struct.unpack_from(self.endian + "i", data, position)
+        position += 4
+
+        self.structs = []
+        self.struct_by_type = {}
+        for index in range(count):
+            type_index, field_count = struct.unpack_from(self.endian + "hh", data, position)
+            position += 4
+            pairs = struct.unpack_from(f"{self.endian}{field_count * 2}h", data, position)
+            position += 4 * field_count
+            self.structs.append((type_index, list(zip(pairs[::2], pairs[1::2]))))
+            self.struct_by_type[self.types[type_index]] = index
+        self.field_cache = {}
+
+    def read_strings(self, data, position):
+        (count,) = struct.unpack_from(self.endian + "i", data, position)
+        position += 4
+        strings = []
+        for _ in range(count):
+            end = data.find(b"\0", position)
+            strings.append(bytes(data[position:end]).decode("ascii", "replace"))
+            position = end + 1
+        return strings, position
+
+    def fields(self, type_name):
+        # name -> (type name, offset, size, is_pointer)
+        if type_name in self.field_cache:
+            return self.field_cache[type_name]
+        fields = {}
+        offset = 0
+        _, members = self.structs[self.struct_by_type[type_name]]
+        for type_index, name_index in members:
+            raw = self.names[name_index]
+            is_pointer = raw.startswith("*") or raw.startswith("(*")
+            count = 1
+            for dimension in FIELD_DIMENSIONS.findall(raw):
+                count *= int(dimension)
+            size = (self.pointer_size if is_pointer else self.lengths[type_index]) * count
+            fields[FIELD_NAME.match(raw).group(1)] = (self.types[type_index], offset, size, is_pointer)
+            offset += size
+        self.field_cache[type_name] = fields
+        return fields
+
+    def locate(self, type_name, path):
+        # "id.name" -> (absolute offset inside the struct, size, is_pointer)
+        offset = 0
+        for part in path.split("."):
+            fields = self.fields(type_name)
+            if part not in fields:
+                return None
+            type_name, field_offset, size, is_pointer = fields[part]
+            offset += field_offset
+        return offset, size, is_pointer
+
+    def struct_name(self, sdna_index):
+        return self.types[self.structs[sdna_index][0]]
+
+
+def align(value):
+    return (value + 3) & ~3
+
+
+def read_string(data, offset, size):
+    raw = bytes(data[offset : offset + size])
+    return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+def read_pointer(data, offset, sdna):
+    code = "I" if sdna.pointer_size == 4 else "Q"
+    return struct.unpack_from(sdna.endian + code, data, offset)[0]
+
+
+def read_field(data, block_offset, sdna, type_name, path, kind):
+    location = sdna.locate(type_name, path)
+    if location is None:
+        return None
+    offset, size, is_pointer = location
+    offset += block_offset
+    if kind == "string":
+        return read_string(data, offset, size)
+    if kind == "pointer" or is_pointer:
+        return read_pointer(data, offset, sdna)
+    return struct.unpack_from(sdna.endian + "h", data, offset)[0]
+
+
+def read_images(path):
+    data = open_blend(path)
+    try:
+        header = parse_header(data)
+        blocks = []
+        sdna = None
+        for block in iter_blocks(data, header):
+            code = block[0]
+            if code == b"DNA1":
+                sdna = SDNA(data, block[3], header)
+            elif code in (b"IM\0\0", b"LI\0\0", b"ID\0\0"):
+                blocks.append(block)
+        if sdna is None:
+            raise ValueError("missing SDNA block")
+
+        libraries = {}
+        for code, _sdna, old, offset, _length, _count in blocks:
+            if code == b"LI\0\0":
+                libraries[old] = read_field(data, offset, sdna, "Library", "filepath", "string") or read_field(
+                    data, offset, sdna, "Library", "name", "string"
+                )
+
+        images = []
+        for code, sdna_index, _old, offset, _length, _count in blocks:
+            if code == b"LI\0\0":
+                continue
+            type_name = sdna.struct_name(sdna_index)
+            prefix = "id." if type_name == "Image" else ""
+            name = read_field(data, offset, sdna, type_name, prefix + "name", "string") or ""
+            if not name.startswith("IM"):
+                continue
+            library = read_field(data, offset, sdna, type_name, prefix + "lib", "pointer") or 0
+            record = {"name": name[2:], "library": libraries.get(library, "") if library else ""}
+            if type_name == "Image":
+                packed = any(
+                    read_field(data, offset, sdna, "Image", field, "pointer") for field in ("packedfile", "packedfiles")
+                )
+                source = read_field(data, offset, sdna, "Image", "source", "short")
+                record.update(
+                    filepath=read_field(data, offset, sdna, "Image", "filepath", "string")
+                    or read_field(data, offset, sdna, "Image", "name", "string")
+                    or "",
+                    packed=bool(packed),
+                    source=IMAGE_SOURCES.get(source, str(source)),
+                )
+            else:
+                record.update(filepath="", packed=False, source="LINKED")
+            images.append(record)
+
+        return {"file": path, "version": header["version"], "images": images}
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def read_images_safe(path):
+    try:
+        return read_images(path)
+    except Exception as exc:
+        return {"file": path, "error": f"{type(exc).__name__}: {exc}", "images": []}
+
+
+def resolve_image_path(blend_path, filepath):
+    if filepath.startswith("//"):
+        filepath = os.path.join(os.path.dirname(blend_path), filepath[2:])
+    return os.path.normpath(filepath.replace("\\", os.sep))
+
+
+def audit_blends(paths, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_images_safe, paths, chunksize=8))
+
+
+def expand_paths(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _dirs, files in os.walk(path):
+                found.extend(os.path.join(folder, name) for name in files if name.lower().endswith(".blend"))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List image paths stored in .blend files.")
+    parser.add_argument("paths", nargs="+", help=".blend files or folders")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel reader processes")
+    parser.add_argument("--missing", action="store_true", help="Only list images whose file does not exist")
+    parser.add_argument("--json", help="Write the full result as JSON")
+    args = parser.parse_args(argv)
+
+    results = audit_blends(expand_paths(args.paths), args.workers)
+    for result in results:
+        if "error" in result:
+            print(f"! {result['file']}: {result['error']}")
+            continue
+        for image in result["images"]:
+            image["exists"] = bool(image["filepath"]) and os.path.exists(
+                resolve_image_path(result["file"], image["filepath"])
+            )
+            if args.missing and (image["exists"] or image["packed"] or image["library"] or not image["filepath"]):
+                continue
+            flags = "P" if image["packed"] else ("L" if image["library"] else ("-" if image["exists"] else "!"))
+            print(f"{flags} {result['file']} | {image['name']} | {image['filepath']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
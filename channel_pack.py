@@ -0,0 +1,70 @@
+import re
+
+import numpy as np
+
+if __package__:
+    from .image_files import write_png
+    from .image_resample import resize_axis
+else:
+    from image_files import write_png
+    from image_resample import resize_axis
+
+
+CHANNEL_NAMES = "rgba"
+# "ao.png:g" takes the green channel of ao.png; without a suffix the red one.
+SOURCE_CHANNEL = re.compile(r"^(.*?)(?::([rgba]))?$", re.IGNORECASE)
+EMPTY_SOURCES = ("", "-")
+
+
+def parse_pack_line(sources, output):
+    # "ao.png, gloss.png, metal.png:b => orm.png" -> ([(path, channel) or None]*n, output)
+    slots = []
+    for token in sources.split(","):
+        token = token.strip()
+        if token in EMPTY_SOURCES:
+            slots.append(None)
+            continue
+        path, channel = SOURCE_CHANNEL.match(token).groups()
+        slots.append((path.strip(), CHANNEL_NAMES.index(channel.lower()) if channel else 0))
+    if not 1 <= len(slots) <= 4 or not any(slots):
+        raise ValueError(f"expected 1-4 sources, got '{sources}'")
+    return slots, output.strip()
+
+
+def rule_groups(stems, suffixes):
+    # {base: [stem or None per suffix]} for stems ending in one of `suffixes`
+    # (case-insensitive), keeping only bases that have at least two of them.
+    groups = {}
+    for stem in stems:
+        for index, suffix in enumerate(suffixes):
+            if suffix and stem.lower().endswith(suffix.lower()):
+                groups.setdefault(stem[: -len(suffix)], [None] * len(suffixes))[index] = stem
+                break
+    return {base: slots for base, slots in groups.items() if sum(slot is not None for slot in slots) >= 2}
+
+
+def pack_planes(planes, fill=0):
+    # planes: up to four uint8 (rows, columns) arrays or None. Planes smaller
+    # than the largest are area-resampled up to it. Returns uint8 (rows,
+    # columns, 3 or 4); a missing alpha is opaque, other gaps take `fill`.
+    height = max(plane.shape[0] for plane in planes if plane is not None)
+    width = max(plane.shape[1] for plane in planes if plane is not None)
+    channels = 4 if len(planes) == 4 else 3
+    packed = np.empty((height, width, channels), dtype=np.uint8)
+    for index in range(channels):
+        plane = planes[index] if index < len(planes) else None
+        if plane is None:
+            packed[..., index] = 255 if index == 3 else fill
+            continue
+        if plane.shape != (height, width):
+            values = resize_axis(resize_axis(plane.astype(np.float32), height, 0), width, 1)
+            plane = np.clip(np.rint(values), 0, 255).astype(np.uint8)
+        packed[..., index] = plane
+    return packed
+
+
+def pack_to_png(planes, path, fill=0):
+    # Process-pool entry point; planes are top row first. Returns (width, height).
+    packed = pack_planes(planes, fill)
+    write_png(path, packed)
+    return packed.shape[1], packed.shape[0]
@@ -0,0 +1,190 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+from bpy.types import Operator
+
+from .hash_cache import HASH_CACHE_NAME, digest_files, shared_cache
+from .texture_tools import apply_new_path, can_edit_image, collect_object_images, swap_dir
+from .user_config import config_path
+
+
+COPY_WORKERS = 8
+FICLONE = 0x40049409  # Linux ioctl: share extents on btrfs/xfs/bcachefs
+
+
+class TXCH_OT_CollectTextures(Operator):
+    bl_idname = "txch.collect_textures"
+    bl_label = "Collect Textures"
+    bl_description = "Copy every texture used in scope into one folder, then point the images at the copies"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = collect_object_images(props.scope)
+        if not images:
+            self.report({"INFO"}, "No image textures found in scope.")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: COLLECT TEXTURES ===")
+        print(f"Target           : {props.collect_dir}")
+        print(f"Link Mode        : {props.collect_link_mode}")
+        print(f"Dry Run          : {props.collect_dry_run}")
+
+        sources, skipped = collect_sources(images)
+        targets = {source: os.path.normpath(swap_dir(source, props.collect_dir, True, "", "", "")) for source in sources}
+        for source in name_clashes(targets):
+            print(f"- SKIP (clash)  : {source} -> {targets.pop(source)} (another texture has this name)")
+            skipped += len(sources[source])
+
+        actions = plan_copies(targets, props.collect_overwrite)
+        jobs = {}
+        for source, action in actions.items():
+            if action == "CONFLICT":
+                print(f"- SKIP (exists) : {targets[source]} differs from {source}; enable Overwrite to replace.")
+                skipped += len(sources[source])
+                continue
+            print(f"+ {action if props.collect_dry_run else action.replace('WOULD ', '')}: {source}")
+            print(f"    To  : {targets[source]}")
+            if action.endswith("COPY"):
+                jobs[source] = targets[source]
+
+        if props.collect_dry_run:
+            planned = sum(len(sources[source]) for source, action in actions.items() if action != "CONFLICT")
+            self.report({"INFO"}, f"Textures planned: {planned} ({len(jobs)} files to copy), Skipped: {skipped}")
+            return {"FINISHED"}
+
+        errors = copy_files(jobs, props.collect_link_mode)
+        changed = 0
+        for source, action in actions.items():
+            if action == "CONFLICT":
+                continue
+            if source in errors:
+                print(f"- FAILED        : {source}: {errors[source]}")
+                skipped += len(sources[source])
+                continue
+            for img in sources[source]:
+                apply_new_path(img, targets[source], props.make_relative, False)
+                changed += 1
+
+        self.report(
+            {"WARNING" if errors else "INFO"},
+            f"Textures collected: {changed} ({len(jobs) - len(errors)} files copied), "
+            f"Skipped: {skipped}, Failed copies: {len(errors)}",
+        )
+        return {"FINISHED"}
+
+
+def collect_sources(images):
+    # abs source path -> images using it; one copy serves every image.
+    sources = {}
+    skipped = 0
+    for img in images:
+        old = img.filepath_raw or img.filepath
+        if not can_edit_image(img):
+            print(f"- SKIP (linked) : '{img.name}' from library '{img.library.filepath}'")
+        elif img.packed_file:
+            print(f"- SKIP (packed) : '{img.name}' is packed; unpack it first.")
+        elif img.source == "TILED":
+            print(f"- SKIP (tiled)  : '{img.name}' is a UDIM set.")
+        elif not isinstance(old, str) or old == "":
+            print(f"- SKIP (no path): '{img.name}'")
+        elif not os.path.isfile(bpy.path.abspath(old)):
+            print(f"- SKIP (missing): '{img.name}' ({old})")
+        else:
+            sources.setdefault(os.path.normpath(bpy.path.abspath(old)), []).append(img)
+            continue
+        skipped += 1
+    return sources, skipped
+
+
+def name_clashes(targets):
+    by_target = {}
+    for source, target in targets.items():
+        by_target.setdefault(os.path.normcase(target), []).append(source)
+    return [source for group in by_target.values() if len(group) > 1 for source in group]
+
+
+def plan_copies(targets, overwrite):
+    # source -> WOULD COPY / IN PLACE / IDENTICAL / CONFLICT. Existing targets of
+    # the same size are compared by (cached) content hash before copying.
+    actions = {}
+    compare = []
+    for source, target in targets.items():
+        if os.path.normcase(source) == os.path.normcase(target) or (
+            os.path.exists(target) and os.path.samefile(source, target)
+        ):
+            actions[source] = "IN PLACE"
+        elif not os.path.exists(target):
+            actions[source] = "WOULD COPY"
+        elif os.path.getsize(source) == os.path.getsize(target):
+            compare.append(source)
+        else:
+            actions[source] = "WOULD COPY" if overwrite else "CONFLICT"
+
+    if compare:
+        cache = shared_cache(config_path(HASH_CACHE_NAME))
+        digests = digest_files(compare + [targets[source] for source in compare], cache)
+        cache.save()
+        for source in compare:
+            same = digests.get(source) and digests.get(source) == digests.get(targets[source])
+            actions[source] = "IDENTICAL" if same else ("WOULD COPY" if overwrite else "CONFLICT")
+    return actions
+
+
+def copy_files(jobs, link_mode, workers=COPY_WORKERS):
+    # Returns {source: error message} for the copies that failed.
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {source: pool.submit(copy_file, source, target, link_mode) for source, target in jobs.items()}
+        for source, future in futures.items():
+            try:
+                future.result()
+            except OSError as exc:
+                errors[source] = str(exc)
+    return errors
+
+
+def copy_file(source, target, link_mode):
+    # Write next to the target and rename, so a failed copy never leaves a
+    # truncated texture under the final name.
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if link_mode == "HARDLINK" and hardlink(source, temp_path):
+            method = "hardlink"
+        elif link_mode in ("REFLINK", "HARDLINK") and reflink(source, temp_path):
+            method = "reflink"
+        else:
+            shutil.copy2(source, temp_path)
+            method = "copy"
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        raise
+    return method
+
+
+def hardlink(source, target):
+    try:
+        os.link(source, target)
+        return True
+    except (OSError, NotImplementedError):
+        return False
+
+
+def reflink(source, target):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        return False
+    shutil.copystat(source, target)
+    return True
@@ -3,11 +3,30 @@ from bpy.props import EnumProperty
 from bpy.types import Operator, PropertyGroup
 
 
+LOD_SUFFIXES = ("300", "600", "1000", "1500")
+LOD_ROOTS = ("MAIN", "Scratchpad")
+
+
 def collection_items(self, context):
     items = [(coll.name, coll.name, "") for coll in bpy.data.collections]
     return items or [("None", "None", "No collections available")]
 
 
+def lod_collection_names():
+    names = []
+    for root in LOD_ROOTS:
+        for suffix in LOD_SUFFIXES:
+            name = f"{root}_{suffix}"
+            if name in bpy.data.collections:
+                names.append(name)
+    return names
+
+
+def lod_collection_items(self, context):
+    items = [(name, name, "") for name in lod_collection_names()]
+    return items or [("None", "None", "No LOD collections available")]
+
+
 class SwapCollectionsProperties(PropertyGroup):
     collection_1: EnumProperty(
         name="Collection 1",
@@ -93,7 +112,7 @@ class OBJECT_OT_CreateInitialCollections(Operator):
         main, was_created, was_linked = self.create_collection(context, "MAIN")
         self._record("MAIN", was_created, was_linked, created, linked)
 
-        for suffix in ("300", "600", "1000", "1500"):
+        for suffix in LOD_SUFFIXES:
             name = f"MAIN_{suffix}"
             _, was_created, was_linked = self.create_collection(context, name, parent_collection=main)
             self._record(name, was_created, was_linked, created, linked)
@@ -101,7 +120,7 @@ class OBJECT_OT_CreateInitialCollections(Operator):
         scratchpad, was_created, was_linked = self.create_collection(context, "Scratchpad")
         self._record("Scratchpad", was_created, was_linked, created, linked)
 
-        for suffix in ("300", "600", "1000", "1500"):
+        for suffix in LOD_SUFFIXES:
             name = f"Scratchpad_{suffix}"
             _, was_created, was_linked = self.create_collection(context, name, parent_collection=scratchpad)
             self._record(name, was_created, was_linked, created, linked)
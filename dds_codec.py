@@ -0,0 +1,249 @@
+import os
+import struct
+
+import numpy as np
+
+if __package__:
+    from .image_resample import linear_to_srgb, resize_axis, srgb_to_linear
+else:
+    from image_resample import linear_to_srgb, resize_axis, srgb_to_linear
+
+
+DDS_MAGIC = b"DDS "
+DDSD_CAPS = 0x1
+DDSD_HEIGHT = 0x2
+DDSD_WIDTH = 0x4
+DDSD_PIXELFORMAT = 0x1000
+DDSD_MIPMAPCOUNT = 0x20000
+DDSD_LINEARSIZE = 0x80000
+DDPF_FOURCC = 0x4
+DDSCAPS_COMPLEX = 0x8
+DDSCAPS_TEXTURE = 0x1000
+DDSCAPS_MIPMAP = 0x400000
+
+FOURCC = {"BC1": b"DXT1", "BC3": b"DXT5"}
+BLOCK_BYTES = {"BC1": 8, "BC3": 16}
+BC1_BLOCK = np.dtype([("color0", "<u2"), ("color1", "<u2"), ("indices", "<u4")])
+
+KAISER_TAPS = 8
+KAISER_BETA = 4.0
+POWER_ITERATIONS = 8
+
+
+def kaiser_kernel(taps=KAISER_TAPS, beta=KAISER_BETA):
+    # Half-band windowed sinc for an exact 2:1 reduction; taps sit at
+    # +-0.5, +-1.5, ... source pixels from the output sample centre.
+    offsets = np.arange(taps) - (taps - 1) / 2
+    radius = taps / 2
+    window = np.i0(beta * np.sqrt(np.clip(1 - (offsets / radius) ** 2, 0, None))) / np.i0(beta)
+    kernel = np.sinc(offsets / 2) * window
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def kaiser_halve_axis(pixels, axis):
+    kernel = kaiser_kernel()
+    half = len(kernel) // 2
+    padding = [(0, 0)] * pixels.ndim
+    padding[axis] = (half - 1, half)
+    padded = np.pad(pixels, padding, mode="edge")
+    target = pixels.shape[axis] // 2
+    result = np.zeros(pixels.shape[:axis] + (target,) + pixels.shape[axis + 1 :], dtype=np.float32)
+    for tap, weight in enumerate(kernel):
+        index = [slice(None)] * pixels.ndim
+        index[axis] = slice(tap, tap + 2 * target, 2)
+        result += weight * padded[tuple(index)]
+    return result
+
+
+def halve(pixels, mip_filter):
+    height, width = pixels.shape[:2]
+    for axis, size in ((0, height), (1, width)):
+        if size == 1:
+            continue
+        if mip_filter == "KAISER" and size % 2 == 0 and size >= KAISER_TAPS:
+            pixels = kaiser_halve_axis(pixels, axis)
+        else:
+            pixels = resize_axis(pixels, max(1, size // 2), axis)
+    return pixels
+
+
+def mip_chain(pixels, mip_filter="BOX", srgb=False, alpha=False):
+    # pixels: float32 (rows, columns, 4), top row first, 0..1. Each level is
+    # filtered from the previous one in linear, alpha-weighted space.
+    levels = [pixels]
+    current = pixels.astype(np.float32, copy=True)
+    if srgb:
+        current[..., :3] = srgb_to_linear(current[..., :3])
+    if alpha:
+        current[..., :3] *= current[..., 3:4]
+
+    while max(current.shape[:2]) > 1:
+        current = halve(current, mip_filter)
+        level = np.clip(current, 0.0, 1.0)
+        if alpha:
+            coverage = level[..., 3:4]
+            level[..., :3] = np.divide(
+                level[..., :3], coverage, out=np.zeros_like(level[..., :3]), where=coverage > 1e-6
+            )
+        if srgb:
+            level[..., :3] = linear_to_srgb(level[..., :3])
+        levels.append(np.clip(level, 0.0, 1.0).astype(np.float32))
+    return levels
+
+
+def to_blocks(pixels):
+    # (rows, columns, channels) uint8 -> (block count, 16, channels), padding
+    # partial blocks by repeating the last row/column.
+    height, width, channels = pixels.shape
+    padded_height, padded_width = (height + 3) // 4 * 4, (width + 3) // 4 * 4
+    if (padded_height, padded_width) != (height, width):
+        pixels = np.pad(pixels, ((0, padded_height - height), (0, padded_width - width), (0, 0)), mode="edge")
+    blocks = pixels.reshape(padded_height // 4, 4, padded_width // 4, 4, channels).swapaxes(1, 2)
+    return blocks.reshape(-1, 16, channels)
+
+
+def from_blocks(blocks, width, height):
+    # Inverse of to_blocks: (block count, 16, channels) -> (rows, columns, channels).
+    channels = blocks.shape[2]
+    block_columns, block_rows = (width + 3) // 4, (height + 3) // 4
+    pixels = blocks.reshape(block_rows, block_columns, 4, 4, channels).swapaxes(1, 2)
+    return pixels.reshape(block_rows * 4, block_columns * 4, channels)[:height, :width]
+
+
+def pack_565(colors):
+    quantized = np.round(colors * (np.array([31, 63, 31]) / 255.0)).astype(np.uint16)
+    return (quantized[:, 0] << 11) | (quantized[:, 1] << 5) | quantized[:, 2]
+
+
+def unpack_565(packed):
+    red = (packed >> 11) & 31
+    green = (packed >> 5) & 63
+    blue = packed & 31
+    return np.stack([(red << 3) | (red >> 2), (green << 2) | (green >> 4), (blue << 3) | (blue >> 2)], axis=-1).astype(
+        np.float32
+    )
+
+
+def encode_bc1_blocks(blocks):
+    # Range fit: project each block onto its principal axis (power iteration
+    # on the 3x3 covariance), take the extremes, inset them by 1/16 and snap
+    # every texel to the nearest of the four palette colours.
+    colors = blocks[..., :3].astype(np.float32)
+    mean = colors.mean(axis=1)
+    centered = colors - mean[:, None]
+    covariance = np.einsum("nki,nkj->nij", centered, centered)
+    axis = np.ones((len(colors), 3), dtype=np.float32)
+    for _ in range(POWER_ITERATIONS):
+        axis = np.einsum("nij,nj->ni", covariance, axis)
+        norm = np.linalg.norm(axis, axis=1, keepdims=True)
+        axis = np.divide(axis, norm, out=np.zeros_like(axis), where=norm > 1e-12)
+
+    projection = np.einsum("nki,ni->nk", centered, axis)
+    low, high = projection.min(axis=1), projection.max(axis=1)
+    inset = (high - low) / 16
+    end0 = np.clip(mean + axis * (high - inset)[:, None], 0, 255)
+    end1 = np.clip(mean + axis * (low + inset)[:, None], 0, 255)
+
+    color0, color1 = pack_565(end0), pack_565(end1)
+    swap = color0 < color1
+    color0, color1 = np.where(swap, color1, color0), np.where(swap, color0, color1)
+
+    first, second = unpack_565(color0), unpack_565(color1)
+    palette = np.stack([first, second, (2 * first + second) / 3, (first + 2 * second) / 3], axis=1)
+    distance = ((colors[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+    indices = distance.argmin(axis=2).astype(np.uint32)
+    indices[color0 == color1] = 0
+
+    result = np.empty(len(colors), dtype=BC1_BLOCK)
+    result["color0"] = color0
+    result["color1"] = color1
+    result["indices"] = (indices << (2 * np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+    return result.view(np.uint8).reshape(-1, 8)
+
+
+def decode_bc1_blocks(data, count):
+    # (block count, 16, 4) uint8; blocks with color0 <= color1 use the
+    # three-colour palette whose last entry is transparent black.
+    packed = np.frombuffer(data, dtype=BC1_BLOCK, count=count)
+    color0, color1 = packed["color0"], packed["color1"]
+    first, second = unpack_565(color0), unpack_565(color1)
+    four_color = (color0 > color1)[:, None]
+    palette = np.empty((count, 4, 4), dtype=np.float32)
+    palette[:, 0, :3], palette[:, 1, :3] = first, second
+    palette[:, 2, :3] = np.where(four_color, (2 * first + second) / 3, (first + second) / 2)
+    palette[:, 3, :3] = np.where(four_color, (first + 2 * second) / 3, 0)
+    palette[..., 3] = 255
+    palette[:, 3, 3] = np.where(four_color[:, 0], 255, 0)
+
+    indices = (packed["indices"][:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 3
+    return np.round(palette[np.arange(count)[:, None], indices]).astype(np.uint8)
+
+
+def decode_bc1(data, width, height):
+    count = ((width + 3) // 4) * ((height + 3) // 4)
+    return from_blocks(decode_bc1_blocks(data, count), width, height)
+
+
+def encode_alpha_blocks(blocks):
+    # BC3 alpha: endpoints are the block's max and min (8-value mode), each
+    # texel takes the nearest of the eight interpolated values.
+    alpha = blocks[..., 3].astype(np.float32)
+    high, low = alpha.max(axis=1), alpha.min(axis=1)
+    span = np.maximum(high - low, 1e-6)
+    step = np.clip(np.round((high[:, None] - alpha) / span[:, None] * 7), 0, 7).astype(np.uint64)
+    codes = np.where(step == 0, 0, np.where(step == 7, 1, step + 1))
+    codes[high == low] = 0
+
+    packed = (codes << (3 * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    result = np.empty((len(alpha), 8), dtype=np.uint8)
+    result[:, 0] = high.astype(np.uint8)
+    result[:, 1] = low.astype(np.uint8)
+    result[:, 2:] = packed.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :6]
+    return result
+
+
+def encode_level(pixels, dds_format):
+    blocks = to_blocks(pixels)
+    color = encode_bc1_blocks(blocks)
+    if dds_format == "BC1":
+        return color.tobytes()
+    return np.concatenate([encode_alpha_blocks(blocks), color], axis=1).tobytes()
+
+
+def dds_header(width, height, levels, dds_format):
+    linear_size = max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * BLOCK_BYTES[dds_format]
+    flags = DDSD_CAPS | DDSD_HEIGHT | DDSD_WIDTH | DDSD_PIXELFORMAT | DDSD_LINEARSIZE
+    caps = DDSCAPS_TEXTURE
+    if levels > 1:
+        flags |= DDSD_MIPMAPCOUNT
+        caps |= DDSCAPS_COMPLEX | DDSCAPS_MIPMAP
+    header = struct.pack("<4s7I", DDS_MAGIC, 124, flags, height, width, linear_size, 0, levels)
+    header += b"\0" * 44
+    header += struct.pack("<2I4s5I", 32, DDPF_FOURCC, FOURCC[dds_format], 0, 0, 0, 0, 0)
+    header += struct.pack("<5I", caps, 0, 0, 0, 0)
+    return header
+
+
+def encode_dds(pixels, path, dds_format="BC1", mip_filter="BOX", srgb=False, alpha=False, mipmaps=True):
+    # Process-pool entry point. pixels: (rows, columns, 3 or 4), top row first,
+    # uint8 or float 0..1. Writes through a temp file; returns the byte size.
+    values = pixels.astype(np.float32) / 255.0 if pixels.dtype == np.uint8 else pixels.astype(np.float32)
+    if values.shape[2] < 4:
+        rgba = np.ones(values.shape[:2] + (4,), dtype=np.float32)
+        rgba[..., :3] = values[..., :3] if values.shape[2] >= 3 else values[..., :1]
+        values = rgba
+
+    levels = mip_chain(values, mip_filter, srgb, alpha and dds_format == "BC3") if mipmaps else [values]
+    height, width = values.shape[:2]
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as out:
+            out.write(dds_header(width, height, len(levels), dds_format))
+            for level in levels:
+                out.write(encode_level(np.round(level * 255.0).astype(np.uint8), dds_format))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return os.path.getsize(path)
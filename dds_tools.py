@@ -0,0 +1,113 @@
+import os
+from collections import deque
+
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .image_buffers import read_compact
+from .process_pool import process_pool, standalone
+from .texture_tools import apply_new_path, build_new_path_from_prefix_suffix, can_edit_image, collect_object_images
+
+
+class TXCH_OT_ConvertToDDS(Operator):
+    bl_idname = "txch.convert_to_dds"
+    bl_label = "Convert to DDS"
+    bl_description = (
+        "Write a mipmapped BC1/BC3 .dds next to every texture in scope, in parallel, "
+        "and repoint each image once its file is written"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = collect_object_images(props.scope)
+        if not images:
+            self.report({"INFO"}, "No image textures found in scope.")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: CONVERT TO DDS ===")
+        print(f"Format / mips    : {props.dds_format} / {props.dds_mip_filter}")
+        planned = plan_dds(images)
+        if not planned:
+            self.report({"INFO"}, "No textures to convert (already DDS, packed or linked).")
+            return {"CANCELLED"}
+        if props.dds_dry_run:
+            for img, old, new in planned:
+                print(f"+ WOULD CONVERT: '{img.name}' {old} -> {new}")
+            self.report({"INFO"}, f"Textures to convert: {len(planned)} (dry run)")
+            return {"FINISHED"}
+
+        converted, failed = convert_images(planned, props)
+        self.report(
+            {"WARNING" if failed else "INFO"},
+            f"Converted {converted} textures to DDS ({failed} failed; see console).",
+        )
+        return {"FINISHED"} if converted else {"CANCELLED"}
+
+
+def plan_dds(images):
+    # Returns [(image, old path, new absolute .dds path)]; the new path goes
+    # through the same change_ext rule as the path tools.
+    planned = []
+    for img in sorted(images, key=lambda image: image.name):
+        old = img.filepath_raw or img.filepath
+        if not can_edit_image(img) or img.packed_file or img.source != "FILE" or not old:
+            print(f"- SKIP (packed/linked/no path): '{img.name}'")
+            continue
+        if os.path.splitext(old)[1].lower() == ".dds":
+            continue
+        new = build_new_path_from_prefix_suffix(os.path.normpath(bpy.path.abspath(old)), "", "", "dds")
+        planned.append((img, old, new))
+    return planned
+
+
+def dds_format_for(pixels, requested):
+    # AUTO keeps BC1 (half the size) unless the image really uses its alpha.
+    if requested != "AUTO":
+        return requested
+    if pixels.shape[2] < 4:
+        return "BC1"
+    opaque = 255 if pixels.dtype == np.uint8 else 1.0
+    return "BC3" if (pixels[..., 3] < opaque).any() else "BC1"
+
+
+def convert_images(planned, props, workers=None):
+    # Pixels are read through Blender on the main thread (rows flipped to the
+    # top-first order DDS stores); mip filtering and block encoding run in
+    # worker processes, with at most `workers` images in flight.
+    codec = standalone("dds_codec")
+    workers = min(workers or os.cpu_count() or 1, len(planned))
+    converted = 0
+    failed = 0
+    with process_pool(workers) as pool:
+        window = deque()
+        pending = deque(planned)
+        while pending or window:
+            while pending and len(window) < workers:
+                img, old, new = pending.popleft()
+                try:
+                    pixels = read_compact(img, top_first=True)
+                except Exception as exc:
+                    print(f"    ! Could not read '{img.name}': {exc}")
+                    failed += 1
+                    continue
+                dds_format = dds_format_for(pixels, props.dds_format)
+                srgb = img.colorspace_settings.name == "sRGB"
+                alpha = dds_format == "BC3" and img.alpha_mode != "NONE"
+                future = pool.submit(codec.encode_dds, pixels, new, dds_format, props.dds_mip_filter, srgb, alpha)
+                window.append((img, old, new, dds_format, future))
+            if not window:
+                continue
+
+            img, old, new, dds_format, future = window.popleft()
+            try:
+                size = future.result()
+            except Exception as exc:
+                print(f"    ! Conversion failed for '{img.name}': {exc}")
+                failed += 1
+                continue
+            apply_new_path(img, new, props.make_relative, props.reload_after)
+            print(f"+ {dds_format}: '{img.name}' {old} -> {new} ({size / 1048576:.2f} MB)")
+            converted += 1
+    return converted, failed
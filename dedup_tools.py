@@ -0,0 +1,88 @@
+import os
+
+import bpy
+from bpy.types import Operator
+
+from .hash_cache import HASH_CACHE_NAME, digest_files, digest_payloads, shared_cache
+from .texture_tools import can_edit_image, collect_object_images
+from .user_config import config_path
+
+
+class TXCH_OT_DedupImages(Operator):
+    bl_idname = "txch.dedup_images"
+    bl_label = "Merge Duplicate Images"
+    bl_description = (
+        "Find image datablocks with identical file or packed contents and remap their users "
+        "to one canonical image"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = list(bpy.data.images) if props.rename_scope == "ALL_IMAGES" else collect_object_images(props.scope)
+        groups = duplicate_groups(images)
+        if not groups:
+            self.report({"INFO"}, f"No duplicate images among {len(images)}.")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: DUPLICATE IMAGES ===")
+        duplicates = []
+        for canonical, others in groups:
+            print(f"+ KEEP: '{canonical.name}' ({canonical.filepath or 'packed'})")
+            for img in others:
+                print(f"    {'WOULD MERGE' if props.dedup_dry_run else 'MERGE'}: '{img.name}' ({img.filepath or 'packed'})")
+            duplicates.extend((img, canonical) for img in others)
+
+        if not props.dedup_dry_run:
+            for img, canonical in duplicates:
+                img.user_remap(canonical)
+            bpy.data.batch_remove([img for img, _ in duplicates])
+
+        self.report(
+            {"INFO"},
+            f"Duplicates {'found' if props.dedup_dry_run else 'merged'}: {len(duplicates)} in {len(groups)} groups",
+        )
+        return {"FINISHED"}
+
+
+def image_content_keys(images):
+    # Packed bytes are read here on the main thread; hashing happens in the pool.
+    file_paths = {}
+    payloads = {}
+    for img in images:
+        if not can_edit_image(img):
+            continue
+        if img.packed_file:
+            payloads[img.name] = bytes(img.packed_file.data)
+        elif img.source == "FILE" and img.filepath:
+            file_paths[img.name] = os.path.normpath(bpy.path.abspath(img.filepath))
+
+    cache = shared_cache(config_path(HASH_CACHE_NAME))
+    file_digests = digest_files(file_paths.values(), cache)
+    cache.save()
+    packed_digests = digest_payloads(payloads)
+
+    keys = {}
+    for name, path in file_paths.items():
+        if file_digests.get(path):
+            keys[name] = file_digests[path]
+    keys.update(packed_digests)
+    return keys
+
+
+def duplicate_groups(images):
+    digests = image_content_keys(images)
+    groups = {}
+    for img in images:
+        digest = digests.get(img.name)
+        if digest:
+            key = (digest, img.colorspace_settings.name, img.alpha_mode)
+            groups.setdefault(key, []).append(img)
+
+    result = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda img: (-img.users, bool(img.packed_file), len(img.name), img.name))
+        result.append((members[0], members[1:]))
+    return result
@@ -0,0 +1,590 @@
+import numpy as np
+
+
+CALIPER_CHUNK = 512
+
+
+def transform_points(points, matrix):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def axis_aligned_bounds(points):
+    return points.min(axis=0), points.max(axis=0)
+
+
+def cull_interior_2d(points):
+    # Akl-Toussaint: drop everything strictly inside the octagon of extreme points.
+    directions = np.array(
+        [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)],
+        dtype=np.float64,
+    )
+    extremes = points[np.argmax(points @ directions.T, axis=0)]
+    keep = np.ones(len(extremes), dtype=bool)
+    keep[1:] = np.any(extremes[1:] != extremes[:-1], axis=1)
+    keep[0] = np.any(extremes[0] != extremes[-1])
+    polygon = extremes[keep]
+    if len(polygon) < 3:
+        return points
+
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    rel_x = points[:, None, 0] - polygon[None, :, 0]
+    rel_y = points[:, None, 1] - polygon[None, :, 1]
+    inside = np.all(edges[None, :, 0] * rel_y - edges[None, :, 1] * rel_x > 0, axis=1)
+    return points[~inside]
+
+
+def convex_hull_2d(points):
+    points = np.unique(cull_interior_2d(points), axis=0)
+    if len(points) < 3:
+        return points
+
+    def half(sequence):
+        chain = []
+        for point in sequence:
+            while len(chain) >= 2:
+                ox, oy = chain[-2]
+                ax, ay = chain[-1]
+                if (ax - ox) * (point[1] - oy) - (ay - oy) * (point[0] - ox) > 0:
+                    break
+                chain.pop()
+            chain.append((point[0], point[1]))
+        return chain
+
+    rows = points.tolist()
+    lower = half(rows)
+    upper = half(reversed(rows))
+    return np.array(lower[:-1] + upper[:-1], dtype=np.float64)
+
+
+def min_area_rectangle(hull):
+    edges = np.roll(hull, -1, axis=0) - hull
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    valid = lengths > 0
+    if not np.any(valid):
+        return np.array([1.0, 0.0]), np.array([0.0, 1.0])
+
+    u_dirs = edges[valid] / lengths[valid, None]
+    v_dirs = np.column_stack((-u_dirs[:, 1], u_dirs[:, 0]))
+
+    best_area = np.inf
+    best_index = 0
+    for start in range(0, len(u_dirs), CALIPER_CHUNK):
+        stop = start + CALIPER_CHUNK
+        proj_u = hull @ u_dirs[start:stop].T
+        proj_v = hull @ v_dirs[start:stop].T
+        areas = np.ptp(proj_u, axis=0) * np.ptp(proj_v, axis=0)
+        index = int(np.argmin(areas))
+        if areas[index] < best_area:
+            best_area = areas[index]
+            best_index = start + index
+
+    return u_dirs[best_index], v_dirs[best_index]
+
+
+def box_from_axes(points, axes):
+    projected = points @ axes.T
+    low = projected.min(axis=0)
+    high = projected.max(axis=0)
+    center = ((low + high) * 0.5) @ axes
+    half_extents = (high - low) * 0.5
+    return center, half_extents
+
+
+def oriented_bounding_box(points):
+    # PCA frame first, then hold each principal axis fixed while rotating
+    # calipers find the tightest rectangle in the other two.
+    points = np.asarray(points, dtype=np.float64)
+    centered = points - points.mean(axis=0)
+    if len(points) < 3:
+        axes = np.identity(3)
+    else:
+        _, eigenvectors = np.linalg.eigh(centered.T @ centered)
+        axes = eigenvectors[:, ::-1].T
+
+    center, half_extents = box_from_axes(points, axes)
+    best = (np.prod(half_extents), axes, center, half_extents)
+
+    for fixed in range(3):
+        normal = axes[fixed]
+        plane = np.delete(axes, fixed, axis=0)
+        hull = convex_hull_2d(points @ plane.T)
+        if len(hull) < 3:
+            continue
+        u_dir, v_dir = min_area_rectangle(hull)
+        candidate = np.array([u_dir @ plane, v_dir @ plane, normal])
+        center, half_extents = box_from_axes(points, candidate)
+        volume = np.prod(half_extents)
+        if volume < best[0]:
+            best = (volume, candidate, center, half_extents)
+
+    _, axes, center, half_extents = best
+    axes = axes.copy()
+    if np.linalg.det(axes) < 0:
+        axes[2] = -axes[2]
+    return center, half_extents, axes.T
+
+
+def ritter_sphere(points, max_passes=32):
+    points = np.asarray(points, dtype=np.float64)
+    first = points[np.argmax(np.sum((points - points[0]) ** 2, axis=1))]
+    second = points[np.argmax(np.sum((points - first) ** 2, axis=1))]
+    center = (first + second) * 0.5
+    radius = float(np.linalg.norm(second - first)) * 0.5
+
+    # Vectorized Ritter: grow towards the worst outlier until nothing is outside.
+    for _ in range(max_passes):
+        distances = np.sqrt(np.sum((points - center) ** 2, axis=1))
+        index = int(np.argmax(distances))
+        distance = float(distances[index])
+        if distance <= radius:
+            break
+        new_radius = (radius + distance) * 0.5
+        center = center + (points[index] - center) * ((new_radius - radius) / distance)
+        radius = new_radius
+    else:
+        radius = float(np.sqrt(np.max(np.sum((points - center) ** 2, axis=1))))
+
+    return center, radius
+
+
+def minimal_bounding_sphere(points, max_iterations=256):
+    # Exact sphere: Welzl on a small working set, grown by the worst violator
+    # of the full buffer until every point is inside.
+    points = np.asarray(points, dtype=np.float64)
+    fallback = ritter_sphere(points)
+    tolerance = 1e-9 * max(1.0, float(np.max(np.abs(points))))
+
+    distances = np.sum((points - points.mean(axis=0)) ** 2, axis=1)
+    working = [tuple(points[int(np.argmax(distances))])]
+    for _ in range(max_iterations):
+        center, radius = welzl_sphere(working, tolerance)
+        center = np.array(center)
+        distances = np.sum((points - center) ** 2, axis=1)
+        index = int(np.argmax(distances))
+        if distances[index] <= (radius + tolerance) ** 2:
+            return center, radius
+        working.append(tuple(points[index]))
+
+    return fallback
+
+
+def welzl_sphere(points, tolerance=1e-9):
+    points = list(points)
+    np.random.default_rng(len(points)).shuffle(points)
+
+    def contains(center, radius, point):
+        return radius >= 0 and squared_distance(center, point) <= (radius + tolerance) ** 2
+
+    def solve(count, boundary):
+        center, radius = boundary_sphere(boundary)
+        if len(boundary) == 4:
+            return center, radius
+        for index in range(count):
+            if not contains(center, radius, points[index]):
+                center, radius = solve(index, boundary + (points[index],))
+        return center, radius
+
+    return solve(len(points), ())
+
+
+def squared_distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+def boundary_sphere(boundary):
+    if not boundary:
+        return (0.0, 0.0, 0.0), -1.0
+    if len(boundary) == 1:
+        return boundary[0], 0.0
+
+    pts = np.array(boundary, dtype=np.float64)
+    if len(boundary) == 2:
+        center = (pts[0] + pts[1]) * 0.5
+        return tuple(center), float(np.linalg.norm(pts[1] - pts[0])) * 0.5
+
+    origin = pts[0]
+    offsets = pts[1:] - origin
+    if len(boundary) == 3:
+        ab, ac = offsets
+        normal = np.cross(ab, ac)
+        denominator = 2.0 * float(normal @ normal)
+        if denominator > 1e-18:
+            center = origin + ((ac @ ac) * np.cross(normal, ab) + (ab @ ab) * np.cross(ac, normal)) / denominator
+            return tuple(center), float(np.linalg.norm(center - origin))
+    else:
+        try:
+            center = origin + np.linalg.solve(2.0 * offsets, np.sum(offsets**2, axis=1))
+            return tuple(center), float(np.linalg.norm(center - origin))
+        except np.linalg.LinAlgError:
+            pass
+
+    # Degenerate (collinear/coplanar) boundary: use the largest sub-sphere.
+    best = ((0.0, 0.0, 0.0), -1.0)
+    for skip in range(len(boundary)):
+        subset = boundary[:skip] + boundary[skip + 1 :]
+        center, radius = boundary_sphere(subset)
+        if radius > best[1]:
+            best = (center, radius)
+    return best
+
+
+# (point, face) pairs above which one eye's points are scored as a matrix.
+FARTHEST_MATRIX_PAIRS = 4096
+# Floods per QuickHull round; later ones retry eyes that lost to dropped eyes.
+FLOOD_PASSES = 2
+# Most vertices a hull is refined to. Near-spherical meshes need a round per
+# few percent of their eyes, so an uncapped 100k-vertex sphere takes seconds;
+# at this size any input stays well under one.
+HULL_VERTEX_LIMIT = 4096
+
+
+def gather_ranges(starts, counts):
+    # Indices starts[0] .. starts[0] + counts[0] - 1, then the next range, ...
+    firsts = np.cumsum(counts) - counts
+    return np.repeat(starts - firsts, counts) + np.arange(int(counts.sum()))
+
+
+def segment_argmax(values, counts):
+    # Index into `values` of the (first) largest entry of each consecutive
+    # run of counts[i] entries; every count must be positive.
+    if not len(counts):
+        return np.zeros(0, dtype=np.int64)
+    firsts = np.cumsum(counts) - counts
+    hits = np.flatnonzero(values == np.repeat(np.maximum.reduceat(values, firsts), counts))
+    segments = np.repeat(np.arange(len(counts)), counts)[hits]
+    return hits[np.r_[True, segments[1:] != segments[:-1]]]
+
+
+class HullGrowth:
+    # Growable face arrays for QuickHull; dead faces stay in place and are masked out.
+    # neighbours[f, k] is the face across edge k, (vertices[f, k], vertices[f, (k + 1) % 3]).
+    # The points outside face f are outside[first[f] : first[f] + counts[f]];
+    # the farthest of them is its eye, eye_heights[f] above it.
+
+    def __init__(self, capacity=64):
+        self.vertices = np.zeros((capacity, 3), dtype=np.int64)
+        self.neighbours = np.full((capacity, 3), -1, dtype=np.int64)
+        self.normals = np.zeros((capacity, 3), dtype=np.float64)
+        self.offsets = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.first = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.eyes = np.zeros(capacity, dtype=np.int64)
+        self.eye_heights = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+        self.outside = np.zeros(capacity, dtype=np.int64)
+        self.outside_used = 0
+
+    def add(self, triangles, points):
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        needed = self.count + len(triangles)
+        if needed > len(self.alive):
+            size = max(needed, len(self.alive) * 2)
+            for name in (
+                "vertices",
+                "neighbours",
+                "normals",
+                "offsets",
+                "alive",
+                "first",
+                "counts",
+                "eyes",
+                "eye_heights",
+            ):
+                old = getattr(self, name)
+                grown = np.full((size,) + old.shape[1:], -1 if name == "neighbours" else 0, dtype=old.dtype)
+                grown[: self.count] = old[: self.count]
+                setattr(self, name, grown)
+
+        a, b, c = (points[triangles[:, column]] for column in range(3))
+        normals = np.cross(b - a, c - a)
+        lengths = np.linalg.norm(normals, axis=1)
+        normals /= np.where(lengths > 0, lengths, 1.0)[:, None]
+
+        ids = np.arange(self.count, needed)
+        self.vertices[ids] = triangles
+        self.normals[ids] = normals
+        self.offsets[ids] = np.sum(normals * a, axis=1)
+        self.alive[ids] = True
+        self.count = needed
+        return ids
+
+    def heights(self, point_ids, face_ids, points):
+        # Signed distance of each point above the face paired with it.
+        return np.einsum("ij,ij->i", points[point_ids], self.normals[face_ids]) - self.offsets[face_ids]
+
+    def set_outside(self, point_ids, faces, heights):
+        # Stores each face's outside points and picks its eye. Earlier entries
+        # for those faces are abandoned in place.
+        if not len(point_ids):
+            return
+        order = np.argsort(faces, kind="stable")
+        point_ids, faces, heights = point_ids[order], faces[order], heights[order]
+        firsts = np.flatnonzero(np.r_[True, faces[1:] != faces[:-1]])
+        counts = np.diff(np.r_[firsts, len(faces)])
+        best = segment_argmax(heights, counts)
+        needed = self.outside_used + len(point_ids)
+        if needed > len(self.outside):
+            grown = np.zeros(max(needed, len(self.outside) * 2), dtype=np.int64)
+            grown[: self.outside_used] = self.outside[: self.outside_used]
+            self.outside = grown
+        self.outside[self.outside_used : needed] = point_ids
+        owners = faces[firsts]
+        self.first[owners] = self.outside_used + firsts
+        self.counts[owners] = counts
+        self.eyes[owners] = point_ids[best]
+        self.eye_heights[owners] = heights[best]
+        self.outside_used = needed
+
+    def take_outside(self, faces):
+        # The outside points of `faces` (grouped per face) and their counts;
+        # the faces keep none.
+        counts = self.counts[faces]
+        taken = self.outside[gather_ranges(self.first[faces], counts)]
+        self.counts[faces] = 0
+        return taken, counts
+
+
+def initial_simplex(points, epsilon):
+    extremes = np.concatenate((np.argmin(points, axis=0), np.argmax(points, axis=0)))
+    best = (0.0, 0, 0)
+    for i in extremes:
+        for j in extremes:
+            distance = float(np.sum((points[i] - points[j]) ** 2))
+            if distance > best[0]:
+                best = (distance, int(i), int(j))
+    _, first, second = best
+    if best[0] <= epsilon**2:
+        raise ValueError("points are coincident")
+
+    line = points[second] - points[first]
+    line /= np.linalg.norm(line)
+    offsets = points - points[first]
+    off_line = offsets - np.outer(offsets @ line, line)
+    third = int(np.argmax(np.sum(off_line**2, axis=1)))
+    if np.linalg.norm(off_line[third]) <= epsilon:
+        raise ValueError("points are collinear")
+
+    normal = np.cross(line, points[third] - points[first])
+    normal /= np.linalg.norm(normal)
+    heights = offsets @ normal
+    fourth = int(np.argmax(np.abs(heights)))
+    if abs(heights[fourth]) <= epsilon:
+        raise ValueError("points are coplanar")
+
+    return first, second, third, fourth
+
+
+def farthest_faces(hull, points, point_ids, starts, counts, face_list):
+    # Point i may lie outside face_list[starts[i] : starts[i] + counts[i]];
+    # returns the face it is farthest above and that height, per point.
+    # Points sharing a large face range go through one matrix product, the
+    # rest through flat (point, face) pairs.
+    best_face = np.zeros(len(point_ids), dtype=np.int64)
+    best_height = np.zeros(len(point_ids), dtype=np.float64)
+    order = np.argsort(starts, kind="stable")
+    group_firsts = np.flatnonzero(np.r_[True, starts[order][1:] != starts[order][:-1]]) if len(order) else order
+    group_sizes = np.diff(np.r_[group_firsts, len(order)])
+    large = group_sizes * counts[order[group_firsts]] >= FARTHEST_MATRIX_PAIRS
+    small = np.ones(len(point_ids), dtype=bool)
+    for first, size in zip(group_firsts[large].tolist(), group_sizes[large].tolist()):
+        members = order[first : first + size]
+        start, count = int(starts[members[0]]), int(counts[members[0]])
+        faces = face_list[start : start + count]
+        heights = points[point_ids[members]] @ hull.normals[faces].T - hull.offsets[faces]
+        column = np.argmax(heights, axis=1)
+        best_face[members] = faces[column]
+        best_height[members] = heights[np.arange(size), column]
+        small[members] = False
+
+    rest = np.flatnonzero(small)
+    if len(rest):
+        pair_point = np.repeat(rest, counts[rest])
+        pair_face = face_list[gather_ranges(starts[rest], counts[rest])]
+        heights = hull.heights(point_ids[pair_point], pair_face, points)
+        best = segment_argmax(heights, counts[rest])
+        best_face[rest], best_height[rest] = pair_face[best], heights[best]
+    return best_face, best_height
+
+
+def flood_regions(hull, points, eyes, eye_faces, epsilon, seen, touched):
+    # Floods the faces each eye sees outward from the face it was assigned
+    # to, all eyes at once. A face may be seen by one eye only, the earliest
+    # in `eyes` that reaches it, and may not border the region of another
+    # (bordering several is fine); the eyes that lose are dropped, as are
+    # eyes that see a face `touched` (seen or bordered) by eyes kept earlier
+    # or border one they `seen`. Returns the mask of eyes left, (eye, face)
+    # pairs of the faces seen and (eye, face, edge) triples of horizon edges.
+    owner = np.full(hull.count, -1, dtype=np.int64)
+    owner[eye_faces] = np.arange(len(eyes))
+    ok = ~touched[eye_faces]
+    first = np.full(hull.count, len(eyes), dtype=np.int64)
+    frontier_eye, frontier_face = np.arange(len(eyes)), eye_faces
+    visible = [(frontier_eye, frontier_face)]
+    horizon = []
+    while len(frontier_eye):
+        keep = ok[frontier_eye]
+        edge_eye = np.repeat(frontier_eye[keep], 3)
+        edge_face = np.repeat(frontier_face[keep], 3)
+        edge = np.tile(np.arange(3), len(edge_eye) // 3)
+        neighbour = hull.neighbours[edge_face, edge]
+        sees = hull.heights(eyes[edge_eye], neighbour, points) > epsilon
+        horizon.append((edge_eye[~sees], edge_face[~sees], edge[~sees]))
+
+        # A seen face goes to the earliest eye reaching or holding it; faces
+        # of dropped eyes are free again.
+        edge_eye, neighbour = edge_eye[sees], neighbour[sees]
+        ok[edge_eye[touched[neighbour]]] = False
+        held = owner[neighbour]
+        contested = (held < 0) | (held > edge_eye) | ~ok[np.maximum(held, 0)]
+        faces = neighbour[contested]
+        holders = owner[faces]
+        first[faces] = np.where((holders >= 0) & ok[np.maximum(holders, 0)], holders, len(eyes))
+        np.minimum.at(first, faces, edge_eye[contested])
+        taken = contested & (held >= 0)
+        ok[held[taken][first[neighbour[taken]] != held[taken]]] = False
+        owner[faces] = first[faces]
+        ok[edge_eye[owner[neighbour] != edge_eye]] = False
+
+        reached = np.unique(neighbour[(held != edge_eye) & (owner[neighbour] == edge_eye)])
+        frontier_eye, frontier_face = owner[reached], reached
+        visible.append((frontier_eye, frontier_face))
+    visible = [np.concatenate(column) for column in zip(*visible)]
+    horizon = [np.concatenate(column) for column in zip(*horizon)]
+
+    # A face one eye sees and another borders drops the later of the two.
+    hidden = hull.neighbours[horizon[1], horizon[2]]
+    ok[horizon[0][seen[hidden]]] = False
+    bordered = owner[hidden]
+    clash = (bordered >= 0) & (bordered != horizon[0])
+    clash &= ok[np.maximum(bordered, 0)] & ok[horizon[0]]
+    ok[np.maximum(bordered, horizon[0])[clash]] = False
+    return ok, visible, horizon
+
+
+def visible_regions(hull, points, eyes, eye_faces, epsilon, passes=FLOOD_PASSES):
+    # Eyes dropped in one flood only because of an eye that was dropped
+    # itself get further passes against the regions kept so far. Returns the
+    # mask of eyes kept and their visible pairs and horizon triples.
+    run = np.zeros(len(eyes), dtype=bool)
+    seen = np.zeros(hull.count, dtype=bool)
+    touched = np.zeros(hull.count, dtype=bool)
+    pending = np.arange(len(eyes))
+    visible = []
+    horizon = []
+    for _ in range(passes):
+        ok, (visible_eye, visible_face), (horizon_eye, horizon_face, horizon_edge) = flood_regions(
+            hull, points, eyes[pending], eye_faces[pending], epsilon, seen, touched
+        )
+        keep = ok[visible_eye]
+        visible.append((pending[visible_eye[keep]], visible_face[keep]))
+        seen[visible_face[keep]] = True
+        touched[visible_face[keep]] = True
+        keep = ok[horizon_eye]
+        horizon.append((pending[horizon_eye[keep]], horizon_face[keep], horizon_edge[keep]))
+        touched[hull.neighbours[horizon_face[keep], horizon_edge[keep]]] = True
+        run[pending[ok]] = True
+        pending = pending[~ok]
+        if not len(pending) or not ok.any():
+            break
+    visible = [np.concatenate(column) for column in zip(*visible)]
+    horizon = [np.concatenate(column) for column in zip(*horizon)]
+    return run, visible, horizon
+
+
+def convex_hull_3d(points, max_vertices=0):
+    # Batched QuickHull. Every round takes the farthest outside point of each
+    # face as an eye, floods the eyes' visible regions together and applies
+    # every eye whose region (with the hidden faces bordering it) no earlier
+    # eye touches; the rest wait for the next round. Disjoint regions cannot
+    # see each other's new faces, so the result equals one-at-a-time QuickHull.
+    # Refinement stops at ``max_vertices``, or HULL_VERTEX_LIMIT when that is
+    # 0 or larger; only eyes at least half as far out as the farthest are used,
+    # so stopping early still gives a good reduced proxy. Hulls with fewer
+    # vertices than the limit are exact.
+    if not 0 < max_vertices < HULL_VERTEX_LIMIT:
+        max_vertices = HULL_VERTEX_LIMIT
+    points = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    extent = float(np.max(np.ptp(points, axis=0))) if len(points) else 0.0
+    epsilon = max(extent, 1e-12) * 1e-9
+
+    a, b, c, d = initial_simplex(points, epsilon)
+    hull = HullGrowth()
+    triangles = np.array([(a, b, c), (a, c, d), (a, d, b), (b, d, c)])
+    ids = hull.add(triangles, points)
+    inside = points[[a, b, c, d]].mean(axis=0)
+    flip = hull.heights(np.zeros(4, dtype=np.int64), ids, inside[None, :]) > 0
+    if np.any(flip):
+        triangles[flip] = triangles[flip][:, ::-1]
+        hull.count = 0
+        ids = hull.add(triangles, points)
+    edge_faces = {}
+    for face, triangle in enumerate(triangles.tolist()):
+        for edge in range(3):
+            edge_faces[(triangle[edge], triangle[(edge + 1) % 3])] = (face, edge)
+    for (start, end), (face, edge) in edge_faces.items():
+        hull.neighbours[face, edge] = edge_faces[(end, start)][0]
+
+    rest = np.setdiff1d(np.arange(len(points)), [a, b, c, d])
+    faces, heights = farthest_faces(hull, points, rest, np.zeros(len(rest), dtype=np.int64), np.full(len(rest), 4), ids)
+    outside = heights > epsilon
+    hull.set_outside(rest[outside], faces[outside], heights[outside])
+    hull_vertices = 4
+
+    while hull_vertices < max_vertices:
+        eye_faces = np.flatnonzero(hull.counts[: hull.count])
+        if not len(eye_faces):
+            break
+        eye_faces = eye_faces[np.argsort(-hull.eye_heights[eye_faces], kind="stable")]
+        eye_faces = eye_faces[hull.eye_heights[eye_faces] >= 0.5 * hull.eye_heights[eye_faces[0]]]
+        eyes = hull.eyes[eye_faces]
+        run, (visible_eye, visible_face), (horizon_eye, horizon_face, horizon_edge) = visible_regions(
+            hull, points, eyes, eye_faces, epsilon
+        )
+        run[np.flatnonzero(run)[max_vertices - hull_vertices :]] = False
+        hull_vertices += int(run.sum())
+
+        keep = run[visible_eye]
+        visible_eye, visible_face = visible_eye[keep], visible_face[keep]
+        keep = run[horizon_eye]
+        order = np.argsort(horizon_eye[keep], kind="stable")
+        horizon_eye, horizon_face, horizon_edge = (
+            horizon_eye[keep][order],
+            horizon_face[keep][order],
+            horizon_edge[keep][order],
+        )
+        hidden = hull.neighbours[horizon_face, horizon_edge]
+
+        # One new face per horizon edge, (start, end, eye), wound like the
+        # visible face it replaces. Around an eye the new faces form a fan,
+        # so the face across (end, eye) is the one starting at `end`.
+        starts = hull.vertices[horizon_face, horizon_edge]
+        ends = hull.vertices[horizon_face, (horizon_edge + 1) % 3]
+        hull.alive[visible_face] = False
+        new_ids = hull.add(np.stack((starts, ends, eyes[horizon_eye]), axis=1), points)
+        hull.neighbours[new_ids, 0] = hidden
+        back = np.argmax(hull.neighbours[hidden] == horizon_face[:, None], axis=1)
+        hull.neighbours[hidden, back] = new_ids
+        stride = len(points)
+        for column, (key, target) in enumerate(((starts, ends), (ends, starts)), start=1):
+            fan = horizon_eye * stride + key
+            fan_order = np.argsort(fan)
+            hull.neighbours[new_ids, column] = new_ids[
+                fan_order[np.searchsorted(fan, horizon_eye * stride + target, sorter=fan_order)]
+            ]
+
+        # Points above a replaced face can only be outside its eye's new faces.
+        moved, counts = hull.take_outside(visible_face)
+        eye_of = np.repeat(visible_eye, counts)
+        keep = moved != eyes[eye_of]
+        moved, eye_of = moved[keep], eye_of[keep]
+        new_counts = np.bincount(horizon_eye, minlength=len(eyes))
+        new_first = np.cumsum(new_counts) - new_counts
+        faces, heights = farthest_faces(hull, points, moved, new_first[eye_of], new_counts[eye_of], new_ids)
+        outside = heights > epsilon
+        hull.set_outside(moved[outside], faces[outside], heights[outside])
+
+    faces = hull.vertices[np.flatnonzero(hull.alive[: hull.count])]
+    used, remapped = np.unique(faces, return_inverse=True)
+    return points[used], remapped.reshape(-1, 3)
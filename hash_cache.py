@@ -0,0 +1,268 @@
+import hashlib
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+HASH_CACHE_NAME = "file_hashes.log"
+HASH_CHUNK = 1 << 20
+HASH_WORKERS = 8
+# Soft limit: the log (and the entries read from it) may grow to twice this
+# many records before a save compacts it back down to the newest MAX_ENTRIES,
+# so a full cache is rewritten once per MAX_ENTRIES stores, not on every save.
+MAX_ENTRIES = 100_000
+
+# Append-only log: file magic, then records of
+#   crc32(u32) kind(u8) path_len(u16) payload_len(u16) size(i64) mtime_ns(i64) path payload
+# where the crc covers everything after itself. A torn or corrupt tail ends the
+# readable log and triggers a compaction on the next save.
+FILE_MAGIC = b"TSTHASH1"
+RECORD = struct.Struct("<IBHHqq")
+KIND_DIGEST = 1
+KIND_PROBE = 2
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bytes_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@contextmanager
+def locked(lock_path, shared=False):
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def encode_record(kind, path, size, mtime_ns, payload):
+    encoded = path.encode("utf-8")
+    body = RECORD.pack(0, kind, len(encoded), len(payload), size, mtime_ns)[4:] + encoded + payload
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def decode_records(data, offset):
+    # Yields (end offset, kind, path, size, mtime_ns, payload) until the data
+    # runs out or a record fails its checksum.
+    while offset + RECORD.size <= len(data):
+        crc, kind, path_len, payload_len, size, mtime_ns = RECORD.unpack_from(data, offset)
+        end = offset + RECORD.size + path_len + payload_len
+        if end > len(data) or zlib.crc32(data[offset + 4 : end]) != crc:
+            return
+        path_end = offset + RECORD.size + path_len
+        yield end, kind, data[offset + RECORD.size : path_end].decode("utf-8"), size, mtime_ns, data[path_end:end]
+        offset = end
+
+
+class FileHashCache:
+    # (kind, abs path) -> (size, mtime_ns, payload) with LRU order; shared by
+    # every tool and every headless worker through the append-only log.
+
+    def __init__(self, cache_path, max_entries=MAX_ENTRIES):
+        self.cache_path = cache_path
+        self.lock_path = cache_path + ".lock"
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.pending = OrderedDict()
+        self.hits = set()
+        self.read_offset = 0
+        self.records = 0
+        self.identity = None
+        self.needs_compaction = False
+        self.refresh()
+
+    def refresh(self):
+        # Pick up records appended by other processes since the last read.
+        try:
+            stat = os.stat(self.cache_path)
+        except OSError:
+            return
+        if stat.st_size != self.read_offset or (stat.st_dev, stat.st_ino) != self.identity:
+            with locked(self.lock_path, shared=True):
+                self.read_new_records()
+
+    def read_new_records(self):
+        # Caller holds the lock.
+        try:
+            with open(self.cache_path, "rb") as log:
+                stat = os.fstat(log.fileno())
+                size = stat.st_size
+                # Compaction replaces the file, so a new inode means start over.
+                if (stat.st_dev, stat.st_ino) != self.identity or size < self.read_offset:
+                    self.identity = (stat.st_dev, stat.st_ino)
+                    self.entries.clear()
+                    self.read_offset = 0
+                    self.records = 0
+                if self.read_offset == 0:
+                    if size and log.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                        self.needs_compaction = True
+                        return
+                    self.read_offset = len(FILE_MAGIC) if size else 0
+                log.seek(self.read_offset)
+                data = log.read()
+        except OSError:
+            return
+
+        offset = 0
+        for offset, kind, path, size, mtime_ns, payload in decode_records(data, 0):
+            self.entries.pop((kind, path), None)
+            self.entries[(kind, path)] = (size, mtime_ns, payload)
+            self.records += 1
+        # Our unsaved hits and stores stay the most recent entries.
+        for key in self.hits:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        for key, entry in self.pending.items():
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+        self.read_offset += offset
+        if offset < len(data):
+            self.needs_compaction = True
+
+    def lookup_record(self, kind, path, stat):
+        key = (kind, path)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return None
+        self.entries.move_to_end(key)
+        self.hits.add(key)
+        return entry[2]
+
+    def store_record(self, kind, path, stat, payload):
+        key = (kind, path)
+        entry = (stat.st_size, stat.st_mtime_ns, bytes(payload))
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        self.pending[key] = entry
+
+    def lookup(self, path, stat):
+        payload = self.lookup_record(KIND_DIGEST, path, stat)
+        return payload.hex() if payload else None
+
+    def store(self, path, stat, digest):
+        self.store_record(KIND_DIGEST, path, stat, bytes.fromhex(digest))
+
+    def save(self):
+        # Only stores are appended, so lookups never grow the log; hits only
+        # reorder the entries a compaction keeps, which run in LRU order.
+        if not self.pending and not self.needs_compaction:
+            return
+        with locked(self.lock_path):
+            self.read_new_records()
+            # 2x slack keeps compaction amortized; see MAX_ENTRIES.
+            if self.needs_compaction or self.records + len(self.pending) > 2 * self.max_entries:
+                self.compact()
+            else:
+                records = b"".join(
+                    encode_record(kind, path, size, mtime_ns, payload)
+                    for (kind, path), (size, mtime_ns, payload) in self.pending.items()
+                )
+                handle = os.open(
+                    self.cache_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+                )
+                try:
+                    # One write per save keeps concurrent appends whole.
+                    os.write(handle, (b"" if self.read_offset else FILE_MAGIC) + records)
+                finally:
+                    os.close(handle)
+                stat = os.stat(self.cache_path)
+                self.identity = (stat.st_dev, stat.st_ino)
+                self.records += len(self.pending)
+                self.read_offset = stat.st_size
+        self.pending.clear()
+        self.hits.clear()
+
+    def compact(self):
+        # Caller holds the lock; the log on disk is fully read, so self.entries
+        # already merges every writer's records with our pending ones.
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as log:
+            log.write(FILE_MAGIC)
+            log.write(
+                b"".join(
+                    encode_record(kind, path, size, mtime_ns, payload)
+                    for (kind, path), (size, mtime_ns, payload) in self.entries.items()
+                )
+            )
+        os.replace(temp_path, self.cache_path)
+        stat = os.stat(self.cache_path)
+        self.identity = (stat.st_dev, stat.st_ino)
+        self.records = len(self.entries)
+        self.read_offset = stat.st_size
+        self.needs_compaction = False
+
+
+SHARED_CACHES = {}
+
+
+def shared_cache(cache_path):
+    cache = SHARED_CACHES.get(cache_path)
+    if cache is None:
+        cache = SHARED_CACHES[cache_path] = FileHashCache(cache_path)
+    else:
+        cache.refresh()
+    return cache
+
+
+def digest_files(paths, cache=None, workers=HASH_WORKERS):
+    # Returns {path: digest or None}; only files the cache cannot answer are read.
+    digests = {}
+    pending = {}
+    for path in set(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            digests[path] = None
+            continue
+        cached = cache.lookup(path, stat) if cache else None
+        if cached:
+            digests[path] = cached
+        else:
+            pending[path] = stat
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(file_digest, path) for path in pending}
+        for path, future in futures.items():
+            try:
+                digests[path] = future.result()
+            except OSError:
+                digests[path] = None
+                continue
+            if cache:
+                cache.store(path, pending[path], digests[path])
+    return digests
+
+
+def digest_payloads(payloads, workers=HASH_WORKERS):
+    # payloads: {key: bytes}; hashlib releases the GIL on large buffers.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(bytes_digest, data) for key, data in payloads.items()}
+        return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,180 @@
+"""Bulk pixel access for Blender images through foreach_get/foreach_set.
+
+Benchmark (4K read, write and channel packing against per-element access):
+
+    blender -b --factory-startup -P image_buffers.py -- --size 4096
+"""
+
+import argparse
+import sys
+import time
+
+import bpy
+import numpy as np
+
+
+def pixel_buffer(img, out=None):
+    # Preallocated float32 (rows, columns, channels) for img, reusing `out`
+    # when it already has the right shape.
+    width, height = img.size
+    shape = (height, width, img.channels)
+    if out is not None and out.shape == shape and out.dtype == np.float32 and out.flags.c_contiguous:
+        return out
+    return np.empty(shape, dtype=np.float32)
+
+
+def read_pixels(img, out=None, top_first=False):
+    # float32 (rows, columns, channels) in Blender's bottom-up order; with
+    # top_first the rows come back as a flipped view, not a copy.
+    pixels = pixel_buffer(img, out)
+    img.pixels.foreach_get(pixels.reshape(-1))
+    return pixels[::-1] if top_first else pixels
+
+
+def read_compact(img, top_first=False):
+    # 8-bit images as uint8 (a quarter of the bytes to pickle for a worker
+    # process), float images as float32. The scaling happens in place.
+    pixels = read_pixels(img, top_first=top_first)
+    if img.is_float:
+        return pixels
+    pixels *= 255.0
+    np.rint(pixels, out=pixels)
+    return pixels.astype(np.uint8)
+
+
+def to_float(pixels):
+    if pixels.dtype == np.uint8:
+        values = pixels.astype(np.float32)
+        values *= 1.0 / 255.0
+        return values
+    return pixels.astype(np.float32, copy=False)
+
+
+def to_bytes(pixels):
+    if pixels.dtype == np.uint8:
+        return pixels
+    values = np.clip(pixels, 0.0, 1.0) * 255.0
+    np.rint(values, out=values)
+    return values.astype(np.uint8)
+
+
+def expand_channels(pixels, channels=4):
+    # (rows, columns, 1-4) -> (rows, columns, channels) float32: grey fills
+    # RGB, a missing alpha is opaque.
+    values = to_float(pixels)
+    if values.shape[2] == channels:
+        return values
+    result = np.ones(values.shape[:2] + (channels,), dtype=np.float32)
+    if values.shape[2] <= 2:
+        result[..., : min(3, channels)] = values[..., :1]
+        if values.shape[2] == 2 and channels == 4:
+            result[..., 3] = values[..., 1]
+    else:
+        result[..., : min(3, channels)] = values[..., : min(3, channels)]
+        if values.shape[2] == 4 and channels == 4:
+            result[..., 3] = values[..., 3]
+    return result
+
+
+def write_pixels(img, pixels, top_first=False):
+    # Writes a whole (rows, columns, any channels) array in one call; the
+    # image must already have the array's size.
+    width, height = img.size
+    if pixels.shape[:2] != (height, width):
+        raise ValueError(f"pixel array is {pixels.shape[1]}x{pixels.shape[0]}, image '{img.name}' is {width}x{height}")
+    values = expand_channels(pixels, img.channels)
+    if top_first:
+        values = values[::-1]
+    img.pixels.foreach_set(np.ascontiguousarray(values, dtype=np.float32).reshape(-1))
+    img.update()
+
+
+def channel(pixels, index):
+    # Zero-copy (rows, columns) view of one channel.
+    return pixels[..., index]
+
+
+def pack_channels(sources, out=None, fill=(0.0, 0.0, 0.0, 1.0)):
+    # sources: up to four (rows, columns) arrays or None, one per output
+    # channel (None keeps the fill value). uint8 inputs are scaled to 0..1.
+    shape = next(source.shape for source in sources if source is not None)
+    if out is None or out.shape != shape + (4,):
+        out = np.empty(shape + (4,), dtype=np.float32)
+    for index in range(4):
+        source = sources[index] if index < len(sources) else None
+        if source is None:
+            out[..., index] = fill[index]
+        elif source.dtype == np.uint8:
+            np.multiply(source, 1.0 / 255.0, out=out[..., index], dtype=np.float32)
+        else:
+            out[..., index] = source
+    return out
+
+
+def new_image(name, pixels, like=None, top_first=False):
+    # In-memory image filled from `pixels`; copies colour space and float
+    # depth from `like` when given.
+    height, width = pixels.shape[:2]
+    float_buffer = like.is_float if like is not None else pixels.dtype != np.uint8
+    img = bpy.data.images.new(name, width, height, alpha=pixels.shape[2] in (2, 4), float_buffer=float_buffer)
+    if like is not None:
+        img.colorspace_settings.name = like.colorspace_settings.name
+    write_pixels(img, pixels, top_first)
+    return img
+
+
+def save_pixels(img, pixels, path, file_format):
+    # Writes `pixels` (bottom row first, like img) to `path` through a
+    # temporary image that takes its colour settings from img.
+    out = new_image(f"{img.name}_out", pixels, like=img)
+    try:
+        out.filepath_raw = path
+        out.file_format = file_format
+        out.save()
+    finally:
+        bpy.data.images.remove(out)
+
+
+def timed(label, function, repeat=3):
+    best = min(timer(function) for _ in range(repeat))
+    print(f"{label:<40} {best * 1000:9.1f} ms")
+    return best
+
+
+def timer(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def benchmark(size=4096, per_element=True):
+    img = bpy.data.images.new("trainsimtools_benchmark", size, size, alpha=True)
+    try:
+        print(f"\n=== TrainSimTools: PIXEL I/O ({size}x{size} RGBA) ===")
+        buffer = pixel_buffer(img)
+        timed("foreach_get into preallocated buffer", lambda: read_pixels(img, out=buffer))
+        timed("foreach_get as uint8", lambda: read_compact(img))
+        timed("foreach_set from float32", lambda: write_pixels(img, buffer))
+        byte_pixels = to_bytes(buffer)
+        timed("foreach_set from uint8", lambda: write_pixels(img, byte_pixels))
+        grey = channel(buffer, 0)
+        timed("pack_channels (3 sources)", lambda: pack_channels([grey, grey, grey], out=buffer))
+        if per_element:
+            timed("img.pixels[:] (per element)", lambda: img.pixels[:], repeat=1)
+            values = [0.5] * (size * size * 4)
+            timed("img.pixels[:] = list (per element)", lambda: img.pixels.__setitem__(slice(None), values), repeat=1)
+    finally:
+        bpy.data.images.remove(img)
+
+
+def main(argv):
+    argv = argv[argv.index("--") + 1 :] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="image_buffers.py", description="Benchmark bulk image pixel access.")
+    parser.add_argument("--size", type=int, default=4096, help="Square test image size in pixels")
+    parser.add_argument("--skip-per-element", action="store_true", help="Skip the slow img.pixels[:] baseline")
+    args = parser.parse_args(argv)
+    benchmark(args.size, not args.skip_per_element)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,235 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(pixels, level=6):
+    # pixels: uint8 (rows, columns, 1-4 channels), top row first. Every
+    # scanline uses filter type 0, prepended as one extra column of zeros.
+    height, width, channels = pixels.shape
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, PNG_COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join(
+        (
+            PNG_SIGNATURE,
+            png_chunk(b"IHDR", header),
+            png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+            png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def write_png(path, pixels, level=6):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as out:
+            out.write(encode_png(pixels, level))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+TGA_TYPES = {2: False, 3: False, 10: True, 11: True}
+TGA_TOP_LEFT = 0x20
+
+
+def paeth(left, up, up_left):
+    estimate = left + up - up_left
+    distance_left, distance_up = np.abs(estimate - left), np.abs(estimate - up)
+    distance_up_left = np.abs(estimate - up_left)
+    return np.where(
+        (distance_left <= distance_up) & (distance_left <= distance_up_left),
+        left,
+        np.where(distance_up <= distance_up_left, up, up_left),
+    )
+
+
+def unfilter_png(lines, filters, bpp):
+    # PNG scanline filters make every byte depend on its left, upper and
+    # upper-left neighbours, so pixels are reconstructed one anti-diagonal at
+    # a time, each step covering one pixel of every row whatever its filter.
+    # The previous two diagonals (indexed by row + 1) hold those neighbours;
+    # entries outside the image stay zero, as the filters expect.
+    if not filters.any():
+        return lines
+    height, row_bytes = lines.shape
+    columns = row_bytes // bpp
+    filtered = lines.reshape(height, columns, bpp)
+    out = np.empty_like(filtered)
+
+    kinds = filters.astype(np.int16)[:, None]
+    masks = [(kinds == kind).astype(np.int16) for kind in (1, 2, 3, 4)]
+    use_paeth = bool(masks[3].any())
+    before = np.zeros((height + 1, bpp), dtype=np.int16)
+    previous = np.zeros((height + 1, bpp), dtype=np.int16)
+    for step in range(columns + height - 1):
+        first, last = max(0, step - columns + 1), min(height, step + 1)
+        rows = np.arange(first, last)
+        left, up, up_left = previous[first + 1 : last + 1], previous[first:last], before[first:last]
+        sub, above, average, nearest = (mask[first:last] for mask in masks)
+        prediction = sub * left + above * up + average * ((left + up) >> 1)
+        if use_paeth:
+            prediction += nearest * paeth(left, up, up_left)
+        current = np.zeros((height + 1, bpp), dtype=np.int16)
+        current[first + 1 : last + 1] = (filtered[rows, step - rows] + prediction) & 255
+        out[rows, step - rows] = current[first + 1 : last + 1]
+        before, previous = previous, current
+    return out.reshape(height, row_bytes)
+
+
+def read_png(data):
+    # uint8 (rows, columns, 4), top row first. 1-16 bit grey, RGB, palette and
+    # alpha images; not interlaced ones. 16-bit samples keep their high byte.
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+    offset = len(PNG_SIGNATURE)
+    header = None
+    palette = None
+    transparency = b""
+    chunks = []
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack_from(">I4s", data, offset)
+        body = data[offset + 8 : offset + 8 + length]
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = np.frombuffer(body, dtype=np.uint8).reshape(-1, 3)
+        elif kind == b"tRNS":
+            transparency = body
+        elif kind == b"IDAT":
+            chunks.append(body)
+        elif kind == b"IEND":
+            break
+        offset += length + 12
+    if header is None:
+        raise ValueError("PNG without a header")
+    width, height, depth, color_type, _compression, _filter, interlace = header
+    if interlace or color_type not in PNG_CHANNELS or (color_type == 3 and palette is None):
+        raise ValueError("unsupported PNG layout")
+
+    channels = PNG_CHANNELS[color_type]
+    row_bytes = (width * channels * depth + 7) // 8
+    raw = np.frombuffer(zlib.decompress(b"".join(chunks)), dtype=np.uint8)
+    raw = raw[: height * (row_bytes + 1)].reshape(height, row_bytes + 1)
+    lines = unfilter_png(raw[:, 1:], raw[:, 0], max(1, channels * depth // 8))
+
+    if depth == 16:
+        samples = lines.reshape(height, width, channels, 2)[..., 0]
+    elif depth == 8:
+        samples = lines.reshape(height, width, channels)
+    else:
+        bits = np.unpackbits(lines, axis=1)[:, : width * depth].reshape(height, width, depth)
+        samples = (bits * (1 << np.arange(depth - 1, -1, -1))).sum(axis=2).astype(np.uint8)[..., None]
+        if color_type == 0:
+            samples *= 255 // ((1 << depth) - 1)
+
+    rgba = np.full((height, width, 4), 255, dtype=np.uint8)
+    if color_type == 3:
+        alpha = np.full(len(palette), 255, dtype=np.uint8)
+        alpha[: len(transparency)] = np.frombuffer(transparency[: len(palette)], dtype=np.uint8)
+        rgba[..., :3] = palette[samples[..., 0]]
+        rgba[..., 3] = alpha[samples[..., 0]]
+    elif channels <= 2:
+        rgba[..., :3] = samples[..., :1]
+        if channels == 2:
+            rgba[..., 3] = samples[..., 1]
+    else:
+        rgba[..., :channels] = samples
+    return rgba
+
+
+def read_tga(data):
+    # uint8 (rows, columns, 4), top row first. Grey and 24/32-bit true colour,
+    # plain or run-length encoded.
+    id_length, _map_type, image_type = struct.unpack_from("<BBB", data, 0)
+    map_length, map_depth = struct.unpack_from("<HB", data, 5)
+    width, height, depth, descriptor = struct.unpack_from("<HHBB", data, 12)
+    if image_type not in TGA_TYPES or depth not in (8, 24, 32):
+        raise ValueError("unsupported TGA layout")
+    pixel_bytes = depth // 8
+    offset = 18 + id_length + map_length * ((map_depth + 7) // 8)
+    total = width * height * pixel_bytes
+
+    if TGA_TYPES[image_type]:
+        # Packets are variable length, so only the walk over them is serial;
+        # runs are expanded with bytes repetition.
+        out = bytearray()
+        while len(out) < total and offset < len(data):
+            packet = data[offset]
+            count = (packet & 0x7F) + 1
+            offset += 1
+            if packet & 0x80:
+                out += data[offset : offset + pixel_bytes] * count
+                offset += pixel_bytes
+            else:
+                out += data[offset : offset + count * pixel_bytes]
+                offset += count * pixel_bytes
+        data, offset = bytes(out), 0
+    if len(data) - offset < total:
+        raise ValueError("truncated TGA")
+
+    samples = np.frombuffer(data, dtype=np.uint8, count=total, offset=offset).reshape(height, width, pixel_bytes)
+    rgba = np.full((height, width, 4), 255, dtype=np.uint8)
+    if pixel_bytes == 1:
+        rgba[..., :3] = samples
+    else:
+        rgba[..., :3] = samples[..., 2::-1]
+        if pixel_bytes == 4:
+            rgba[..., 3] = samples[..., 3]
+    return rgba if descriptor & TGA_TOP_LEFT else rgba[::-1]
+
+
+def read_bmp(data):
+    # uint8 (rows, columns, 4), top row first. 8-bit palette and 24/32-bit
+    # uncompressed (or 32-bit bitfields in BGRA order).
+    if data[:2] != b"BM":
+        raise ValueError("not a BMP file")
+    (pixel_offset,) = struct.unpack_from("<I", data, 10)
+    header_size, width, height, _planes, bit_count, compression = struct.unpack_from("<IiiHHI", data, 14)
+    if bit_count not in (8, 24, 32) or compression not in (0, 3):
+        raise ValueError("unsupported BMP layout")
+    rows = abs(height)
+    stride = (width * bit_count + 31) // 32 * 4
+    lines = np.frombuffer(data, dtype=np.uint8, count=rows * stride, offset=pixel_offset).reshape(rows, stride)
+
+    rgba = np.full((rows, width, 4), 255, dtype=np.uint8)
+    if bit_count == 8:
+        (colors,) = struct.unpack_from("<I", data, 46) if header_size >= 40 else (0,)
+        palette = np.frombuffer(data, dtype=np.uint8, count=(colors or 256) * 4, offset=14 + header_size)
+        rgba[..., :3] = palette.reshape(-1, 4)[lines[:, :width], 2::-1]
+    else:
+        samples = lines[:, : width * bit_count // 8].reshape(rows, width, bit_count // 8)
+        rgba[..., :3] = samples[..., 2::-1]
+        # Plain 32-bit BMPs usually leave the fourth byte at zero.
+        if bit_count == 32 and samples[..., 3].any():
+            rgba[..., 3] = samples[..., 3]
+    return rgba[::-1] if height > 0 else rgba
+
+
+IMAGE_READERS = {".png": read_png, ".tga": read_tga, ".bmp": read_bmp}
+
+
+def read_image(path):
+    reader = IMAGE_READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"unsupported image type '{os.path.splitext(path)[1]}'")
+    with open(path, "rb") as handle:
+        data = handle.read()
+    try:
+        return reader(data)
+    except struct.error as exc:
+        raise ValueError("truncated image") from exc
@@ -0,0 +1,311 @@
+"""Read image size and format from file headers, without decoding pixels.
+
+    python image_probe.py D:/Rolling_Stock/Textures --json probe.json
+
+Supports PNG, JPEG, TGA, BMP, DDS and MSTS ACE (plain or zlib compressed).
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+if __package__:
+    from .hash_cache import KIND_PROBE
+else:
+    from hash_cache import KIND_PROBE
+
+
+PROBE_WORKERS = 16
+PROBE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tga", ".bmp", ".dds", ".ace")
+PROBE_RECORD = struct.Struct("<IIHBB")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+DDSD_MIPMAPCOUNT = 0x20000
+DDPF_ALPHAPIXELS = 0x1
+DDPF_FOURCC = 0x4
+DDS_FOURCC = {
+    b"DXT1": ("BC1", 4, False),
+    b"DXT2": ("BC2", 4, True),
+    b"DXT3": ("BC2", 4, True),
+    b"DXT4": ("BC3", 4, True),
+    b"DXT5": ("BC3", 4, True),
+    b"ATI1": ("BC4", 1, False),
+    b"BC4U": ("BC4", 1, False),
+    b"ATI2": ("BC5", 2, False),
+    b"BC5U": ("BC5", 2, False),
+}
+# DXGI_FORMAT values found in DX10 headers.
+DXGI_FORMATS = {
+    28: ("RGBA8", 4, True),
+    29: ("RGBA8", 4, True),
+    71: ("BC1", 4, False),
+    72: ("BC1", 4, False),
+    74: ("BC2", 4, True),
+    75: ("BC2", 4, True),
+    77: ("BC3", 4, True),
+    78: ("BC3", 4, True),
+    80: ("BC4", 1, False),
+    83: ("BC5", 2, False),
+    87: ("BGRA8", 4, True),
+    88: ("BGRX8", 3, False),
+    95: ("BC6H", 3, False),
+    96: ("BC6H", 3, False),
+    98: ("BC7", 4, True),
+    99: ("BC7", 4, True),
+}
+
+ACE_PLAIN = b"SIMISA@@@@@@@@@@"
+ACE_COMPRESSED = b"SIMISA@F"
+ACE_MIPMAPS = 0x01
+ACE_FORMATS = {0x0E: "RGBA8", 0x10: "RGB565", 0x11: "RGBA5551", 0x12: "DXT1"}
+ACE_MASK_CHANNEL = 2
+ACE_ALPHA_CHANNEL = 6
+
+
+def image_info(file_format, width, height, channels, alpha, mips=1):
+    return {
+        "format": file_format,
+        "width": width,
+        "height": height,
+        "channels": channels,
+        "alpha": bool(alpha),
+        "mips": mips,
+    }
+
+
+def probe_png(handle):
+    header = handle.read(33)
+    if header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    width, height, _depth, color_type = struct.unpack(">IIBB", header[16:26])
+    alpha = color_type in (4, 6)
+    if color_type in (0, 2, 3):
+        # Palette and key-colour transparency live in a tRNS chunk before IDAT.
+        while True:
+            chunk = handle.read(8)
+            if len(chunk) < 8:
+                break
+            length, kind = struct.unpack(">I4s", chunk)
+            if kind in (b"tRNS", b"IDAT", b"IEND"):
+                alpha = kind == b"tRNS"
+                break
+            handle.seek(length + 4, os.SEEK_CUR)
+    channels = PNG_CHANNELS.get(color_type, 3) + (1 if alpha and color_type in (0, 2, 3) else 0)
+    return image_info("PNG", width, height, channels, alpha)
+
+
+def probe_jpeg(handle):
+    if handle.read(2) != b"\xff\xd8":
+        raise ValueError("not a JPEG file")
+    while True:
+        marker = handle.read(2)
+        while marker[:1] == b"\xff" and marker[1:2] == b"\xff":
+            marker = marker[1:] + handle.read(1)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError("no JPEG frame header")
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        (length,) = struct.unpack(">H", handle.read(2))
+        if code in JPEG_SOF:
+            _precision, height, width, components = struct.unpack(">BHHB", handle.read(6))
+            return image_info("JPEG", width, height, components, False)
+        handle.seek(length - 2, os.SEEK_CUR)
+
+
+def probe_tga(handle):
+    header = handle.read(18)
+    if len(header) < 18:
+        raise ValueError("truncated TGA header")
+    _id_length, color_map, image_type = header[0], header[1], header[2]
+    width, height, depth, descriptor = struct.unpack("<HHBB", header[12:18])
+    if image_type not in (1, 2, 3, 9, 10, 11):
+        raise ValueError(f"unsupported TGA image type {image_type}")
+    alpha_bits = descriptor & 0x0F
+    if image_type in (3, 11):
+        channels = 1 + (1 if alpha_bits else 0)
+    elif color_map:
+        channels = 3
+    else:
+        channels = 4 if depth == 32 or (depth == 16 and alpha_bits) else 3
+    return image_info("TGA", width, height, channels, alpha_bits > 0)
+
+
+def probe_bmp(handle):
+    header = handle.read(70)
+    if header[:2] != b"BM":
+        raise ValueError("not a BMP file")
+    (dib_size,) = struct.unpack_from("<I", header, 14)
+    if dib_size == 12:
+        width, height, _planes, depth = struct.unpack_from("<HHHH", header, 18)
+        return image_info("BMP", width, height, 3 if depth > 8 else 1, False)
+    width, height, _planes, depth, compression = struct.unpack_from("<iiHHI", header, 18)
+    alpha = False
+    if depth == 32 and dib_size >= 56 and compression in (3, 6):
+        (alpha_mask,) = struct.unpack_from("<I", header, 66)
+        alpha = alpha_mask != 0
+    return image_info("BMP", width, abs(height), 4 if alpha else (3 if depth > 8 else 1), alpha)
+
+
+def probe_dds(handle):
+    header = handle.read(148)
+    if header[:4] != b"DDS " or len(header) < 128:
+        raise ValueError("not a DDS file")
+    flags, height, width = struct.unpack_from("<III", header, 8)
+    (mip_count,) = struct.unpack_from("<I", header, 28)
+    pixel_flags, four_cc, bit_count = struct.unpack_from("<I4sI", header, 80)
+    (alpha_mask,) = struct.unpack_from("<I", header, 104)
+    mips = max(1, mip_count) if flags & DDSD_MIPMAPCOUNT else 1
+
+    if pixel_flags & DDPF_FOURCC and four_cc == b"DX10":
+        (dxgi,) = struct.unpack_from("<I", header, 128)
+        name, channels, alpha = DXGI_FORMATS.get(dxgi, (f"DXGI{dxgi}", 4, False))
+    elif pixel_flags & DDPF_FOURCC:
+        name, channels, alpha = DDS_FOURCC.get(four_cc, (four_cc.decode("ascii", "replace"), 4, False))
+        alpha = alpha or bool(pixel_flags & DDPF_ALPHAPIXELS)
+    else:
+        alpha = bool(pixel_flags & DDPF_ALPHAPIXELS and alpha_mask)
+        name = f"RGB{bit_count}" if not alpha else f"RGBA{bit_count}"
+        channels = 4 if alpha else (1 if bit_count <= 8 else 3)
+    return image_info(f"DDS/{name}", width, height, channels, alpha, mips)
+
+
+def ace_header_bytes(handle):
+    # Only the first few hundred bytes of a compressed ACE are inflated.
+    signature = handle.read(16)
+    if signature == ACE_PLAIN:
+        return handle.read(1024)
+    if signature[:8] != ACE_COMPRESSED or signature[12:16] != b"@@@@":
+        raise ValueError("not an ACE file")
+    inflater = zlib.decompressobj()
+    data = inflater.decompress(handle.read(4096), 1024)
+    return data[8:] if data.startswith(b"@@@@@@@@") else data
+
+
+def probe_ace(handle):
+    data = ace_header_bytes(handle)
+    if len(data) < 24 + 128:
+        raise ValueError("truncated ACE header")
+    marker, options, width, height, surface, channel_count = struct.unpack_from("<6i", data, 0)
+    if marker != 1:
+        raise ValueError("unexpected ACE header")
+    channel_types = [
+        struct.unpack_from("<q", data, 24 + 128 + index * 16 + 8)[0]
+        for index in range(channel_count)
+        if 24 + 128 + index * 16 + 16 <= len(data)
+    ]
+    alpha = ACE_ALPHA_CHANNEL in channel_types or ACE_MASK_CHANNEL in channel_types
+    # MSTS counts mip levels from the width alone, even for non-square ACEs.
+    mips = width.bit_length() if options & ACE_MIPMAPS else 1
+    return image_info(f"ACE/{ACE_FORMATS.get(surface, hex(surface))}", width, height, channel_count, alpha, mips)
+
+
+PROBERS = {
+    ".png": probe_png,
+    ".jpg": probe_jpeg,
+    ".jpeg": probe_jpeg,
+    ".tga": probe_tga,
+    ".bmp": probe_bmp,
+    ".dds": probe_dds,
+    ".ace": probe_ace,
+}
+
+
+def probe_image(path):
+    prober = PROBERS.get(os.path.splitext(path)[1].lower())
+    if prober is None:
+        raise ValueError(f"unsupported image type '{os.path.splitext(path)[1]}'")
+    with open(path, "rb") as handle:
+        try:
+            return prober(handle)
+        except struct.error as exc:
+            raise ValueError("truncated header") from exc
+
+
+def encode_info(info):
+    return PROBE_RECORD.pack(
+        info["width"], info["height"], info["mips"], info["channels"], info["alpha"]
+    ) + info["format"].encode("utf-8")
+
+
+def decode_info(payload):
+    width, height, mips, channels, alpha = PROBE_RECORD.unpack_from(payload)
+    return image_info(payload[PROBE_RECORD.size :].decode("utf-8"), width, height, channels, alpha, mips)
+
+
+def probe_images(paths, cache=None, workers=PROBE_WORKERS):
+    # Returns {path: info dict or None}; cached headers are reused while the
+    # file's size and mtime are unchanged. Call cache.save() afterwards.
+    results = {}
+    pending = {}
+    for path in set(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            results[path] = None
+            continue
+        payload = cache.lookup_record(KIND_PROBE, path, stat) if cache else None
+        if payload:
+            results[path] = decode_info(payload)
+        else:
+            pending[path] = stat
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(probe_image, path) for path in pending}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except (OSError, ValueError, zlib.error):
+                results[path] = None
+                continue
+            if cache:
+                cache.store_record(KIND_PROBE, path, pending[path], encode_info(results[path]))
+    return results
+
+
+def is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print image sizes and formats from file headers.")
+    parser.add_argument("paths", nargs="+", help="Image files or folders")
+    parser.add_argument("--workers", type=int, default=PROBE_WORKERS, help="Parallel reader threads")
+    parser.add_argument("--json", help="Write the results as JSON")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for folder, _dirs, files in os.walk(path):
+                paths.extend(os.path.join(folder, name) for name in files if name.lower().endswith(PROBE_EXTENSIONS))
+        else:
+            paths.append(path)
+
+    results = probe_images(paths, workers=args.workers)
+    for path in sorted(results):
+        info = results[path]
+        if info is None:
+            print(f"! {path}")
+            continue
+        pot = "" if is_power_of_two(info["width"]) and is_power_of_two(info["height"]) else "  NPOT"
+        print(
+            f"{info['width']:>5} x {info['height']:<5} {info['format']:<12} ch={info['channels']} "
+            f"alpha={'y' if info['alpha'] else 'n'} mips={info['mips']}{pot}  {path}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def nearest_power_of_two(value):
+    if value <= 1:
+        return 1
+    lower = 1 << (value.bit_length() - 1)
+    return lower if value - lower <= lower * 2 - value else lower * 2
+
+
+def floor_power_of_two(value):
+    return 1 << (max(1, value).bit_length() - 1)
+
+
+def target_size(width, height, budget, power_of_two=True):
+    # Nearest power of two per side, then halved together until the longer
+    # side fits the budget so the aspect ratio survives.
+    if power_of_two:
+        target_width, target_height = nearest_power_of_two(width), nearest_power_of_two(height)
+    else:
+        target_width, target_height = width, height
+    while budget and max(target_width, target_height) > budget and min(target_width, target_height) > 1:
+        target_width, target_height = max(1, target_width // 2), max(1, target_height // 2)
+    return target_width, target_height
+
+
+def resize_axis(pixels, target, axis):
+    # Box (area) filter along one axis. Integer factors reduce to a reshaped
+    # mean; other ratios blend the few source lines each output line overlaps,
+    # one contiguous line block at a time.
+    source = pixels.shape[axis]
+    if source == target:
+        return pixels
+    if source % target == 0:
+        factor = source // target
+        shape = pixels.shape[:axis] + (target, factor) + pixels.shape[axis + 1 :]
+        return pixels.reshape(shape).mean(axis=axis + 1, dtype=np.float32)
+
+    lines = np.ascontiguousarray(np.moveaxis(pixels, axis, 0), dtype=np.float32)
+    flat = lines.reshape(source, -1)
+    result = np.empty((target, flat.shape[1]), dtype=np.float32)
+    scale = source / target
+    for index in range(target):
+        start, end = index * scale, (index + 1) * scale
+        first, last = int(start), min(source, int(np.ceil(end)))
+        positions = np.arange(first, last)
+        weights = np.minimum(end, positions + 1) - np.maximum(start, positions)
+        result[index] = (weights / (end - start)).astype(np.float32) @ flat[first:last]
+    return np.moveaxis(result.reshape((target,) + lines.shape[1:]), 0, axis)
+
+
+def srgb_to_linear(values):
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(values):
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055)
+
+
+def area_resize(pixels, width, height, srgb=False, alpha=False):
+    # pixels: float32 (rows, columns, channels) in 0..1. Colour is filtered in
+    # linear light and weighted by alpha so transparent texels do not bleed.
+    pixels = pixels.astype(np.float32, copy=True)
+    color = slice(0, min(3, pixels.shape[2]))
+    if srgb:
+        pixels[..., color] = srgb_to_linear(pixels[..., color])
+    if alpha:
+        pixels[..., color] *= pixels[..., 3:4]
+
+    result = resize_axis(resize_axis(pixels, height, 0), width, 1)
+
+    if alpha:
+        coverage = result[..., 3:4]
+        np.divide(result[..., color], coverage, out=result[..., color], where=coverage > 1e-6)
+    if srgb:
+        result[..., color] = linear_to_srgb(result[..., color])
+    return np.clip(result, 0.0, 1.0)
+
+
+def resample_pixels(pixels, width, height, srgb=False, alpha=False):
+    # Process-pool entry point; 8-bit sources travel as uint8 to keep the
+    # pickled payload small and come back the same way.
+    byte_input = pixels.dtype == np.uint8
+    values = pixels.astype(np.float32) / 255.0 if byte_input else pixels
+    result = area_resize(values, width, height, srgb, alpha)
+    if byte_input:
+        return np.round(result * 255.0).astype(np.uint8)
+    return result
@@ -0,0 +1,287 @@
+import json
+import os
+
+import bpy
+from bpy.props import BoolProperty, StringProperty
+from bpy.types import Operator, PropertyGroup
+
+
+JOB_VERSION = 1
+
+# tool -> (operator idname, scene property group, settings owned by the step)
+TOOLS = {
+    "texture_paths": (
+        "txch.run",
+        "txch",
+        (
+            "scope",
+            "strategy",
+            "dry_run",
+            "make_relative",
+            "unpack_if_packed",
+            "only_if_exists",
+            "reload_after",
+            "new_dir",
+            "keep_basename",
+            "search_text",
+            "replace_text",
+            "mapping_text",
+            "mapping_file",
+            "add_prefix",
+            "add_suffix",
+            "change_ext",
+            "library_roots",
+            "fuzzy_threshold",
+        ),
+    ),
+    "index_library": ("txch.index_texture_library", "txch", ("library_roots",)),
+    "rename_images": (
+        "txch.rename_images",
+        "txch",
+        (
+            "scope",
+            "rename_scope",
+            "rename_strategy",
+            "rn_prefix",
+            "rn_suffix",
+            "rn_search",
+            "rn_replace",
+            "rn_mapping_text",
+            "rn_sanitize",
+            "rn_make_unique",
+            "rn_dry_run",
+        ),
+    ),
+    "dedup_images": ("txch.dedup_images", "txch", ("scope", "rename_scope", "dedup_dry_run")),
+    "collect_textures": (
+        "txch.collect_textures",
+        "txch",
+        ("scope", "collect_dir", "collect_link_mode", "collect_overwrite", "make_relative", "collect_dry_run"),
+    ),
+    "texture_sizes": (
+        "txch.validate_texture_sizes",
+        "txch",
+        ("scope", "size_budget", "size_require_pot", "size_dry_run"),
+    ),
+    "convert_dds": (
+        "txch.convert_to_dds",
+        "txch",
+        ("scope", "dds_format", "dds_mip_filter", "make_relative", "reload_after", "dds_dry_run"),
+    ),
+    "convert_ace": (
+        "txch.convert_ace",
+        "txch",
+        ("scope", "ace_direction", "ace_surface", "ace_compress", "ace_dry_run"),
+    ),
+    "texture_atlas": (
+        "txch.build_atlas",
+        "txch",
+        ("atlas_path", "atlas_max_size", "atlas_padding", "make_relative", "atlas_dry_run"),
+    ),
+    "pack_channels": (
+        "txch.pack_channels",
+        "txch",
+        (
+            "scope",
+            "pack_source",
+            "pack_suffixes",
+            "pack_output_suffix",
+            "pack_text",
+            "pack_file",
+            "pack_relink",
+            "make_relative",
+            "pack_dry_run",
+        ),
+    ),
+    "bbox_export": (
+        "tst.export_bbox_csv",
+        "bbox_export_props",
+        (
+            "output_format",
+            "output_path",
+            "append_output",
+            "include_source",
+            "include_obb",
+            "include_sphere",
+            "exact_sphere",
+            "sphere_warn_radius",
+        ),
+    ),
+    "convex_hulls": (
+        "tst.build_convex_hulls",
+        "bbox_export_props",
+        ("hull_source", "hull_collection", "hull_max_vertices", "hull_output"),
+    ),
+    "package_release": (
+        "tst.package_release",
+        "tst_package_props",
+        ("output_path", "image_scope", "compression_level", "workers"),
+    ),
+    "fix_uv": ("tst.fix_uv_simple", None, ()),
+    "create_collections": ("object.create_initial_collections", None, ()),
+}
+
+CAPTURE_ORDER = ("texture_paths", "rename_images", "fix_uv", "bbox_export")
+
+
+class JobSpecProperties(PropertyGroup):
+    job_file: StringProperty(
+        name="Job File",
+        description="Job spec (.json or .toml) with the steps and settings to apply",
+        default="",
+        subtype="FILE_PATH",
+    )
+    run_steps: BoolProperty(
+        name="Run Steps",
+        description="Run every step after applying its settings (otherwise only load the settings)",
+        default=False,
+    )
+
+
+class TST_OT_SaveJobSpec(Operator):
+    bl_idname = "tst.save_job_spec"
+    bl_label = "Save Job Spec"
+    bl_description = "Write the current texture, rename, UV and bbox settings to the job file"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        props = context.scene.tst_job_props
+        if not props.job_file:
+            self.report({"ERROR"}, "No job file specified.")
+            return {"CANCELLED"}
+
+        path = bpy.path.abspath(props.job_file)
+        try:
+            save_job(path, capture_job(context.scene))
+        except (OSError, ValueError) as exc:
+            self.report({"ERROR"}, f"Failed to save job spec: {exc}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"Job spec saved to {path}")
+        return {"FINISHED"}
+
+
+class TST_OT_ApplyJobSpec(Operator):
+    bl_idname = "tst.apply_job_spec"
+    bl_label = "Apply Job Spec"
+    bl_description = "Load a job file into the panel settings, optionally running each step"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.tst_job_props
+        path = bpy.path.abspath(props.job_file)
+        if not props.job_file or not os.path.exists(path):
+            self.report({"ERROR"}, f"Job file not found: {path}")
+            return {"CANCELLED"}
+
+        try:
+            steps = compile_job(load_job(path))
+        except (OSError, ValueError) as exc:
+            self.report({"ERROR"}, f"Invalid job spec: {exc}")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: JOB ===")
+        for step in steps:
+            try:
+                apply_step(context.scene, step)
+                result = run_step(step) if props.run_steps else "applied"
+            except Exception as exc:
+                self.report({"ERROR"}, f"Step '{step[0]}' failed: {exc}")
+                return {"CANCELLED"}
+            print(f"+ {step[0]:<18} {result}")
+
+        self.report({"INFO"}, f"Job steps {'run' if props.run_steps else 'applied'}: {len(steps)}")
+        return {"FINISHED"}
+
+
+def capture_job(scene, tools=CAPTURE_ORDER, save=False):
+    steps = []
+    for tool in tools:
+        _, group_name, names = TOOLS[tool]
+        step = {"tool": tool}
+        if group_name:
+            group = getattr(scene, group_name)
+            step["settings"] = {name: plain_value(getattr(group, name)) for name in names}
+        steps.append(step)
+    return {"version": JOB_VERSION, "save": save, "steps": steps}
+
+
+def plain_value(value):
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return list(value)
+
+
+def compile_job(job):
+    # Validate once up front; the result is a flat tuple per step so applying
+    # never has to look anything up again.
+    if job.get("version", JOB_VERSION) > JOB_VERSION:
+        raise ValueError(f"Job version {job['version']} is newer than supported ({JOB_VERSION})")
+
+    steps = []
+    for index, step in enumerate(job.get("steps", []), start=1):
+        tool = step.get("tool")
+        if tool not in TOOLS:
+            raise ValueError(f"Step {index}: unknown tool '{tool}' (expected one of {sorted(TOOLS)})")
+        idname, group_name, names = TOOLS[tool]
+        settings = step.get("settings", {})
+        unknown = sorted(set(settings) - set(names))
+        if unknown:
+            raise ValueError(f"Step {index} ({tool}): unknown settings {unknown}")
+        steps.append((tool, idname, group_name, tuple(settings.items())))
+    return steps
+
+
+def apply_step(scene, step):
+    _, _, group_name, settings = step
+    if group_name:
+        group = getattr(scene, group_name)
+        for name, value in settings:
+            setattr(group, name, value)
+
+
+def run_step(step):
+    category, name = step[1].split(".")
+    return sorted(getattr(getattr(bpy.ops, category), name)())
+
+
+def load_job(path):
+    if path.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError as exc:
+            raise ValueError("TOML job files need Python 3.11+ (Blender 4.x)") from exc
+        with open(path, "rb") as job_file:
+            return tomllib.load(job_file)
+
+    with open(path, "r", encoding="utf-8") as job_file:
+        return json.load(job_file)
+
+
+def save_job(path, job):
+    text = dump_toml(job) if path.lower().endswith(".toml") else json.dumps(job, indent=2) + "\n"
+    with open(path, "w", encoding="utf-8") as job_file:
+        job_file.write(text)
+
+
+def dump_toml(job):
+    lines = [f"{key} = {toml_value(value)}" for key, value in job.items() if key != "steps"]
+    for step in job.get("steps", []):
+        lines += ["", "[[steps]]", f"tool = {toml_value(step['tool'])}"]
+        if step.get("settings"):
+            lines.append("[steps.settings]")
+            lines += [f"{key} = {toml_value(value)}" for key, value in step["settings"].items()]
+    return "\n".join(lines) + "\n"
+
+
+def toml_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        # JSON string escapes are valid TOML basic-string escapes.
+        return json.dumps(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(toml_value(item) for item in value) + "]"
+    raise ValueError(f"Cannot write {type(value).__name__} to TOML")
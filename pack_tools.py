@@ -0,0 +1,219 @@
+import os
+from collections import deque
+
+import bpy
+from bpy.types import Operator
+
+from .image_buffers import read_compact, to_bytes
+from .process_pool import process_pool, standalone
+from .texture_tools import (
+    collect_object_images,
+    iter_materials_used_by_object,
+    objects_in_scope,
+    parse_mapping,
+    rel_or_abs,
+)
+
+
+class TXCH_OT_PackChannels(Operator):
+    bl_idname = "txch.pack_channels"
+    bl_label = "Pack Channels"
+    bl_description = (
+        "Pack grayscale maps (AO, gloss, metal...) into the R/G/B/A channels of one texture, "
+        "from suffix rules or 'a, b, c => packed.png' lines, and relink the image nodes to it"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        channel_pack = standalone("channel_pack")
+        # Rule lines stay local so the hand-written Pack Lines survive.
+        if props.pack_source == "RULES":
+            text = "\n".join(rule_lines(collect_object_images(props.scope), props))
+        else:
+            text = props.pack_text
+        if props.pack_source == "MAPPING" and props.pack_file:
+            try:
+                with open(bpy.path.abspath(props.pack_file), "r", encoding="utf-8") as handle:
+                    text = handle.read()
+            except OSError as exc:
+                self.report({"ERROR"}, f"Could not read pack file: {exc}")
+                return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: PACK CHANNELS ===")
+        packs = []
+        for sources, output in parse_mapping(text).items():
+            try:
+                slots, output = channel_pack.parse_pack_line(sources, output)
+                packs.append((resolve_slots(slots), pack_output_path(output, slots)))
+            except (ValueError, LookupError) as exc:
+                print(f"- SKIP ({exc}): {sources} => {output}")
+        if not packs:
+            self.report({"INFO"}, "No channel packs found (check the rules or the pack lines).")
+            return {"CANCELLED"}
+
+        for slots, output in packs:
+            shown = ", ".join(f"{img.name}:{'rgba'[channel]}" if img else "-" for img, channel in slots)
+            print(f"+ {'WOULD PACK' if props.pack_dry_run else 'PACK'}: {shown} => {output}")
+        if props.pack_dry_run:
+            self.report({"INFO"}, f"Channel packs: {len(packs)} (dry run)")
+            return {"FINISHED"}
+
+        packed, failed = write_packs(packs, props.make_relative)
+        relinked = relink_packed(props.scope, packed) if props.pack_relink else 0
+        outputs = {img.name for img, _channel in packed.values()}
+        self.report(
+            {"WARNING" if failed else "INFO"},
+            f"Packed {len(outputs)} textures ({failed} failed); relinked {relinked} image nodes.",
+        )
+        return {"FINISHED"} if packed else {"CANCELLED"}
+
+
+def rule_lines(images, props):
+    # One "a, b, c => base<suffix>.png" line per folder and base name that
+    # has at least two of the suffixed maps.
+    channel_pack = standalone("channel_pack")
+    suffixes = [suffix.strip() for suffix in props.pack_suffixes.split(",")][:4]
+    folders = {}
+    for img in images:
+        old = img.filepath_raw or img.filepath
+        if img.source == "FILE" and old:
+            folder, name = os.path.split(os.path.normpath(bpy.path.abspath(old, library=img.library)))
+            folders.setdefault(folder, {})[os.path.splitext(name)[0]] = old
+    lines = []
+    for folder, stems in sorted(folders.items()):
+        for base, slots in sorted(channel_pack.rule_groups(stems, suffixes).items()):
+            sources = ", ".join(stems[stem] if stem else "-" for stem in slots)
+            output = rel_or_abs(os.path.join(folder, f"{base}{props.pack_output_suffix}.png"), props.make_relative)
+            lines.append(f"{sources} => {output}")
+    return lines
+
+
+def find_image(token):
+    # Same keys as the Mapping: stored path, absolute path or basename;
+    # files not yet in the .blend are loaded.
+    path = os.path.normpath(bpy.path.abspath(token))
+    for img in bpy.data.images:
+        stored = img.filepath_raw or img.filepath
+        if not stored:
+            continue
+        if token in (stored, os.path.basename(stored)) or path == os.path.normpath(
+            bpy.path.abspath(stored, library=img.library)
+        ):
+            return img
+    if os.path.isfile(path):
+        return bpy.data.images.load(path, check_existing=True)
+    raise LookupError(f"no image '{token}'")
+
+
+def resolve_slots(slots):
+    return [(find_image(slot[0]), slot[1]) if slot else (None, 0) for slot in slots]
+
+
+def pack_output_path(output, slots):
+    # Bare file names land next to the first source.
+    if os.path.dirname(output) or output.startswith("//"):
+        return os.path.normpath(bpy.path.abspath(output))
+    first = next(path for path, _channel in filter(None, slots))
+    first_path = bpy.path.abspath(find_image(first).filepath_raw or first)
+    return os.path.join(os.path.dirname(os.path.normpath(first_path)), output)
+
+
+def source_planes(slots):
+    # uint8 (rows, columns) per slot, top row first; each image is read once.
+    pixels = {}
+    planes = []
+    for img, channel in slots:
+        if img is None:
+            planes.append(None)
+            continue
+        if img.name not in pixels:
+            pixels[img.name] = to_bytes(read_compact(img, top_first=True))
+        values = pixels[img.name]
+        planes.append(values[..., min(channel, values.shape[2] - 1)].copy())
+    return planes
+
+
+def write_packs(packs, make_relative, workers=None):
+    # Source pixels are read through Blender on the main thread; packing,
+    # resampling and PNG encoding run in worker processes. Returns
+    # ({source image: (packed image, channel)}, failed count).
+    channel_pack = standalone("channel_pack")
+    workers = min(workers or os.cpu_count() or 1, len(packs))
+    packed = {}
+    failed = 0
+    with process_pool(workers) as pool:
+        window = deque()
+        pending = deque(packs)
+        while pending or window:
+            while pending and len(window) < workers:
+                slots, output = pending.popleft()
+                try:
+                    planes = source_planes(slots)
+                    os.makedirs(os.path.dirname(output), exist_ok=True)
+                except Exception as exc:
+                    print(f"    ! Could not read sources for '{output}': {exc}")
+                    failed += 1
+                    continue
+                window.append((slots, output, pool.submit(channel_pack.pack_to_png, planes, output)))
+            if not window:
+                continue
+
+            slots, output, future = window.popleft()
+            try:
+                width, height = future.result()
+            except Exception as exc:
+                print(f"    ! Packing failed for '{output}': {exc}")
+                failed += 1
+                continue
+            img = bpy.data.images.load(output, check_existing=True)
+            img.reload()
+            img.colorspace_settings.name = "Non-Color"
+            img.filepath = rel_or_abs(output, make_relative)
+            print(f"+ WROTE: {output} ({width}x{height})")
+            for channel_index, (source, _channel) in enumerate(slots):
+                if source is not None:
+                    packed[source] = (img, channel_index)
+    return packed, failed
+
+
+def relink_packed(scope, packed):
+    # Image nodes showing a source map now sample the packed texture. Nodes of
+    # one tree that read the same packed texture with the same UV input are
+    # merged into one, whose channels feed their old links through a Separate
+    # Color node (alpha straight from the Alpha output).
+    trees = {
+        mat.node_tree
+        for obj in objects_in_scope(scope)
+        for mat in iter_materials_used_by_object(obj)
+        if mat.use_nodes and mat.node_tree and mat.library is None
+    }
+    relinked = 0
+    for tree in trees:
+        shared = {}
+        for node in [node for node in tree.nodes if node.bl_idname == "ShaderNodeTexImage" and node.image in packed]:
+            img, channel = packed[node.image]
+            vector = node.inputs["Vector"].links[0].from_socket if node.inputs["Vector"].is_linked else None
+            key = (img.name, (vector.node.name, vector.identifier) if vector else None)
+            if key not in shared:
+                node.image = img
+                shared[key] = [node, None]
+            keep, separate = shared[key]
+
+            targets = [link.to_socket for link in node.outputs["Color"].links]
+            if channel == 3:
+                source = keep.outputs["Alpha"]
+            else:
+                if separate is None:
+                    separate = tree.nodes.new("ShaderNodeSeparateColor")
+                    separate.location = (keep.location.x + 280, keep.location.y)
+                    tree.links.new(keep.outputs["Color"], separate.inputs[0])
+                    shared[key][1] = separate
+                source = separate.outputs[channel]
+            for socket in targets:
+                if socket.node != separate:
+                    tree.links.new(source, socket)
+            if node != keep:
+                tree.nodes.remove(node)
+            relinked += 1
+    return relinked
@@ -0,0 +1,179 @@
+import os
+import time
+
+import bpy
+from bpy.props import EnumProperty, IntProperty, StringProperty
+from bpy.types import Operator, PropertyGroup
+
+from .constants import VERSION_TEXT
+from .texture_tools import collect_object_images
+from .zip_writer import write_archive
+
+
+MANIFEST_NAME = "manifest.json"
+EXTERNAL_FOLDER = "external"
+
+
+class PackageProperties(PropertyGroup):
+    output_path: StringProperty(
+        name="Archive",
+        description="Target .zip file or folder; blank writes <blend name>.zip beside the blend file",
+        default="",
+        subtype="FILE_PATH",
+    )
+    image_scope: EnumProperty(
+        name="Images",
+        description="Which images to package with the blend file",
+        items=[
+            ("ALL", "Used by All Objects", "Images used by any object's materials"),
+            ("SELECTED", "Used by Selected Objects", "Images used by the selected objects' materials"),
+            ("ALL_IMAGES", "All Images in File", "Every image datablock with a file on disk"),
+        ],
+        default="ALL",
+    )
+    compression_level: IntProperty(
+        name="Compression",
+        description="Deflate level (0 stores everything); PNG/JPEG are always stored",
+        default=6,
+        min=0,
+        max=9,
+    )
+    workers: IntProperty(
+        name="Workers",
+        description="Files compressed in parallel",
+        default=min(8, os.cpu_count() or 1),
+        min=1,
+        max=64,
+    )
+
+
+class TST_OT_PackageRelease(Operator):
+    bl_idname = "tst.package_release"
+    bl_label = "Package Release"
+    bl_description = "Zip the saved blend file, its linked libraries and referenced textures with a hash manifest"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        props = context.scene.tst_package_props
+        if not bpy.data.filepath:
+            self.report({"ERROR"}, "Save the blend file before packaging.")
+            return {"CANCELLED"}
+
+        zip_path = package_output_path(props)
+        members, missing = package_members(props.image_scope)
+
+        print("\n=== TrainSimTools: PACKAGE ===")
+        print(f"Archive          : {zip_path}")
+        for arcname, source in members:
+            if arcname.startswith(EXTERNAL_FOLDER + "/"):
+                print(f"+ {arcname}  (from {source}; outside the blend folder, relink after unzipping)")
+            else:
+                print(f"+ {arcname}")
+        for source in missing:
+            print(f"- SKIP (missing): {source}")
+
+        started = time.perf_counter()
+        manifest = {
+            "package": os.path.splitext(os.path.basename(zip_path))[0],
+            "blend": os.path.basename(bpy.data.filepath),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "generator": f"TrainSimTools {VERSION_TEXT}",
+        }
+        try:
+            written = write_archive(
+                zip_path,
+                members,
+                workers=props.workers,
+                level=props.compression_level,
+                manifest_name=MANIFEST_NAME,
+                manifest=manifest,
+            )
+        except (OSError, ValueError) as exc:
+            self.report({"ERROR"}, f"Packaging failed: {exc}")
+            return {"CANCELLED"}
+
+        size = sum(member.size for member in written)
+        archive_size = os.path.getsize(zip_path)
+        message = (
+            f"Packaged {len(written)} files ({size / 1048576:.1f} MB -> {archive_size / 1048576:.1f} MB) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        if missing or bpy.data.is_dirty:
+            notes = [f"{len(missing)} missing"] if missing else []
+            if bpy.data.is_dirty:
+                notes.append("unsaved changes not included")
+            self.report({"WARNING"}, f"{message}; {', '.join(notes)}")
+        else:
+            self.report({"INFO"}, message)
+        return {"FINISHED"}
+
+
+def package_output_path(props):
+    default_name = os.path.splitext(os.path.basename(bpy.data.filepath))[0] + ".zip"
+    if not props.output_path:
+        return os.path.join(os.path.dirname(bpy.data.filepath), default_name)
+
+    path = bpy.path.abspath(props.output_path)
+    if path.endswith(("/", "\\")) or os.path.isdir(path):
+        return os.path.join(path, default_name)
+    return path
+
+
+def package_members(image_scope):
+    # Returns ([(archive name, abs source)], [missing sources]). Files below the
+    # blend's folder keep their relative layout so the blend's // paths still
+    # resolve after unzipping; anything else goes under external/.
+    blend_path = os.path.normpath(bpy.data.filepath)
+    base_dir = os.path.dirname(blend_path)
+    sources = [blend_path]
+    sources += [bpy.path.abspath(library.filepath) for library in bpy.data.libraries]
+
+    images = list(bpy.data.images) if image_scope == "ALL_IMAGES" else collect_object_images(image_scope)
+    for img in sorted(images, key=lambda img: img.name):
+        if img.packed_file or img.source not in ("FILE", "TILED") or not img.filepath:
+            continue
+        path = bpy.path.abspath(img.filepath, library=img.library)
+        if img.source == "TILED":
+            for token in ("<UDIM>", "<uvtile>"):
+                if token in path:
+                    sources += [path.replace(token, str(tile.number)) for tile in img.tiles]
+                    break
+            else:
+                sources.append(path)
+        else:
+            sources.append(path)
+
+    members = []
+    missing = []
+    seen_sources = set()
+    used_names = set()
+    for source in sources:
+        source = os.path.normpath(source)
+        key = os.path.normcase(source)
+        if key in seen_sources:
+            continue
+        seen_sources.add(key)
+        if not os.path.isfile(source):
+            missing.append(source)
+            continue
+
+        try:
+            relative = os.path.relpath(source, base_dir)
+        except ValueError:
+            relative = ".."  # another drive on Windows
+        if relative.startswith(".."):
+            relative = unique_archive_name(f"{EXTERNAL_FOLDER}/{os.path.basename(source)}", used_names)
+        arcname = relative.replace("\\", "/")
+        used_names.add(arcname.lower())
+        members.append((arcname, source))
+    return members, missing
+
+
+def unique_archive_name(name, used_names):
+    stem, ext = os.path.splitext(name)
+    candidate = name
+    index = 1
+    while candidate.lower() in used_names:
+        candidate = f"{stem}.{index:03d}{ext}"
+        index += 1
+    return candidate
@@ -1,6 +1,10 @@
+import bpy
 from bpy.types import Panel
 
 from .constants import DOC_URL, VERSION_TEXT
+from .texture_watcher import is_watching, watched_counts
+from .thumbnails import thumbnail_icon
+from .vram_tools import SCENE_INDEX, lod_totals
 
 
 class VIEW3D_PT_TrainSimToolsMain(Panel):
@@ -47,6 +51,13 @@ class TXCH_PT_Panel(TrainSimToolsPanel, Panel):
             self.draw_mapping_strategy(layout, props)
         elif props.strategy == "PREFIX_SUFFIX":
             self.draw_prefix_suffix_fields(layout, props)
+        elif props.strategy == "RELINK_MISSING":
+            col = layout.column(align=True)
+            col.prop(props, "library_roots")
+            col.operator("txch.index_texture_library", icon="FILE_REFRESH")
+            col.separator()
+            col.prop(props, "fuzzy_threshold")
+            col.operator("txch.propose_fuzzy_relinks", icon="VIEWZOOM")
 
         layout.separator()
         row = layout.row(align=True)
@@ -62,6 +73,9 @@ class TXCH_PT_Panel(TrainSimToolsPanel, Panel):
     def draw_mapping_strategy(self, layout, props):
         col = layout.column(align=True)
         col.prop(props, "mapping_choice")
+        icon = thumbnail_icon(bpy.path.abspath(props.mapping_choice)) if props.mapping_choice != "__NONE__" else 0
+        if icon:
+            col.template_icon(icon_value=icon, scale=5.0)
         col.operator("txch.insert_mapping_line", icon="ADD", text="Insert Mapping Line")
         col.separator()
         col.prop(props, "mapping_text")
@@ -93,6 +107,24 @@ class TXCH_PT_PathOptions(TrainSimToolsPanel, Panel):
         col.prop(props, "reload_after")
 
 
+class TXCH_PT_TextureWatcher(TrainSimToolsPanel, Panel):
+    bl_label = "Texture Watcher"
+    bl_idname = "TXCH_PT_texture_watcher"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        if is_watching():
+            files, folders = watched_counts()
+            layout.label(text=f"Watching {files} files in {folders} folders", icon="REC")
+            layout.operator("txch.watch_textures", text="Stop Watching", icon="PAUSE")
+        else:
+            layout.prop(props, "scope")
+            layout.operator("txch.watch_textures", text="Watch Textures", icon="PLAY")
+
+
 class TXCH_PT_RenameImages(TrainSimToolsPanel, Panel):
     bl_label = "Image Names"
     bl_idname = "TXCH_PT_image_names"
@@ -123,6 +155,138 @@ class TXCH_PT_RenameImages(TrainSimToolsPanel, Panel):
         layout.operator("txch.rename_images", icon="SORTALPHA")
 
 
+class TXCH_PT_DedupImages(TrainSimToolsPanel, Panel):
+    bl_label = "Duplicate Images"
+    bl_idname = "TXCH_PT_duplicate_images"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.label(text="Uses Scope / Rename Scope to pick images.")
+        layout.prop(props, "dedup_dry_run")
+        layout.operator("txch.dedup_images", icon="DUPLICATE")
+
+
+class TXCH_PT_CollectTextures(TrainSimToolsPanel, Panel):
+    bl_label = "Collect Textures"
+    bl_idname = "TXCH_PT_collect_textures"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "scope")
+        col = layout.column(align=True)
+        col.prop(props, "collect_dir")
+        col.prop(props, "collect_link_mode")
+        col.prop(props, "collect_overwrite")
+        col.prop(props, "make_relative")
+        col.prop(props, "collect_dry_run")
+        layout.operator("txch.collect_textures", icon="PACKAGE")
+
+
+class TXCH_PT_TextureSizes(TrainSimToolsPanel, Panel):
+    bl_label = "Texture Sizes"
+    bl_idname = "TXCH_PT_texture_sizes"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "scope")
+        col = layout.column(align=True)
+        col.prop(props, "size_budget")
+        col.prop(props, "size_require_pot")
+        col.prop(props, "size_dry_run")
+        layout.operator("txch.validate_texture_sizes", icon="FULLSCREEN_EXIT")
+
+
+class TXCH_PT_ConvertDDS(TrainSimToolsPanel, Panel):
+    bl_label = "DDS Conversion"
+    bl_idname = "TXCH_PT_convert_dds"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "scope")
+        col = layout.column(align=True)
+        col.prop(props, "dds_format")
+        col.prop(props, "dds_mip_filter")
+        col.prop(props, "make_relative")
+        col.prop(props, "reload_after")
+        col.prop(props, "dds_dry_run")
+        layout.operator("txch.convert_to_dds", icon="IMAGE_DATA")
+
+
+class TXCH_PT_ACETextures(TrainSimToolsPanel, Panel):
+    bl_label = "ACE Textures"
+    bl_idname = "TXCH_PT_ace_textures"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "scope")
+        layout.operator("txch.preview_ace", icon="HIDE_OFF")
+        col = layout.column(align=True)
+        col.prop(props, "ace_direction")
+        if props.ace_direction == "TO_ACE":
+            col.prop(props, "ace_surface")
+            col.prop(props, "ace_compress")
+        col.prop(props, "ace_dry_run")
+        layout.operator("txch.convert_ace", icon="FILE_REFRESH")
+
+
+class TXCH_PT_TextureAtlas(TrainSimToolsPanel, Panel):
+    bl_label = "Texture Atlas"
+    bl_idname = "TXCH_PT_texture_atlas"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        col = layout.column(align=True)
+        col.prop(props, "atlas_path")
+        col.prop(props, "atlas_max_size")
+        col.prop(props, "atlas_padding")
+        col.prop(props, "make_relative")
+        col.prop(props, "atlas_dry_run")
+        layout.operator("txch.build_atlas", icon="TEXTURE")
+
+
+class TXCH_PT_PackChannels(TrainSimToolsPanel, Panel):
+    bl_label = "Channel Packing"
+    bl_idname = "TXCH_PT_pack_channels"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "scope")
+        layout.prop(props, "pack_source")
+        col = layout.column(align=True)
+        if props.pack_source == "RULES":
+            col.prop(props, "pack_suffixes")
+            col.prop(props, "pack_output_suffix")
+        else:
+            col.prop(props, "pack_text")
+            col.prop(props, "pack_file")
+        col = layout.column(align=True)
+        col.prop(props, "pack_relink")
+        col.prop(props, "make_relative")
+        col.prop(props, "pack_dry_run")
+        layout.operator("txch.pack_channels", icon="NODE_COMPOSITING")
+
+
 class VIEW3D_PT_SwapCollections(TrainSimToolsPanel, Panel):
     bl_label = "Collections"
     bl_idname = "VIEW3D_PT_swap_collections"
@@ -154,9 +318,88 @@ class VIEW3D_PT_BoundingBoxTools(TrainSimToolsPanel, Panel):
 
     def draw(self, context):
         layout = self.layout
-        layout.label(text="Exports bbox_export.csv beside the blend file.")
+        props = context.scene.bbox_export_props
+
+        col = layout.column(align=True)
+        col.prop(props, "output_format")
+        col.prop(props, "output_path")
+        col.prop(props, "append_output")
+        col.prop(props, "include_source")
+        layout.prop(props, "include_obb")
+        layout.prop(props, "include_sphere")
+        if props.include_sphere:
+            col = layout.column(align=True)
+            col.prop(props, "exact_sphere")
+            col.prop(props, "sphere_warn_radius")
         layout.operator("tst.export_bbox_csv", icon="FILE_TEXT")
 
+        layout.separator()
+        layout.prop(props, "hull_source")
+        if props.hull_source == "COLLECTION":
+            layout.prop(props, "hull_collection")
+        col = layout.column(align=True)
+        col.prop(props, "hull_max_vertices")
+        col.prop(props, "hull_output")
+        layout.operator("tst.build_convex_hulls", icon="MESH_ICOSPHERE")
+
+
+class VIEW3D_PT_JobSpec(TrainSimToolsPanel, Panel):
+    bl_label = "Job Presets"
+    bl_idname = "VIEW3D_PT_train_sim_tools_job_spec"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.tst_job_props
+
+        layout.prop(props, "job_file")
+        layout.prop(props, "run_steps")
+        row = layout.row(align=True)
+        row.operator("tst.save_job_spec", icon="EXPORT")
+        row.operator("tst.apply_job_spec", icon="IMPORT")
+
+
+class VIEW3D_PT_PackageRelease(TrainSimToolsPanel, Panel):
+    bl_label = "Release Package"
+    bl_idname = "VIEW3D_PT_train_sim_tools_package"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.tst_package_props
+
+        layout.prop(props, "output_path")
+        layout.prop(props, "image_scope")
+        col = layout.column(align=True)
+        col.prop(props, "compression_level")
+        col.prop(props, "workers")
+        layout.operator("tst.package_release", icon="PACKAGE")
+
+
+class VIEW3D_PT_TextureMemory(TrainSimToolsPanel, Panel):
+    bl_label = "Texture Memory"
+    bl_idname = "VIEW3D_PT_train_sim_tools_texture_memory"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.txch
+
+        layout.prop(props, "vram_assume_mips")
+        if not SCENE_INDEX:
+            layout.label(text="Stale - run the report to refresh.", icon="INFO")
+            layout.operator("tst.texture_memory_report", icon="TEXT")
+            return
+        totals = lod_totals(SCENE_INDEX, props.vram_assume_mips)
+        if not totals:
+            layout.label(text="No LOD collections found.")
+        col = layout.column(align=True)
+        for lod, total, count, offenders in totals:
+            col.label(text=f"{lod}: {total / 1048576:.1f} MB ({count} images)", icon="TEXTURE")
+            for name, size in offenders:
+                col.label(text=f"      {size / 1048576:.1f} MB  {name}")
+        layout.operator("tst.texture_memory_report", icon="TEXT")
+
 
 class VIEW3D_PT_TrainSimToolsInfo(TrainSimToolsPanel, Panel):
     bl_label = "Info"
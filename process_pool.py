@@ -0,0 +1,56 @@
+import importlib
+import multiprocessing
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Private package the bpy-free modules are loaded under, in Blender and in the
+# workers alike, so generic names like "image_files" never land in Blender's
+# sys.modules and the add-on's reload can drop them all at once.
+WORKER_PACKAGE = "trainsimtools_worker"
+# Run as each worker's initializer; exec is a builtin, so it pickles without
+# the worker importing the add-on package (whose __init__ needs bpy).
+WORKER_SETUP = (
+    "import sys, types\n"
+    "package = types.ModuleType({name!r})\n"
+    "package.__path__ = [{path!r}]\n"
+    "sys.modules[{name!r}] = package\n"
+)
+
+
+def worker_package():
+    package = sys.modules.get(WORKER_PACKAGE)
+    if package is None:
+        package = types.ModuleType(WORKER_PACKAGE)
+        package.__path__ = [PACKAGE_DIR]
+        sys.modules[WORKER_PACKAGE] = package
+    return package
+
+
+def standalone(module_name):
+    # Worker processes cannot import the add-on package, so bpy-free modules
+    # are loaded as e.g. "trainsimtools_worker.image_resample"; their functions
+    # pickle under that name, which a worker resolves after WORKER_SETUP.
+    # Sibling imports inside them ("from .image_resample import ...") resolve
+    # within the same package.
+    worker_package()
+    return importlib.import_module(f"{WORKER_PACKAGE}.{module_name}")
+
+
+def release_standalone():
+    # Called on unregister, so Reload Scripts loads the new code next time.
+    for name in [name for name in sys.modules if name == WORKER_PACKAGE or name.startswith(WORKER_PACKAGE + ".")]:
+        del sys.modules[name]
+
+
+def process_pool(workers=None):
+    # Always spawn: forking Blender would copy its GPU context and threads.
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=exec,
+        initargs=(WORKER_SETUP.format(name=WORKER_PACKAGE, path=PACKAGE_DIR),),
+    )
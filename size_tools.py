@@ -0,0 +1,133 @@
+import os
+from collections import deque
+
+import bpy
+from bpy.types import Operator
+
+from .hash_cache import HASH_CACHE_NAME, shared_cache
+from .image_buffers import read_compact, save_pixels
+from .image_probe import is_power_of_two, probe_images
+from .process_pool import process_pool, standalone
+from .texture_tools import FORMAT_EXTENSIONS, append_mapping_lines, can_edit_image, collect_object_images
+from .user_config import config_path
+
+
+WRITABLE_FORMATS = ("PNG", "JPEG", "TARGA", "TARGA_RAW", "BMP", "TIFF", "OPEN_EXR")
+
+
+class TXCH_OT_ValidateTextureSizes(Operator):
+    bl_idname = "txch.validate_texture_sizes"
+    bl_label = "Check Texture Sizes"
+    bl_description = (
+        "Flag textures in scope that are not power-of-two or exceed the size budget; "
+        "unless Dry Run is on, write resized copies and propose them as a Mapping"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = collect_object_images(props.scope)
+        if not images:
+            self.report({"INFO"}, "No image textures found in scope.")
+            return {"CANCELLED"}
+
+        flagged = flag_texture_sizes(images, props.size_budget, props.size_require_pot)
+        if not flagged:
+            self.report({"INFO"}, f"All {len(images)} textures are within the size rules.")
+            return {"FINISHED"}
+        if props.size_dry_run:
+            self.report({"INFO"}, f"Textures to resize: {len(flagged)} of {len(images)} (dry run)")
+            return {"FINISHED"}
+
+        written, failed = resize_images(flagged)
+        if not written:
+            self.report({"ERROR"}, f"No textures resized; {failed} failed (see console).")
+            return {"CANCELLED"}
+
+        append_mapping_lines(props, [f"{old} => {new}" for old, new in written])
+        self.report(
+            {"WARNING" if failed else "INFO"},
+            f"Resized {len(written)} textures ({failed} failed); appended to the Mapping for review, then Apply.",
+        )
+        return {"FINISHED"}
+
+
+def flag_texture_sizes(images, budget, require_pot):
+    # Returns [(image, old path, (width, height), (target width, target height))]
+    resample = standalone("image_resample")
+    files = {}
+    for img in images:
+        old = img.filepath_raw or img.filepath
+        if can_edit_image(img) and not img.packed_file and img.source == "FILE" and old:
+            files[img] = (old, os.path.normpath(bpy.path.abspath(old)))
+
+    cache = shared_cache(config_path(HASH_CACHE_NAME))
+    infos = probe_images([path for _, path in files.values()], cache)
+    cache.save()
+
+    print("\n=== TrainSimTools: TEXTURE SIZES ===")
+    print(f"Budget           : {budget or 'none'}")
+    flagged = []
+    for img, (old, path) in sorted(files.items(), key=lambda item: item[0].name):
+        info = infos.get(path)
+        if info is None:
+            print(f"- SKIP (unread) : '{img.name}' ({old})")
+            continue
+        width, height = info["width"], info["height"]
+        target = resample.target_size(width, height, budget, require_pot)
+        problems = []
+        if require_pot and not (is_power_of_two(width) and is_power_of_two(height)):
+            problems.append("NPOT")
+        if budget and max(width, height) > budget:
+            problems.append("OVER BUDGET")
+        if not problems or target == (width, height):
+            continue
+        print(f"! {' + '.join(problems):<16} '{img.name}' {width}x{height} -> {target[0]}x{target[1]} ({info['format']})")
+        flagged.append((img, old, (width, height), target))
+    return flagged
+
+
+def resized_path(img, target):
+    source = bpy.path.abspath(img.filepath_raw or img.filepath)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    file_format = img.file_format if img.file_format in WRITABLE_FORMATS else "PNG"
+    name = f"{stem}_{target[0]}x{target[1]}{FORMAT_EXTENSIONS.get(file_format, '.png')}"
+    return os.path.join(os.path.dirname(source), name), file_format
+
+
+def resize_images(flagged, workers=None):
+    # Pixels are read and written through Blender on the main thread; only the
+    # resampling runs in worker processes, with at most `workers` images in flight.
+    resample = standalone("image_resample")
+    workers = min(workers or os.cpu_count() or 1, len(flagged))
+    written = []
+    failed = 0
+    with process_pool(workers) as pool:
+        window = deque()
+        pending = deque(flagged)
+        while pending or window:
+            while pending and len(window) < workers:
+                img, old, _size, target = pending.popleft()
+                try:
+                    pixels = read_compact(img)
+                except Exception as exc:
+                    print(f"    ! Could not read '{img.name}': {exc}")
+                    failed += 1
+                    continue
+                srgb = img.colorspace_settings.name == "sRGB"
+                alpha = pixels.shape[2] == 4 and img.alpha_mode != "NONE"
+                window.append((img, old, target, pool.submit(resample.resample_pixels, pixels, *target, srgb, alpha)))
+            if not window:
+                continue
+
+            img, old, target, future = window.popleft()
+            path, file_format = resized_path(img, target)
+            try:
+                save_pixels(img, future.result(), path, file_format)
+            except Exception as exc:
+                print(f"    ! Resize failed for '{img.name}': {exc}")
+                failed += 1
+                continue
+            print(f"+ WROTE: {path}")
+            written.append((old, path))
+    return written, failed
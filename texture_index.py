@@ -0,0 +1,251 @@
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+
+TEXTURE_EXTENSIONS = {
+    ".ace",
+    ".bmp",
+    ".dds",
+    ".exr",
+    ".hdr",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".tga",
+    ".tif",
+    ".tiff",
+    ".webp",
+}
+INDEX_NAME = "texture_index.sqlite"
+SCAN_WORKERS = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    basename TEXT NOT NULL,
+    basename_lower TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_basename_lower ON files (basename_lower);
+CREATE INDEX IF NOT EXISTS files_root ON files (root);
+"""
+
+
+def split_roots(text):
+    roots = []
+    for part in (text or "").split(";"):
+        part = part.strip()
+        if part:
+            roots.append(os.path.normpath(part))
+    return roots
+
+
+def connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def scan_directory(path):
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in TEXTURE_EXTENSIONS:
+                        stat = entry.stat()
+                        files.append((entry.path, entry.name, stat.st_size, stat.st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def scan_root(root, workers=SCAN_WORKERS):
+    # Breadth-first walk with one scandir per directory, fanned out over threads.
+    found = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan_directory, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                pending.update(pool.submit(scan_directory, subdir) for subdir in subdirs)
+    return found
+
+
+def refresh_index(db_path, roots, workers=SCAN_WORKERS):
+    stats = {"added": 0, "updated": 0, "removed": 0, "total": 0}
+    connection = connect(db_path)
+    try:
+        with connection:
+            placeholders = ",".join("?" * len(roots))
+            removed = connection.execute(f"DELETE FROM files WHERE root NOT IN ({placeholders})", roots)
+            stats["removed"] += removed.rowcount
+
+            for root in roots:
+                known = {
+                    path: (size, mtime_ns)
+                    for path, size, mtime_ns in connection.execute(
+                        "SELECT path, size, mtime_ns FROM files WHERE root = ?", (root,)
+                    )
+                }
+                changed = []
+                for path, name, size, mtime_ns in scan_root(root, workers):
+                    previous = known.pop(path, None)
+                    if previous == (size, mtime_ns):
+                        continue
+                    stats["updated" if previous else "added"] += 1
+                    changed.append((path, root, name, name.lower(), size, mtime_ns))
+
+                connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", changed)
+                connection.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in known))
+                stats["removed"] += len(known)
+
+        stats["total"] = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    finally:
+        connection.close()
+    return stats
+
+
+def find_by_basenames(db_path, basenames):
+    # One query for the whole batch: the wanted names go into a temp table.
+    wanted = sorted({name.lower() for name in basenames if name})
+    matches = {name: [] for name in wanted}
+    if not wanted or not os.path.exists(db_path):
+        return matches
+
+    connection = connect(db_path)
+    try:
+        connection.execute("CREATE TEMP TABLE wanted (name TEXT PRIMARY KEY)")
+        connection.executemany("INSERT INTO wanted VALUES (?)", ((name,) for name in wanted))
+        rows = connection.execute(
+            "SELECT files.basename_lower, files.path, files.size, files.mtime_ns "
+            "FROM files JOIN wanted ON files.basename_lower = wanted.name"
+        )
+        for name, path, size, mtime_ns in rows:
+            matches[name].append((path, size, mtime_ns))
+    finally:
+        connection.close()
+    return matches
+
+
+def best_candidate(old_path, candidates):
+    # Prefer the candidate sharing the most trailing folders with the old path,
+    # then the most recently modified one.
+    old_parts = normalized_parts(old_path)
+
+    def score(candidate):
+        parts = normalized_parts(candidate[0])
+        shared = 0
+        for old_part, part in zip(reversed(old_parts[:-1]), reversed(parts[:-1])):
+            if old_part != part:
+                break
+            shared += 1
+        return shared, candidate[2]
+
+    return max(candidates, key=score)[0] if candidates else None
+
+
+def normalized_parts(path):
+    return [part.lower() for part in path.replace("\\", "/").split("/") if part]
+
+
+FUZZY_CANDIDATES = 50
+COMMON_TRIGRAM_SHARE = 0.02
+
+# (db path, mtime_ns, size) -> TrigramIndex; rebuilt whenever the database changes.
+TRIGRAM_CACHE = {}
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def name_stem(name):
+    return os.path.splitext(name.lower())[0]
+
+
+class TrigramIndex:
+    def __init__(self, rows):
+        self.paths = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        self.mtimes = [row[2] for row in rows]
+        self.stems = [name_stem(name) for name in self.names]
+
+        ids = {}
+        trigram_ids = []
+        name_ids = []
+        for name_id, stem in enumerate(self.stems):
+            for trigram in trigrams(stem):
+                trigram_ids.append(ids.setdefault(trigram, len(ids)))
+                name_ids.append(name_id)
+
+        trigram_ids = np.array(trigram_ids, dtype=np.int32)
+        name_ids = np.array(name_ids, dtype=np.int32)
+        order = np.argsort(trigram_ids, kind="stable")
+        bounds = np.searchsorted(trigram_ids[order], np.arange(len(ids) + 1))
+        sorted_names = name_ids[order]
+        self.postings = {trigram: sorted_names[bounds[i] : bounds[i + 1]] for trigram, i in ids.items()}
+        self.common = max(1, int(len(self.names) * COMMON_TRIGRAM_SHARE))
+
+    def search(self, name, threshold=0.5, limit=5):
+        query = trigrams(name_stem(name))
+        postings = [self.postings[t] for t in query if t in self.postings]
+        rare = [posting for posting in postings if len(posting) <= self.common] or postings
+        if not rare:
+            return []
+
+        # Shortlist by shared rare trigrams, then score the shortlist exactly.
+        ids, counts = np.unique(np.concatenate(rare), return_counts=True)
+        shortlist = ids[np.argsort(-counts, kind="stable")[:FUZZY_CANDIDATES]]
+        extension = os.path.splitext(name.lower())[1]
+
+        scored = []
+        for name_id in shortlist.tolist():
+            other = trigrams(self.stems[name_id])
+            score = len(query & other) / len(query | other)
+            if score >= threshold:
+                same_ext = os.path.splitext(self.names[name_id])[1] == extension
+                scored.append((score, same_ext, self.mtimes[name_id], self.paths[name_id]))
+        scored.sort(reverse=True)
+        return [(score, path) for score, _, _, path in scored[:limit]]
+
+
+def trigram_index(db_path):
+    if not os.path.exists(db_path):
+        return None
+    stat = os.stat(db_path)
+    key = (db_path, stat.st_mtime_ns, stat.st_size)
+    if key not in TRIGRAM_CACHE:
+        connection = connect(db_path)
+        try:
+            rows = connection.execute("SELECT path, basename_lower, mtime_ns FROM files").fetchall()
+        finally:
+            connection.close()
+        TRIGRAM_CACHE.clear()
+        TRIGRAM_CACHE[key] = TrigramIndex(rows)
+    return TRIGRAM_CACHE[key]
+
+
+def fuzzy_matches(db_path, names, threshold=0.5):
+    index = trigram_index(db_path)
+    if index is None:
+        return {}
+    results = {}
+    for name in set(names):
+        found = index.search(name, threshold, limit=1)
+        if found:
+            results[name] = found[0]
+    return results
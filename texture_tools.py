@@ -1,10 +1,38 @@
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
-from bpy.props import BoolProperty, EnumProperty, StringProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import Operator, PropertyGroup
 
+from .hash_cache import bytes_digest, file_digest
+from .texture_index import (
+    INDEX_NAME,
+    best_candidate,
+    find_by_basenames,
+    fuzzy_matches,
+    refresh_index,
+    split_roots,
+)
+from .user_config import config_path
+
+
+UNPACK_WORKERS = 8
+FORMAT_EXTENSIONS = {
+    "PNG": ".png",
+    "JPEG": ".jpg",
+    "TARGA": ".tga",
+    "TARGA_RAW": ".tga",
+    "BMP": ".bmp",
+    "OPEN_EXR": ".exr",
+    "HDR": ".hdr",
+    "TIFF": ".tif",
+    "WEBP": ".webp",
+    "DDS": ".dds",
+}
+
 
 def iter_materials_used_by_object(obj):
     mats = set()
@@ -49,6 +77,10 @@ def ext_with_dot(ext):
 
 
 def mapping_source_items(self, context):
+    # Imported here so the core texture helpers do not pull in the preview
+    # machinery (its worker pool and timers).
+    from .thumbnails import thumbnail_icon
+
     items = []
     seen = set()
 
@@ -63,7 +95,8 @@ def mapping_source_items(self, context):
         seen.add(key)
 
         label = os.path.basename(path) if path else img.name
-        items.append((key, label, path if path else img.name))
+        icon = thumbnail_icon(bpy.path.abspath(path, library=img.library)) if path else 0
+        items.append((key, label, path if path else img.name, icon, len(items)))
 
     return items or [("__NONE__", "<no images found>", "No image filepaths available")]
 
@@ -108,6 +141,14 @@ def parse_mapping(multiline):
     return mapping
 
 
+def append_mapping_lines(props, lines):
+    # Generated lines go after whatever the user already typed; a later line
+    # for the same texture wins in parse_mapping.
+    text = "\n".join(lines)
+    props.mapping_text = props.mapping_text.rstrip() + "\n" + text if props.mapping_text.strip() else text
+    props.strategy = "MAPPING"
+
+
 def mapping_lookup(old_path, mapping):
     keys_to_try = [old_path]
     try:
@@ -122,21 +163,140 @@ def mapping_lookup(old_path, mapping):
     return None
 
 
+def missing_image_paths(images):
+    missing = {}
+    for img in images:
+        if not can_edit_image(img) or img.packed_file or img.source == "TILED":
+            continue
+        old = img.filepath_raw or img.filepath
+        if not isinstance(old, str) or not old:
+            continue
+        if not os.path.exists(bpy.path.abspath(old)):
+            missing[old] = os.path.basename(bpy.path.abspath(old).replace("\\", "/"))
+    return missing
+
+
+def relink_plan(images):
+    missing = missing_image_paths(images)
+    matches = find_by_basenames(config_path(INDEX_NAME), missing.values())
+    plan = {}
+    for old, basename in missing.items():
+        found = best_candidate(bpy.path.abspath(old), matches.get(basename.lower(), []))
+        if found:
+            plan[old] = found
+    return plan
+
+
 def can_edit_image(img):
     return img.library is None
 
 
-def maybe_unpack(img, unpack):
-    if img.packed_file and unpack:
-        try:
-            img.unpack(method="WRITE_LOCAL")
-            return True
-        except Exception as exc:
-            print(f"    ! Unpack failed for '{img.name}': {exc}")
+def packed_basename(img):
+    name = os.path.basename(bpy.path.abspath(img.filepath).replace("\\", "/")) if img.filepath else ""
+    if not name:
+        name = bpy.path.clean_name(img.name)
+    if not os.path.splitext(name)[1]:
+        name += FORMAT_EXTENSIONS.get(img.file_format, ".png")
+    return name
+
+
+def unpack_target(texture_dir, basename, size, digest, used_names):
+    # Same folder and name as unpack(method="WRITE_LOCAL"), but an existing file
+    # is only reused when its content matches; anything else gets a numbered
+    # name instead of being overwritten.
+    stem, ext = os.path.splitext(basename)
+    candidate = basename
+    index = 1
+    while candidate.lower() in used_names or not reusable(os.path.join(texture_dir, candidate), size, digest):
+        candidate = f"{stem}.{index:03d}{ext}"
+        index += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+
+def reusable(path, size, digest):
+    # A missing file is free; an existing one must hold the same bytes.
+    try:
+        if os.path.getsize(path) != size:
             return False
+        return file_digest(path) == digest
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+def write_payload(path, data):
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as existing:
+            if existing.read() == data:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as out:
+            out.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
     return True
 
 
+def unpack_images(images, workers=UNPACK_WORKERS):
+    # Bulk unpack(method="WRITE_LOCAL"): packed bytes are read once per image on
+    # the main thread, identical payloads are written once by the pool, and only
+    # the filepath update and the packed-data release happen back here.
+    # Returns {image name: error} for images that are still packed.
+    if not bpy.data.filepath:
+        return {img.name: "save the blend file before unpacking" for img in images if img.packed_file}
+    errors = {}
+    payloads = {}
+    for img in images:
+        if not img.packed_file:
+            continue
+        if len(img.packed_files) > 1:
+            # UDIM tiles: let Blender write the tile set.
+            try:
+                img.unpack(method="WRITE_LOCAL")
+            except Exception as exc:
+                errors[img.name] = str(exc)
+            continue
+        data = bytes(img.packed_file.data)
+        payloads.setdefault(bytes_digest(data), (data, []))[1].append(img)
+
+    texture_dir = bpy.path.abspath("//textures")
+    used_names = set()
+    targets = {
+        digest: unpack_target(texture_dir, packed_basename(imgs[0]), len(data), digest, used_names)
+        for digest, (data, imgs) in payloads.items()
+    }
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            digest: pool.submit(write_payload, os.path.join(texture_dir, targets[digest]), data)
+            for digest, (data, _imgs) in payloads.items()
+        }
+        for digest, future in futures.items():
+            data, imgs = payloads[digest]
+            try:
+                future.result()
+            except OSError as exc:
+                errors.update((img.name, str(exc)) for img in imgs)
+                continue
+            for img in imgs:
+                # USE_ORIGINAL would resolve the packed entry's own stored path
+                # (and write there); the file is already on disk, so the packed
+                # data is only released and the image pointed at it.
+                try:
+                    img.unpack(method="REMOVE")
+                    img.filepath = f"//textures/{targets[digest]}"
+                    img.reload()
+                except Exception as exc:
+                    errors[img.name] = str(exc)
+    return errors
+
+
 def apply_new_path(img, new_path, make_relative, reload_after):
     final = rel_or_abs(new_path, make_relative=make_relative)
     try:
@@ -186,6 +346,7 @@ class TXCH_Props(PropertyGroup):
             ("SEARCH_REPLACE", "Search/Replace", "Replace substring in path"),
             ("MAPPING", "Mapping", "Explicit old=>new mapping"),
             ("PREFIX_SUFFIX", "Prefix/Suffix", "Rename keeping folder"),
+            ("RELINK_MISSING", "Relink Missing", "Find missing files by name in the indexed texture library"),
         ],
         default="SWAP_DIR",
     )
@@ -223,6 +384,19 @@ class TXCH_Props(PropertyGroup):
     add_suffix: StringProperty(name="Suffix", default="")
     change_ext: StringProperty(name="Change Ext", default="", description="e.g. jpg; blank to keep")
 
+    library_roots: StringProperty(
+        name="Library Roots",
+        description="Texture library folders to index, separated by ';'",
+        default="",
+    )
+    fuzzy_threshold: FloatProperty(
+        name="Fuzzy Threshold",
+        description="Minimum trigram similarity for fuzzy relink proposals",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+    )
+
     rename_enable: BoolProperty(name="Enable Image Datablock Rename", default=False)
     rename_scope: EnumProperty(
         name="Rename Scope",
@@ -259,6 +433,141 @@ class TXCH_Props(PropertyGroup):
     )
     rn_dry_run: BoolProperty(name="Dry Run (Names)", default=True)
 
+    dedup_dry_run: BoolProperty(name="Dry Run (Duplicates)", default=True)
+
+    collect_dir: StringProperty(name="Collect Into", default="//textures", subtype="DIR_PATH")
+    collect_link_mode: EnumProperty(
+        name="Link Mode",
+        description="How collected files are created in the target folder",
+        items=[
+            ("COPY", "Copy", "Always write an independent copy"),
+            ("REFLINK", "Reflink", "Share file data copy-on-write where the filesystem allows, else copy"),
+            (
+                "HARDLINK",
+                "Hardlink",
+                "Hardlink to the source where possible (edits affect both), else reflink or copy",
+            ),
+        ],
+        default="REFLINK",
+    )
+    collect_overwrite: BoolProperty(
+        name="Overwrite Different Files",
+        description="Replace files in the target folder that have the same name but different contents",
+        default=False,
+    )
+    collect_dry_run: BoolProperty(name="Dry Run (Collect)", default=True)
+
+    size_budget: IntProperty(
+        name="Max Size",
+        description="Largest allowed width or height in pixels (0 = no limit)",
+        default=2048,
+        min=0,
+    )
+    size_require_pot: BoolProperty(
+        name="Require Power of Two",
+        description="Flag textures whose sides are not powers of two (required by MSTS/OpenRails)",
+        default=True,
+    )
+    size_dry_run: BoolProperty(name="Dry Run (Sizes)", default=True)
+
+    dds_format: EnumProperty(
+        name="DDS Format",
+        items=[
+            ("AUTO", "Auto", "BC3 for textures with transparency, BC1 otherwise"),
+            ("BC1", "BC1 (DXT1)", "4 bits per pixel, no alpha"),
+            ("BC3", "BC3 (DXT5)", "8 bits per pixel, with interpolated alpha"),
+        ],
+        default="AUTO",
+    )
+    dds_mip_filter: EnumProperty(
+        name="Mip Filter",
+        items=[
+            ("BOX", "Box", "Average each 2x2 block; fast and soft"),
+            ("KAISER", "Kaiser", "Windowed sinc; sharper distant mips"),
+        ],
+        default="KAISER",
+    )
+    dds_dry_run: BoolProperty(name="Dry Run (DDS)", default=True)
+
+    ace_direction: EnumProperty(
+        name="Direction",
+        items=[
+            ("TO_PNG", "ACE to PNG", "Decode .ace textures to .png and propose them as a Mapping"),
+            ("TO_ACE", "To ACE", "Write a .ace next to every other texture"),
+        ],
+        default="TO_PNG",
+    )
+    ace_surface: EnumProperty(
+        name="ACE Format",
+        items=[
+            ("AUTO", "Auto", "RGBA8 for textures with transparency, DXT1 otherwise"),
+            ("DXT1", "DXT1", "Block compressed, no alpha"),
+            ("RGBA8", "RGBA8", "Uncompressed with alpha"),
+        ],
+        default="AUTO",
+    )
+    ace_compress: BoolProperty(
+        name="Zlib Compress",
+        description="Write the compressed ACE variant (smaller, read by MSTS and OpenRails)",
+        default=True,
+    )
+    ace_dry_run: BoolProperty(name="Dry Run (ACE)", default=True)
+
+    atlas_path: StringProperty(name="Atlas File", default="//textures/atlas.png", subtype="FILE_PATH")
+    atlas_max_size: IntProperty(
+        name="Max Atlas Size",
+        description="Largest atlas width or height; textures that do not fit cancel the build",
+        default=4096,
+        min=64,
+        max=16384,
+    )
+    atlas_padding: IntProperty(
+        name="Padding",
+        description="Texels of repeated edge around each texture, so mipmaps do not bleed between them",
+        default=4,
+        min=0,
+        max=64,
+    )
+    atlas_dry_run: BoolProperty(name="Dry Run (Atlas)", default=True)
+
+    pack_source: EnumProperty(
+        name="Packs From",
+        items=[
+            ("RULES", "Suffix Rules", "Group maps in the same folder by name suffix (e.g. wagon_ao, wagon_gloss)"),
+            ("MAPPING", "Pack Lines", "Lines of 'ao.png, gloss.png, metal.png => packed.png'"),
+        ],
+        default="RULES",
+    )
+    pack_suffixes: StringProperty(
+        name="Channel Suffixes",
+        description="Comma separated name suffixes for R, G, B (and A); files sharing the rest of the name are packed",
+        default="_ao,_gloss,_metal",
+    )
+    pack_output_suffix: StringProperty(name="Packed Suffix", default="_agm")
+    pack_text: StringProperty(
+        name="Pack Lines",
+        description="Lines of 'r, g, b[, a] => packed.png'; 'name:g' picks a source channel, '-' leaves one empty",
+        default="",
+    )
+    pack_file: StringProperty(
+        name="Pack File",
+        description="Text file with pack lines (used instead of Pack Lines when set)",
+        default="",
+        subtype="FILE_PATH",
+    )
+    pack_relink: BoolProperty(
+        name="Relink Image Nodes",
+        description="Point image nodes of the source maps at the packed texture through a Separate Color node",
+        default=True,
+    )
+    pack_dry_run: BoolProperty(name="Dry Run (Pack)", default=True)
+
+    vram_assume_mips: BoolProperty(
+        name="Count Generated Mipmaps",
+        description="Add a full mip chain for textures that do not store one, as the sim generates it on load",
+        default=True,
+    )
+
 
 class TXCH_OT_Run(Operator):
     bl_idname = "txch.run"
@@ -273,7 +582,13 @@ class TXCH_OT_Run(Operator):
             self.report({"INFO"}, "No image textures found in scope.")
             return {"CANCELLED"}
 
-        mapping = parse_mapping(props.mapping_text) if props.strategy == "MAPPING" else {}
+        if props.strategy == "MAPPING":
+            mapping = parse_mapping(props.mapping_text)
+        elif props.strategy == "RELINK_MISSING":
+            mapping = relink_plan(target_images)
+        else:
+            mapping = {}
+        planned = []
         changed = 0
         skipped = 0
 
@@ -315,13 +630,21 @@ class TXCH_OT_Run(Operator):
             print(f"+ {'WOULD SET' if props.dry_run else 'SET'}: '{img.name}'")
             print(f"    From: {old}")
             print(f"    To  : {new_candidate}")
-
-            if not props.dry_run:
-                if not maybe_unpack(img, props.unpack_if_packed):
+            planned.append((img, new_candidate))
+
+        if not props.dry_run:
+            unpack_errors = {}
+            if props.unpack_if_packed:
+                unpack_errors = unpack_images([img for img, _ in planned if img.packed_file])
+            for img, new_candidate in planned:
+                if img.name in unpack_errors:
+                    print(f"    ! Unpack failed for '{img.name}': {unpack_errors[img.name]}")
                     skipped += 1
                     continue
                 apply_new_path(img, new_candidate, props.make_relative, props.reload_after)
-            changed += 1
+                changed += 1
+        else:
+            changed = len(planned)
 
         self.report({"INFO"}, f"Paths {'planned' if props.dry_run else 'applied'}: {changed}, Skipped: {skipped}")
         return {"FINISHED"}
@@ -340,6 +663,8 @@ class TXCH_OT_Run(Operator):
             return search_replace(old_path, props.search_text, props.replace_text)
         if props.strategy == "MAPPING":
             return mapping_lookup(old_path, mapping)
+        if props.strategy == "RELINK_MISSING":
+            return mapping.get(old_path)
         if props.strategy == "PREFIX_SUFFIX":
             return build_new_path_from_prefix_suffix(old_path, props.add_prefix, props.add_suffix, props.change_ext)
         return None
@@ -433,6 +758,82 @@ class TXCH_OT_RenameImages(Operator):
         return None
 
 
+class TXCH_OT_IndexTextureLibrary(Operator):
+    bl_idname = "txch.index_texture_library"
+    bl_label = "Index Texture Library"
+    bl_description = "Scan the library roots and refresh the texture index used by Relink Missing"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        roots = [bpy.path.abspath(root) for root in split_roots(props.library_roots)]
+        missing = [root for root in roots if not os.path.isdir(root)]
+        if not roots or missing:
+            self.report({"ERROR"}, f"Library roots not found: {', '.join(missing) or '(none set)'}")
+            return {"CANCELLED"}
+
+        try:
+            stats = refresh_index(config_path(INDEX_NAME), roots)
+        except Exception as exc:
+            self.report({"ERROR"}, f"Failed to index texture library: {exc}")
+            return {"CANCELLED"}
+
+        self.report(
+            {"INFO"},
+            f"Indexed {stats['total']} textures (added {stats['added']}, "
+            f"updated {stats['updated']}, removed {stats['removed']})",
+        )
+        return {"FINISHED"}
+
+
+class TXCH_OT_ProposeFuzzyRelinks(Operator):
+    bl_idname = "txch.propose_fuzzy_relinks"
+    bl_label = "Propose Fuzzy Relinks"
+    bl_description = (
+        "Match missing textures against the library index by similar name and write the "
+        "proposals into the Mapping field for review"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        props = context.scene.txch
+        images = collect_object_images(props.scope)
+        missing = missing_image_paths(images)
+        if not missing:
+            self.report({"INFO"}, "No missing textures in scope.")
+            return {"CANCELLED"}
+
+        exact = relink_plan(images)
+        unresolved = {old: name for old, name in missing.items() if old not in exact}
+        proposals = fuzzy_matches(config_path(INDEX_NAME), unresolved.values(), props.fuzzy_threshold)
+
+        print("\n=== TrainSimTools: FUZZY RELINK PLAN ===")
+        lines = []
+        for old, new in exact.items():
+            lines.append(f"{old} => {new}")
+            print(f"= 1.00 {old}\n    -> {new}")
+        for old, name in unresolved.items():
+            if name not in proposals:
+                print(f"- ---- {old} (no candidate)")
+                continue
+            score, new = proposals[name]
+            lines.append(f"# similarity {score:.2f}")
+            lines.append(f"{old} => {new}")
+            print(f"~ {score:.2f} {old}\n    -> {new}")
+
+        if not lines:
+            self.report({"INFO"}, f"No candidates for {len(missing)} missing textures.")
+            return {"CANCELLED"}
+
+        append_mapping_lines(props, lines)
+        self.report(
+            {"INFO"},
+            f"Proposed {len(exact)} exact and {len(proposals)} fuzzy relinks for {len(missing)} missing; "
+            "appended to the Mapping for review, then Apply.",
+        )
+        return {"FINISHED"}
+
+
 class TXCH_OT_LoadMappingFromFile(Operator):
     bl_idname = "txch.load_mapping_file"
     bl_label = "Load Mapping From File"
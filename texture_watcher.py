@@ -0,0 +1,193 @@
+import os
+import queue
+import threading
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+
+from .texture_tools import collect_object_images
+
+POLL_INTERVAL = 0.5
+# A file must be quiet this long before its images reload, so a paint app's
+# burst of writes (temp file, rename, metadata) costs one reload.
+DEBOUNCE = 0.75
+TIMER_INTERVAL = 0.1
+# Main-thread time spent reloading per timer tick; the rest waits a tick.
+RELOAD_BUDGET = 0.02
+REFRESH_INTERVAL = 5.0
+REDRAW_AREAS = {"VIEW_3D", "IMAGE_EDITOR", "NODE_EDITOR"}
+
+# names: watched image names. targets: {folder: {normcase file name: normcase
+# path}}, replaced (never mutated) so the poll thread can read it unlocked.
+# paths: {normcase path: [image names]}. due: {normcase path: last change}.
+WATCH = {
+    "thread": None,
+    "stop": None,
+    "names": (),
+    "targets": {},
+    "paths": {},
+    "changes": queue.SimpleQueue(),
+    "due": {},
+    "refreshed": 0.0,
+}
+
+
+class TXCH_OT_WatchTextures(Operator):
+    bl_idname = "txch.watch_textures"
+    bl_label = "Watch Textures"
+    bl_description = "Start or stop reloading the textures in scope whenever their files change on disk"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        if is_watching():
+            stop_watching()
+            self.report({"INFO"}, "Stopped watching textures.")
+            return {"FINISHED"}
+
+        files, folders = start_watching(collect_object_images(context.scene.txch.scope))
+        if not files:
+            stop_watching()
+            self.report({"INFO"}, "No texture files in scope to watch.")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Watching {files} texture files in {folders} folders.")
+        return {"FINISHED"}
+
+
+def is_watching():
+    return WATCH["thread"] is not None
+
+
+def watched_counts():
+    return len(WATCH["paths"]), len(WATCH["targets"])
+
+
+def refresh_targets():
+    # Re-resolves the watched images' paths (they may have been relinked).
+    targets = {}
+    paths = {}
+    for name in WATCH["names"]:
+        img = bpy.data.images.get(name)
+        old = img and (img.filepath_raw or img.filepath)
+        if not old or img.source != "FILE" or img.packed_file:
+            continue
+        path = os.path.normcase(os.path.normpath(bpy.path.abspath(old, library=img.library)))
+        folder, file_name = os.path.split(path)
+        targets.setdefault(folder, {})[file_name] = path
+        paths.setdefault(path, []).append(name)
+    WATCH.update(targets=targets, paths=paths, refreshed=time.monotonic())
+
+
+def poll_folders(stop, changes):
+    # Poll thread: one scandir per folder per tick. The first sight of a file
+    # only records it; later size or mtime differences are queued.
+    seen = {}
+    while not stop.is_set():
+        for folder, names in WATCH["targets"].items():
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        path = names.get(os.path.normcase(entry.name))
+                        if path is None:
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        signature = (stat.st_mtime_ns, stat.st_size)
+                        if seen.get(path, signature) != signature:
+                            changes.put((path, time.monotonic()))
+                        seen[path] = signature
+            except OSError:
+                continue
+        stop.wait(POLL_INTERVAL)
+
+
+def reload_changed():
+    if not is_watching():
+        return None
+    if time.monotonic() - WATCH["refreshed"] > REFRESH_INTERVAL:
+        refresh_targets()
+
+    due = WATCH["due"]
+    while True:
+        try:
+            path, changed = WATCH["changes"].get_nowait()
+        except queue.Empty:
+            break
+        due[path] = changed
+
+    now = time.monotonic()
+    start = time.perf_counter()
+    reloaded = 0
+    for path, changed in sorted(due.items(), key=lambda item: item[1]):
+        if now - changed < DEBOUNCE:
+            break
+        if time.perf_counter() - start > RELOAD_BUDGET:
+            break
+        del due[path]
+        for name in WATCH["paths"].get(path, ()):
+            img = bpy.data.images.get(name)
+            if img is None:
+                continue
+            try:
+                img.reload()
+            except Exception as exc:
+                print(f"    ! Reload failed for '{name}': {exc}")
+                continue
+            print(f"+ RELOADED: '{name}'")
+            reloaded += 1
+
+    if reloaded:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type in REDRAW_AREAS:
+                    area.tag_redraw()
+    return TIMER_INTERVAL
+
+
+def start_watching(images):
+    # Returns (file count, folder count).
+    stop_watching()
+    WATCH.update(names=tuple(sorted({img.name for img in images})), changes=queue.SimpleQueue(), due={})
+    refresh_targets()
+    if not WATCH["paths"]:
+        return 0, 0
+
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=poll_folders, args=(stop, WATCH["changes"]), name="tst_texture_watcher", daemon=True
+    )
+    WATCH.update(thread=thread, stop=stop)
+    thread.start()
+    bpy.app.timers.register(reload_changed, first_interval=TIMER_INTERVAL)
+    print("\n=== TrainSimTools: WATCHING TEXTURES ===")
+    for folder in sorted(WATCH["targets"]):
+        print(f"+ {folder} ({len(WATCH['targets'][folder])} files)")
+    return watched_counts()
+
+
+def stop_watching():
+    # The poll thread is a daemon and exits at its next tick; no join, so a
+    # slow network folder never blocks the UI.
+    if WATCH["stop"] is not None:
+        WATCH["stop"].set()
+    if bpy.app.timers.is_registered(reload_changed):
+        bpy.app.timers.unregister(reload_changed)
+    WATCH.update(thread=None, stop=None, names=(), targets={}, paths={}, due={})
+
+
+@persistent
+def stop_on_load(*_args):
+    stop_watching()
+
+
+def register_handlers():
+    bpy.app.handlers.load_post.append(stop_on_load)
+
+
+def unregister_handlers():
+    if stop_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(stop_on_load)
+    stop_watching()
@@ -0,0 +1,60 @@
+import os
+import zlib
+
+import numpy as np
+
+if __package__:
+    from .ace_codec import decode_ace
+    from .hash_cache import file_digest
+    from .image_files import read_image, read_png, write_png
+    from .image_resample import resize_axis
+else:
+    from ace_codec import decode_ace
+    from hash_cache import file_digest
+    from image_files import read_image, read_png, write_png
+    from image_resample import resize_axis
+
+
+THUMBNAIL_SIZE = 128
+THUMBNAIL_EXTENSIONS = (".png", ".tga", ".bmp", ".ace")
+
+
+def thumbnail_path(cache_dir, digest, size=THUMBNAIL_SIZE):
+    return os.path.join(cache_dir, f"{digest}_{size}.png")
+
+
+def fit_square(pixels, size=THUMBNAIL_SIZE):
+    # Area-downscaled to fit `size`, centred on a transparent square so the
+    # aspect ratio survives in a square icon. Never upscales.
+    height, width = pixels.shape[:2]
+    scale = min(1.0, size / max(height, width))
+    target_height, target_width = max(1, round(height * scale)), max(1, round(width * scale))
+    small = resize_axis(resize_axis(pixels.astype(np.float32), target_height, 0), target_width, 1)
+    square = np.zeros((size, size, 4), dtype=np.uint8)
+    top, left = (size - target_height) // 2, (size - target_width) // 2
+    square[top : top + target_height, left : left + target_width] = np.clip(np.rint(small), 0, 255)
+    return square
+
+
+def make_thumbnail(path, cache_dir, digest=None, size=THUMBNAIL_SIZE):
+    # Process-pool entry point. Returns (digest, float32 RGBA pixels, flat
+    # and bottom row first, as icon_pixels_float takes them). Thumbnails are
+    # cached on disk by content hash, so renamed or copied files hit too.
+    digest = digest or file_digest(path)
+    cached = thumbnail_path(cache_dir, digest, size)
+    thumbnail = None
+    if os.path.isfile(cached):
+        try:
+            with open(cached, "rb") as handle:
+                thumbnail = read_png(handle.read())
+        except (OSError, ValueError, zlib.error):
+            thumbnail = None
+    if thumbnail is None or thumbnail.shape != (size, size, 4):
+        source = decode_ace(path) if path.lower().endswith(".ace") else read_image(path)
+        thumbnail = fit_square(source, size)
+        os.makedirs(cache_dir, exist_ok=True)
+        write_png(cached, thumbnail)
+
+    values = thumbnail[::-1].astype(np.float32)
+    values *= 1.0 / 255.0
+    return digest, values.reshape(-1)
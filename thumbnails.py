@@ -0,0 +1,130 @@
+import os
+import time
+
+import bpy
+import bpy.utils.previews
+
+from .hash_cache import HASH_CACHE_NAME, shared_cache
+from .process_pool import process_pool, standalone
+from .thumbnail_cache import THUMBNAIL_EXTENSIONS
+from .user_config import config_path
+
+
+THUMBNAIL_WORKERS = 4
+THUMBNAIL_DIR = "thumbnails"
+DRAIN_INTERVAL = 0.1
+# Main-thread time spent assigning icons per timer tick.
+DRAIN_BUDGET = 0.004
+# Seconds between stat checks of a file whose thumbnail is already shown.
+RECHECK_INTERVAL = 2.0
+REDRAW_AREAS = {"VIEW_3D", "PROPERTIES", "IMAGE_EDITOR", "NODE_EDITOR"}
+
+# Preview collection and the worker process pool (started on first use).
+# pending: {key: (path, stat, future)}; signatures: {key: (mtime_ns, size)} of
+# the file each preview was queued from, so edited files are thumbnailed again.
+THUMBNAILS = {"previews": None, "pool": None, "pending": {}, "failed": set(), "signatures": {}, "checked": {}}
+
+
+def thumbnail_icon(path):
+    # icon_id for the texture at `path`, or 0. The first call for a file
+    # queues its thumbnail and returns an empty preview that fills in later.
+    previews = THUMBNAILS["previews"]
+    if previews is None or not path or not path.lower().endswith(THUMBNAIL_EXTENSIONS):
+        return 0
+    path = os.path.normpath(path)
+    key = os.path.normcase(path)
+    preview = previews.get(key)
+    now = time.monotonic()
+    if preview is None or (
+        key not in THUMBNAILS["pending"] and now - THUMBNAILS["checked"].get(key, 0.0) > RECHECK_INTERVAL
+    ):
+        THUMBNAILS["checked"][key] = now
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is not None and THUMBNAILS["signatures"].get(key) != (stat.st_mtime_ns, stat.st_size):
+            queue_thumbnail(key, path, stat)
+            preview = previews.get(key)
+    if preview is None or key in THUMBNAILS["failed"]:
+        return 0
+    return preview.icon_id
+
+
+def queue_thumbnail(key, path, stat):
+    # Decoding a large PNG is pure-Python-heavy and would hold the GIL against
+    # Blender's UI, so it runs in worker processes that send back 128 px.
+    if THUMBNAILS["pool"] is None:
+        THUMBNAILS["pool"] = process_pool(THUMBNAIL_WORKERS)
+    digest = shared_cache(config_path(HASH_CACHE_NAME)).lookup(path, stat)
+    old = THUMBNAILS["pending"].pop(key, None)
+    if old is not None:
+        old[2].cancel()
+    try:
+        future = THUMBNAILS["pool"].submit(
+            standalone("thumbnail_cache").make_thumbnail, path, config_path(THUMBNAIL_DIR), digest
+        )
+    except RuntimeError as exc:
+        print(f"    ! Thumbnail failed for '{path}': {exc}")
+        THUMBNAILS["failed"].add(key)
+        return
+    THUMBNAILS["pending"][key] = (path, stat, future)
+    THUMBNAILS["signatures"][key] = (stat.st_mtime_ns, stat.st_size)
+    THUMBNAILS["failed"].discard(key)
+    if key not in THUMBNAILS["previews"]:
+        THUMBNAILS["previews"].new(key)
+    if not bpy.app.timers.is_registered(drain_thumbnails):
+        bpy.app.timers.register(drain_thumbnails, first_interval=DRAIN_INTERVAL)
+
+
+def drain_thumbnails():
+    previews = THUMBNAILS["previews"]
+    if previews is None:
+        return None
+    cache = shared_cache(config_path(HASH_CACHE_NAME))
+    start = time.perf_counter()
+    drained = False
+    for key, (path, stat, future) in list(THUMBNAILS["pending"].items()):
+        if time.perf_counter() - start > DRAIN_BUDGET:
+            break
+        if not future.done():
+            continue
+        del THUMBNAILS["pending"][key]
+        preview = previews.get(key)
+        try:
+            digest, pixels = future.result()
+        except Exception as exc:
+            print(f"    ! Thumbnail failed for '{path}': {exc}")
+            THUMBNAILS["failed"].add(key)
+            continue
+        if preview is None:
+            continue
+        side = int(round((len(pixels) // 4) ** 0.5))
+        preview.icon_size = (side, side)
+        preview.icon_pixels_float.foreach_set(pixels)
+        preview.image_size = (side, side)
+        preview.image_pixels_float.foreach_set(pixels)
+        cache.store(path, stat, digest)
+        drained = True
+
+    if drained:
+        cache.save()
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type in REDRAW_AREAS:
+                    area.tag_redraw()
+    return DRAIN_INTERVAL if THUMBNAILS["pending"] else None
+
+
+def register_previews():
+    THUMBNAILS["previews"] = bpy.utils.previews.new()
+
+
+def unregister_previews():
+    if bpy.app.timers.is_registered(drain_thumbnails):
+        bpy.app.timers.unregister(drain_thumbnails)
+    if THUMBNAILS["pool"] is not None:
+        THUMBNAILS["pool"].shutdown(wait=False, cancel_futures=True)
+    if THUMBNAILS["previews"] is not None:
+        bpy.utils.previews.remove(THUMBNAILS["previews"])
+    THUMBNAILS.update(previews=None, pool=None, pending={}, failed=set(), signatures={}, checked={})
@@ -0,0 +1,13 @@
+import os
+
+import bpy
+
+
+def config_directory():
+    path = bpy.utils.user_resource("CONFIG", path="trainsimtools", create=True)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def config_path(name):
+    return os.path.join(config_directory(), name)
@@ -0,0 +1,197 @@
+import os
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+
+from .collection_tools import lod_collection_names
+from .hash_cache import HASH_CACHE_NAME, shared_cache
+from .image_probe import probe_images
+from .texture_tools import enumerate_image_nodes, iter_materials_used_by_object
+from .user_config import config_path
+
+
+TOP_OFFENDERS = 5
+REPORT_OFFENDERS = 15
+# Bytes per pixel as uploaded to the GPU; anything not listed is expanded to RGBA8.
+FORMAT_BYTES = {
+    "BC1": 0.5,
+    "BC4": 0.5,
+    "DXT1": 0.5,
+    "BC2": 1.0,
+    "BC3": 1.0,
+    "BC5": 1.0,
+    "BC6H": 1.0,
+    "BC7": 1.0,
+    "RGB565": 2.0,
+    "RGBA5551": 2.0,
+}
+BLOCK_FORMATS = ("BC1", "BC2", "BC3", "BC4", "BC5", "BC6H", "BC7", "DXT1")
+INDEX_UPDATE_TYPES = (bpy.types.Collection, bpy.types.Material, bpy.types.NodeTree, bpy.types.Image)
+# Seconds without index-relevant edits before the index is rebuilt.
+REBUILD_DELAY = 1.0
+
+# lod -> {image name: [object names]} and image name -> (width, height, format, mips).
+# The depsgraph handler drops it and a timer rebuilds it once edits settle;
+# the panel only reads it, so drawing never probes files.
+SCENE_INDEX = {}
+
+
+class TST_OT_TextureMemoryReport(Operator):
+    bl_idname = "tst.texture_memory_report"
+    bl_label = "Texture Memory Report"
+    bl_description = "Print estimated GPU texture memory per LOD collection, with the largest images and their users"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        assume_mips = context.scene.txch.vram_assume_mips
+        index = scene_index()
+        if not index["lods"]:
+            self.report({"INFO"}, "No LOD collections (MAIN_300 ... Scratchpad_1500) found.")
+            return {"CANCELLED"}
+
+        print("\n=== TrainSimTools: TEXTURE MEMORY ===")
+        for lod, total, count, offenders in lod_totals(index, assume_mips, REPORT_OFFENDERS):
+            print(f"+ {lod:<18} {total / 1048576:8.2f} MB  ({count} images)")
+            for name, size in offenders:
+                width, height, file_format, _mips = index["images"].get(name, (0, 0, "?", 1))
+                users = index["lods"][lod][name]
+                shown = ", ".join(users[:3]) + (f" +{len(users) - 3}" if len(users) > 3 else "")
+                print(f"    {size / 1048576:8.2f} MB  {width}x{height} {file_format:<12} '{name}'  ({shown})")
+            unknown = [name for name in index["lods"][lod] if name not in index["images"]]
+            if unknown:
+                print(f"    - unknown size: {', '.join(sorted(unknown))}")
+
+        self.report({"INFO"}, "Texture memory report written to the console.")
+        return {"FINISHED"}
+
+
+def image_bytes(width, height, file_format, mips, assume_mips=True):
+    # GPU size of the full mip chain; block formats round each level up to 4x4.
+    kind = file_format.rsplit("/", 1)[-1]
+    per_pixel = FORMAT_BYTES.get(kind, 4.0)
+    levels = max(width, height).bit_length() if assume_mips and mips <= 1 else max(1, mips)
+    total = 0
+    for level in range(levels):
+        level_width, level_height = max(1, width >> level), max(1, height >> level)
+        if kind in BLOCK_FORMATS:
+            level_width, level_height = (level_width + 3) // 4 * 4, (level_height + 3) // 4 * 4
+        total += level_width * level_height * per_pixel
+    return int(total)
+
+
+def scene_index():
+    if SCENE_INDEX:
+        return SCENE_INDEX
+
+    material_images = {}
+    lods = {}
+    for lod in lod_collection_names():
+        users = {}
+        for obj in bpy.data.collections[lod].all_objects:
+            for mat in iter_materials_used_by_object(obj):
+                if mat.name not in material_images:
+                    material_images[mat.name] = (
+                        {img.name for _node, img in enumerate_image_nodes(mat.node_tree)}
+                        if mat.use_nodes and mat.node_tree
+                        else set()
+                    )
+                for name in material_images[mat.name]:
+                    users.setdefault(name, []).append(obj.name)
+        lods[lod] = users
+
+    SCENE_INDEX["lods"] = lods
+    SCENE_INDEX["images"] = image_dimensions({name for users in lods.values() for name in users})
+    return SCENE_INDEX
+
+
+def image_dimensions(names):
+    # Header probes for files on disk (cached across sessions); packed or
+    # unreadable images fall back to Blender's size when already loaded.
+    paths = {}
+    for name in names:
+        img = bpy.data.images.get(name)
+        if img and not img.packed_file and img.source == "FILE" and img.filepath:
+            paths[name] = os.path.normpath(bpy.path.abspath(img.filepath, library=img.library))
+
+    cache = shared_cache(config_path(HASH_CACHE_NAME))
+    infos = probe_images(paths.values(), cache)
+    cache.save()
+
+    dimensions = {}
+    for name in names:
+        info = infos.get(paths.get(name))
+        img = bpy.data.images.get(name)
+        if info:
+            dimensions[name] = (info["width"], info["height"], info["format"], info["mips"])
+        elif img and img.has_data:
+            dimensions[name] = (img.size[0], img.size[1], "RGBA8", 1)
+    return dimensions
+
+
+def lod_totals(index, assume_mips=True, offenders=TOP_OFFENDERS):
+    # [(lod, total bytes, image count, [(image name, bytes)] largest first)]
+    totals = []
+    for lod, users in index["lods"].items():
+        sizes = [
+            (name, image_bytes(*index["images"][name], assume_mips=assume_mips))
+            for name in users
+            if name in index["images"]
+        ]
+        sizes.sort(key=lambda item: -item[1])
+        totals.append((lod, sum(size for _, size in sizes), len(users), sizes[:offenders]))
+    return totals
+
+
+def rebuild_scene_index():
+    scene_index()
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+    return None
+
+
+def schedule_rebuild():
+    # Restarting the timer debounces a drag that fires many updates.
+    if bpy.app.timers.is_registered(rebuild_scene_index):
+        bpy.app.timers.unregister(rebuild_scene_index)
+    bpy.app.timers.register(rebuild_scene_index, first_interval=REBUILD_DELAY)
+
+
+@persistent
+def invalidate_scene_index(scene, depsgraph):
+    # Moving or selecting objects must not drop the index; new material
+    # assignments, node edits, image changes and collection links do.
+    if not SCENE_INDEX:
+        return
+    for update in depsgraph.updates:
+        data = update.id
+        if isinstance(data, INDEX_UPDATE_TYPES) or (
+            isinstance(data, bpy.types.Object) and (update.is_updated_geometry or update.is_updated_shading)
+        ):
+            SCENE_INDEX.clear()
+            schedule_rebuild()
+            return
+
+
+@persistent
+def clear_scene_index(*_args):
+    SCENE_INDEX.clear()
+    schedule_rebuild()
+
+
+def register_handlers():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_scene_index)
+    bpy.app.handlers.load_post.append(clear_scene_index)
+    schedule_rebuild()
+
+
+def unregister_handlers():
+    if invalidate_scene_index in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(invalidate_scene_index)
+    if clear_scene_index in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_scene_index)
+    if bpy.app.timers.is_registered(rebuild_scene_index):
+        bpy.app.timers.unregister(rebuild_scene_index)
+    SCENE_INDEX.clear()
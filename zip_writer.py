@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+CHUNK = 1 << 20
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+UTF8_FLAG = 0x0800
+# Formats that are already compressed gain nothing from deflate.
+STORED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".zip", ".gz", ".7z", ".zst", ".ktx2", ".ogg", ".mp3")
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_RECORD = struct.Struct("<IHHHHIIH")
+ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+ZIP64_LOCATOR = struct.Struct("<IIQI")
+
+
+class PreparedMember:
+    # One archive member ready to be copied: data_path holds the bytes exactly
+    # as they go into the archive (the source itself when stored).
+    def __init__(self, arcname, source, data_path, method, crc, size, compressed_size, digest, mtime):
+        self.arcname = arcname
+        self.source = source
+        self.data_path = data_path
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.compressed_size = compressed_size
+        self.digest = digest
+        self.mtime = mtime
+
+
+def prepare_member(arcname, source, scratch_dir, level=6):
+    # Runs in a worker thread: one read computes the crc, the blake2b digest
+    # and (unless stored) the raw deflate stream into a temp file.
+    mtime = os.path.getmtime(source)
+    crc = 0
+    size = 0
+    digest = hashlib.blake2b(digest_size=16)
+    store = level == 0 or source.lower().endswith(STORED_EXTENSIONS)
+    if store:
+        with open(source, "rb") as handle:
+            for chunk in iter(lambda: handle.read(CHUNK), b""):
+                crc = zlib.crc32(chunk, crc)
+                digest.update(chunk)
+                size += len(chunk)
+        return PreparedMember(arcname, source, source, ZIP_STORED, crc, size, size, digest.hexdigest(), mtime)
+
+    handle_fd, temp_path = tempfile.mkstemp(suffix=".deflate", dir=scratch_dir)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    with open(source, "rb") as handle, os.fdopen(handle_fd, "wb") as out:
+        for chunk in iter(lambda: handle.read(CHUNK), b""):
+            crc = zlib.crc32(chunk, crc)
+            digest.update(chunk)
+            size += len(chunk)
+            out.write(compressor.compress(chunk))
+        out.write(compressor.flush())
+        compressed_size = out.tell()
+
+    if compressed_size >= size:
+        os.remove(temp_path)
+        return PreparedMember(arcname, source, source, ZIP_STORED, crc, size, size, digest.hexdigest(), mtime)
+    return PreparedMember(arcname, source, temp_path, ZIP_DEFLATED, crc, size, compressed_size, digest.hexdigest(), mtime)
+
+
+def dos_date_time(timestamp):
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    if year < 1980:
+        return 0, (1 << 5) | 1
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class ZipStreamWriter:
+    # Minimal ZIP writer that appends members whose compressed bytes already
+    # exist on disk; only the central directory entries are kept in memory.
+    # ZIP64 records are added for members or archives past 4 GiB / 65535 entries.
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.handle = open(filepath, "wb")
+        self.entries = []
+
+    def add(self, member):
+        offset = self.handle.tell()
+        encoded = member.arcname.replace("\\", "/").encode("utf-8")
+        dos_time, dos_date = dos_date_time(member.mtime)
+        zip64 = member.size >= ZIP64_LIMIT or member.compressed_size >= ZIP64_LIMIT
+        extra = struct.pack("<HHQQ", 1, 16, member.size, member.compressed_size) if zip64 else b""
+        self.handle.write(
+            LOCAL_HEADER.pack(
+                0x04034B50,
+                45 if zip64 else 20,
+                UTF8_FLAG,
+                member.method,
+                dos_time,
+                dos_date,
+                member.crc,
+                ZIP64_LIMIT if zip64 else member.compressed_size,
+                ZIP64_LIMIT if zip64 else member.size,
+                len(encoded),
+                len(extra),
+            )
+            + encoded
+            + extra
+        )
+
+        with open(member.data_path, "rb") as data:
+            copied = 0
+            for chunk in iter(lambda: data.read(CHUNK), b""):
+                self.handle.write(chunk)
+                copied += len(chunk)
+        if copied != member.compressed_size:
+            raise ValueError(f"'{member.source}' changed while it was being packaged")
+        self.entries.append((encoded, member, dos_time, dos_date, offset))
+
+    def add_bytes(self, arcname, data):
+        crc = zlib.crc32(data)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        handle_fd, temp_path = tempfile.mkstemp(suffix=".deflate", dir=os.path.dirname(self.filepath) or None)
+        with os.fdopen(handle_fd, "wb") as out:
+            out.write(compressed)
+        try:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            self.add(
+                PreparedMember(arcname, arcname, temp_path, ZIP_DEFLATED, crc, len(data), len(compressed), digest, time.time())
+            )
+        finally:
+            os.remove(temp_path)
+
+    def close(self):
+        start = self.handle.tell()
+        for encoded, member, dos_time, dos_date, offset in self.entries:
+            # The zip64 extra lists, in order, only the fields set to 0xFFFFFFFF.
+            large = []
+            size, compressed_size, local_offset = member.size, member.compressed_size, offset
+            if member.size >= ZIP64_LIMIT or member.compressed_size >= ZIP64_LIMIT:
+                large += [member.size, member.compressed_size]
+                size = compressed_size = ZIP64_LIMIT
+            if offset >= ZIP64_LIMIT:
+                large.append(offset)
+                local_offset = ZIP64_LIMIT
+            extra = struct.pack(f"<HH{len(large)}Q", 1, 8 * len(large), *large) if large else b""
+            self.handle.write(
+                CENTRAL_HEADER.pack(
+                    0x02014B50,
+                    (3 << 8) | 45,
+                    45 if large else 20,
+                    UTF8_FLAG,
+                    member.method,
+                    dos_time,
+                    dos_date,
+                    member.crc,
+                    compressed_size,
+                    size,
+                    len(encoded),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    0o100644 << 16,
+                    local_offset,
+                )
+                + encoded
+                + extra
+            )
+        end = self.handle.tell()
+        count = len(self.entries)
+        size = end - start
+
+        if count >= 0xFFFF or size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+            self.handle.write(
+                ZIP64_END_RECORD.pack(0x06064B50, ZIP64_END_RECORD.size - 12, 45, 45, 0, 0, count, count, size, start)
+            )
+            self.handle.write(ZIP64_LOCATOR.pack(0x07064B50, 0, end, 1))
+        self.handle.write(
+            END_RECORD.pack(
+                0x06054B50,
+                0,
+                0,
+                min(count, 0xFFFF),
+                min(count, 0xFFFF),
+                min(size, ZIP64_LIMIT),
+                min(start, ZIP64_LIMIT),
+                0,
+            )
+        )
+        self.handle.close()
+
+    def abort(self):
+        self.handle.close()
+        os.remove(self.filepath)
+
+
+def write_archive(zip_path, members, workers=8, level=6, manifest_name="manifest.json", manifest=None):
+    # members: [(arcname, source path)]. Members are compressed in parallel but
+    # written in order, with at most 2 * workers prepared files waiting, so
+    # memory and scratch space stay flat however big the archive gets.
+    # Returns the written PreparedMember list for the caller's report.
+    temp_path = f"{zip_path}.{os.getpid()}.tmp"
+    scratch_dir = tempfile.mkdtemp(prefix="tst_zip_", dir=os.path.dirname(zip_path) or None)
+    archive = ZipStreamWriter(temp_path)
+    written = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            window = deque()
+            try:
+                for arcname, source in members:
+                    window.append(pool.submit(prepare_member, arcname, source, scratch_dir, level))
+                    if len(window) >= 2 * workers:
+                        written.append(add_prepared(archive, window.popleft().result()))
+                while window:
+                    written.append(add_prepared(archive, window.popleft().result()))
+            except BaseException:
+                for future in window:
+                    future.cancel()
+                raise
+
+        if manifest_name:
+            document = dict(manifest or {})
+            document["files"] = [
+                {"path": member.arcname, "size": member.size, "blake2b": member.digest} for member in written
+            ]
+            archive.add_bytes(manifest_name, (json.dumps(document, indent=2) + "\n").encode("utf-8"))
+        archive.close()
+        os.replace(temp_path, zip_path)
+    except BaseException:
+        archive.abort()
+        raise
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return written
+
+
+def add_prepared(archive, member):
+    try:
+        archive.add(member)
+    finally:
+        if member.data_path != member.source:
+            os.remove(member.data_path)
+    return member